@@ -0,0 +1,94 @@
+import argparse
+import contextlib
+import gc
+import os
+import sys
+import tracemalloc
+import typing
+from energuide import dwelling
+from energuide import extractor
+from energuide import transform
+
+
+DEFAULT_INPUT = os.path.join(os.path.dirname(__file__), os.pardir, 'tests', 'randomized_energuide_data.csv')
+
+
+def _groups(infile: str) -> typing.List[typing.List[typing.Dict[str, typing.Any]]]:
+    return list(transform._read_groups(extractor.extract_data(infile, show_progress=False)))
+
+
+def _dwellings(groups: typing.List[typing.List[typing.Dict[str, typing.Any]]],
+               scale: int) -> typing.List[dwelling.Dwelling]:
+    houses = []
+    for _ in range(scale):
+        houses.extend(house for house in (transform._generate_dwellings(group) for group in groups)
+                      if house is not None)
+    return houses
+
+
+def _slotted_classes() -> typing.Dict[type, type]:
+    slotless = {}
+    for name, module in list(sys.modules.items()):
+        if not name.startswith('energuide'):
+            continue
+        for value in vars(module).values():
+            if (isinstance(value, type) and value.__module__ == name and not value.__name__.startswith('_')
+                    and '__slots__' in vars(value) and value not in slotless):
+                slotless[value] = type(value.__name__, (value,), {'__module__': name})
+    return slotless
+
+
+@contextlib.contextmanager
+def _without_slots() -> typing.Iterator[None]:
+    slotless = _slotted_classes()
+    patched = []
+    for name, module in list(sys.modules.items()):
+        if not name.startswith('energuide'):
+            continue
+        for attribute, value in list(vars(module).items()):
+            if isinstance(value, type) and value in slotless:
+                patched.append((module, attribute, value))
+                setattr(module, attribute, slotless[value])
+    try:
+        yield
+    finally:
+        for module, attribute, value in patched:
+            setattr(module, attribute, value)
+
+
+def _retained_per_dwelling(groups: typing.List[typing.List[typing.Dict[str, typing.Any]]],
+                           scale: int) -> typing.Tuple[int, float]:
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    houses = _dwellings(groups, scale)
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(houses), (after - before) / len(houses)
+
+
+def run(infile: str, scale: int) -> None:
+    groups = _groups(infile)
+
+    with _without_slots():
+        count, without_slots = _retained_per_dwelling(groups, scale)
+    _, with_slots = _retained_per_dwelling(groups, scale)
+
+    print(f'{count} dwellings, KB retained per dwelling')
+    print(f'{"without __slots__":<20}{without_slots / 1024:>10,.1f}')
+    print(f'{"with __slots__":<20}{with_slots / 1024:>10,.1f}')
+    print(f'{"saved":<20}{(without_slots - with_slots) / 1024:>10,.1f} ({1 - with_slots / without_slots:.0%})')
+
+
+def main(argv: typing.List[str]) -> None:
+    parser = argparse.ArgumentParser(description='Measure the memory retained by transformed dwellings with and '
+                                                 'without __slots__ on their value types')
+    parser.add_argument('infile', nargs='?', default=DEFAULT_INPUT)
+    parser.add_argument('--scale', type=int, default=20, help='Number of copies of the dwellings to keep in memory')
+    args = parser.parse_args(argv)
+    run(args.infile, args.scale)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
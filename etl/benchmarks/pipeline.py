@@ -0,0 +1,203 @@
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+import typing
+import pymongo
+from energuide import database
+from energuide import dwelling
+from energuide import extractor
+from energuide import snippets
+from energuide import transform
+
+
+TESTS_DIR = os.path.join(os.path.dirname(__file__), os.pardir, 'tests')
+DEFAULT_INPUT = os.path.join(TESTS_DIR, 'randomized_energuide_data.csv')
+DEFAULT_H2K = os.path.join(TESTS_DIR, 'sample.h2k')
+DEFAULT_TOLERANCE = 0.2
+
+Row = typing.Dict[str, typing.Any]
+
+
+class _StageResult(typing.NamedTuple):
+    name: str
+    rows: int
+    seconds: float
+    peak_alloc_kb: int
+
+
+class StageResult(_StageResult):
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+class NullCollection:
+
+    def __init__(self) -> None:
+        self.writes = 0
+
+    def bulk_write(self,
+                   requests: typing.List[pymongo.ReplaceOne],
+                   ordered: bool = True) -> pymongo.results.BulkWriteResult:
+        self.writes += len(requests)
+        return pymongo.results.BulkWriteResult({'nUpserted': len(requests)}, acknowledged=True)
+
+    def drop(self) -> None:
+        pass
+
+
+def _peak_rss_kb() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _peak_alloc_kb(stage: typing.Callable[[], typing.Any]) -> int:
+    tracemalloc.start()
+    stage()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak // 1024
+
+
+def _read_scaled(infile: str, scale: int) -> typing.List[Row]:
+    rows = []
+    for copy in range(scale):
+        for row in extractor._read_csv(infile, show_progress=False):
+            row['EVAL_ID'] = str(int(row['EVAL_ID']) * scale + copy)
+            rows.append(row)
+    return rows
+
+
+def _time_stage(name: str,
+                stage: typing.Callable[[], typing.Any],
+                repeat: int,
+                results: typing.List[StageResult],
+                rows: typing.Optional[int] = None) -> typing.Any:
+    best: typing.Optional[float] = None
+    output = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = stage()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    rows = len(output) if rows is None else rows
+    results.append(StageResult(name=name, rows=rows, seconds=best or 0.0, peak_alloc_kb=_peak_alloc_kb(stage)))
+    return output
+
+
+def run(infile: str, h2k_file: str, repeat: int, scale: int) -> typing.List[StageResult]:
+    results: typing.List[StageResult] = []
+
+    raw_rows: typing.List[Row] = _time_stage(
+        'csv_read', lambda: _read_scaled(infile, scale), repeat, results)
+
+    validated = _time_stage(
+        'input_validation',
+        lambda: [extractor._validated(extractor._empty_to_none(dict(row))) for row in raw_rows], repeat, results)
+
+    extracted = _time_stage(
+        'snippet_extraction', lambda: [extractor._extract_snippets(dict(row)) for row in validated], repeat, results)
+
+    with open(h2k_file) as h2k:
+        h2k_xml = h2k.read()
+    _time_stage('h2k_snippet_extraction', lambda: [snippets.snip_document(h2k_xml) for _ in validated], repeat, results)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        zip_path = os.path.join(tmpdir, 'extracted.zip')
+        _time_stage('zip_write', lambda: extractor.write_data(extracted, zip_path), repeat, results,
+                    rows=len(extracted))
+
+        reader = transform.LocalExtractReader(zip_path)
+        read_rows: typing.List[Row] = _time_stage('zip_read', lambda: list(reader.extracted_rows()), repeat, results)
+
+    groups = list(transform._read_groups(read_rows))
+    dwellings: typing.List[dwelling.Dwelling] = _time_stage(
+        'dwelling_from_group', lambda: [dwelling.Dwelling.from_group(group) for group in groups], repeat, results)
+
+    _time_stage('to_dict', lambda: [house.to_dict() for house in dwellings], repeat, results)
+
+    _time_stage('load_batching', lambda: database._write_dwellings(NullCollection(), dwellings), repeat, results,
+                rows=len(dwellings))
+    return results
+
+
+def to_json(results: typing.List[StageResult], infile: str, scale: int) -> typing.Dict[str, typing.Any]:
+    total = sum(result.seconds for result in results)
+    return {
+        'input': os.path.basename(infile),
+        'scale': scale,
+        'totalSeconds': total,
+        'peakRssKb': _peak_rss_kb(),
+        'stages': {
+            result.name: {
+                'rows': result.rows,
+                'seconds': result.seconds,
+                'rowsPerSecond': result.rows_per_second,
+                'percent': 100 * result.seconds / total if total else 0.0,
+                'peakAllocKb': result.peak_alloc_kb,
+            } for result in results
+        },
+    }
+
+
+def regressions(current: typing.Dict[str, typing.Any],
+                baseline: typing.Dict[str, typing.Any],
+                tolerance: float) -> typing.List[str]:
+    found = []
+    for name, stage in baseline['stages'].items():
+        measured = current['stages'].get(name)
+        if measured is None:
+            continue
+
+        expected = stage['rowsPerSecond']
+        if measured['rowsPerSecond'] < expected * (1 - tolerance):
+            found.append(f'{name}: {measured["rowsPerSecond"]:,.0f} rows/s, baseline {expected:,.0f} rows/s')
+    return found
+
+
+def report(results: typing.List[StageResult], output: typing.Dict[str, typing.Any]) -> None:
+    print(f'{"stage":<24}{"rows":>8}{"rows/s":>14}{"%":>8}{"peak alloc MB":>16}')
+    for result in results:
+        stage = output['stages'][result.name]
+        print(f'{result.name:<24}{result.rows:>8}{result.rows_per_second:>14,.0f}'
+              f'{stage["percent"]:>8.1f}{result.peak_alloc_kb / 1024:>16.1f}')
+    print(f'process peak RSS {output["peakRssKb"] / 1024:,.1f} MB')
+
+
+def main(argv: typing.List[str]) -> int:
+    parser = argparse.ArgumentParser(description='Time each stage of the ETL pipeline without a database')
+    parser.add_argument('infile', nargs='?', default=DEFAULT_INPUT)
+    parser.add_argument('--h2k', default=DEFAULT_H2K)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--scale', type=int, default=10, help='Number of copies of the input rows to process')
+    parser.add_argument('--output', help='Write results as JSON to this file')
+    parser.add_argument('--baseline', help='Flag stages more than --tolerance slower than this JSON result')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    results = run(args.infile, args.h2k, args.repeat, args.scale)
+    output = to_json(results, args.infile, args.scale)
+    report(results, output)
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(output, output_file, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            found = regressions(output, json.load(baseline_file), args.tolerance)
+        for regression in found:
+            print(f'REGRESSION {regression}')
+        if found:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
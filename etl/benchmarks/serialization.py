@@ -0,0 +1,83 @@
+import argparse
+import os
+import pickle
+import sys
+import time
+import tracemalloc
+import typing
+import bson
+from energuide import dwelling
+from energuide import extractor
+from energuide import serialization
+from energuide import transform
+
+
+DEFAULT_INPUT = os.path.join(os.path.dirname(__file__), os.pardir, 'tests', 'randomized_energuide_data.csv')
+
+Row = typing.Dict[str, typing.Any]
+
+
+def _measure(stage: typing.Callable[[], typing.Any], repeat: int) -> typing.Tuple[float, int]:
+    best = min(_elapsed(stage) for _ in range(repeat))
+    tracemalloc.start()
+    stage()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def _elapsed(stage: typing.Callable[[], typing.Any]) -> float:
+    start = time.perf_counter()
+    stage()
+    return time.perf_counter() - start
+
+
+def _report(name: str, count: int, seconds: float, peak: int) -> None:
+    print(f'{name:<32}{count / seconds:>14,.0f}{peak / 1024:>16,.1f}')
+
+
+def _ship_dict(houses: typing.List[dwelling.Dwelling]) -> None:
+    for house in houses:
+        document = pickle.loads(pickle.dumps(house.to_dict()))
+        bson.BSON.encode(document)
+
+
+def _ship_raw_bson(houses: typing.List[dwelling.Dwelling]) -> None:
+    for house in houses:
+        transformed = pickle.loads(pickle.dumps(transform.TransformedDwelling.from_dwelling(house)))
+        bson.BSON.encode(transformed.to_bson())
+
+
+def run(infile: str, repeat: int, scale: int) -> None:
+    extracted: typing.List[Row] = list(extractor.extract_data(infile, show_progress=False))
+    houses = [house for house in (transform._generate_dwellings(group)
+                                  for group in transform._read_groups(extracted)) if house is not None] * scale
+    rows = extracted * scale
+
+    print(f'{"stage":<32}{"items/s":>14}{"peak alloc KB":>16}')
+    for name in serialization.available_backends():
+        backend = serialization.get_backend(name)
+        encoded = [backend.dumps(row) for row in rows]
+        seconds, peak = _measure(lambda: [backend.dumps(row) for row in rows], repeat)
+        _report(f'{name} dumps', len(rows), seconds, peak)
+        seconds, peak = _measure(lambda: [backend.loads(data) for data in encoded], repeat)
+        _report(f'{name} loads', len(rows), seconds, peak)
+
+    seconds, peak = _measure(lambda: _ship_dict(houses), repeat)
+    _report('ship dict, encode in parent', len(houses), seconds, peak)
+    seconds, peak = _measure(lambda: _ship_raw_bson(houses), repeat)
+    _report('encode in worker, ship BSON', len(houses), seconds, peak)
+
+
+def main(argv: typing.List[str]) -> None:
+    parser = argparse.ArgumentParser(description='Compare JSON backends and passing dwellings between processes '
+                                                 'as dicts or raw BSON')
+    parser.add_argument('infile', nargs='?', default=DEFAULT_INPUT)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--scale', type=int, default=20, help='Number of copies of the input rows to process')
+    args = parser.parse_args(argv)
+    run(args.infile, args.repeat, args.scale)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
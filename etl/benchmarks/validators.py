@@ -0,0 +1,81 @@
+import argparse
+import copy
+import os
+import sys
+import timeit
+import typing
+import cerberus
+from energuide import dwelling
+from energuide import extractor
+from energuide import validator
+
+
+DEFAULT_INPUT = os.path.join(os.path.dirname(__file__), os.pardir, 'tests', 'randomized_energuide_data.csv')
+
+
+def _broken(row: typing.Dict[str, typing.Any], schema: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing.Any]:
+    fields = sorted(schema)
+    output = dict(row)
+    output.pop(fields[0], None)
+    output[fields[1]] = None
+    output[fields[2]] = 12
+    return output
+
+
+def _check_matches(schema: typing.Dict[str, typing.Any],
+                   rows: typing.List[typing.Dict[str, typing.Any]],
+                   validator_class: typing.Type[cerberus.Validator],
+                   **options: bool) -> None:
+    compiled = validator.CompiledValidator(schema, validator_class=validator_class, **options)
+    for row in rows + [_broken(row, schema) for row in rows]:
+        checker = validator_class(schema, **options)
+        expected_valid = checker.validate(copy.deepcopy(row))
+        document, errors = compiled.check(row)
+
+        if expected_valid != (not errors) or list(errors.keys()) != list(checker.errors.keys()):
+            raise AssertionError(f'Error keys differ: {list(errors.keys())} != {list(checker.errors.keys())}')
+        if expected_valid and document != checker.document:
+            raise AssertionError(f'Normalized documents differ for {row.get("BUILDER")}')
+
+
+def _time(name: str,
+          rows: typing.List[typing.Dict[str, typing.Any]],
+          cerberus_check: typing.Callable[[typing.Dict[str, typing.Any]], typing.Any],
+          compiled_check: typing.Callable[[typing.Dict[str, typing.Any]], typing.Any],
+          repeat: int) -> None:
+    cerberus_time = min(timeit.repeat(lambda: [cerberus_check(row) for row in rows], number=1, repeat=repeat))
+    compiled_time = min(timeit.repeat(lambda: [compiled_check(row) for row in rows], number=1, repeat=repeat))
+
+    print(f'{name}: {len(rows)} rows, '
+          f'cerberus {len(rows) / cerberus_time:,.0f} rows/s, '
+          f'compiled {len(rows) / compiled_time:,.0f} rows/s, '
+          f'speedup {cerberus_time / compiled_time:.1f}x')
+
+
+def main(argv: typing.List[str]) -> None:
+    parser = argparse.ArgumentParser(description='Compare compiled validators against cerberus')
+    parser.add_argument('infile', nargs='?', default=DEFAULT_INPUT)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    raw_rows = [extractor._empty_to_none(row) for row in extractor._read_csv(args.infile, show_progress=False)]
+    extracted_rows = [row for row in extractor.extract_data(args.infile) if row is not None]
+
+    input_schema = extractor.INPUT_SCHEMA
+    dwelling_schema = dwelling.ParsedDwellingDataRow._SCHEMA
+
+    _check_matches(input_schema, raw_rows, cerberus.Validator, purge_unknown=True)
+    _check_matches(dwelling_schema, extracted_rows, validator.DwellingValidator, allow_unknown=True)
+    print('Compiled validators match cerberus on all rows')
+
+    input_checker = cerberus.Validator(input_schema, purge_unknown=True)
+    _time('INPUT_SCHEMA', raw_rows, input_checker.validate, extractor.INPUT_VALIDATOR.check, args.repeat)
+
+    # from_row used to build a new DwellingValidator for every row
+    _time('ParsedDwellingDataRow._SCHEMA', extracted_rows,
+          lambda row: validator.DwellingValidator(dwelling_schema, allow_unknown=True).validate(row),
+          dwelling.ParsedDwellingDataRow._VALIDATOR.check, args.repeat)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
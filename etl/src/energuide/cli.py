@@ -1,49 +1,158 @@
+import contextlib
+import cProfile
+import io
+import pstats
 import typing
 import os
 import click
+from tqdm import tqdm
 from energuide import database
+from energuide import dwelling
 from energuide import transform
 from energuide import extractor
+from energuide import generator
+from energuide import grouping
+from energuide import indexes
 from energuide import logger
+from energuide import pipeline
+from energuide import prefetch
+from energuide import serialization
+from energuide import timings
+from energuide import transform_cache
 
 
 LOGGER = logger.get_logger(__name__)
 
 
+PROFILE_TOP_FUNCTIONS = 25
+
+
 @click.group()
-def main() -> None:
-    pass
+@click.option('--json-backend',
+              type=click.Choice(serialization.JSON_BACKENDS),
+              envvar=serialization.BACKEND_ENV_VARIABLE,
+              default=serialization.AUTO_BACKEND,
+              help='JSON library for extracted records; auto picks orjson or ujson when installed')
+def main(json_backend: str) -> None:
+    try:
+        backend = serialization.set_backend(json_backend)
+    except serialization.SerializationError as exc:
+        raise click.BadParameter(str(exc), param_hint='--json-backend')
+    LOGGER.debug(f'Using {backend.name} for JSON records')
+
+
+def _profile_options(func: typing.Callable) -> typing.Callable:
+    func = click.option('--timings', 'show_timings',
+                        is_flag=True,
+                        help='Time each pipeline stage and print a breakdown at exit')(func)
+    func = click.option('--profile',
+                        type=click.Path(dir_okay=False),
+                        required=False,
+                        help='Run cProfile over the command and write the stats to this file')(func)
+    return func
+
+
+def _database_options(func: typing.Callable) -> typing.Callable:
+    func = click.option('--production/--local',
+                        envvar=database.EnvVariables.production.value,
+                        default=False,
+                        help='Generate a connection string to an Atlas managed MongoDB instance')(func)
+    func = click.option('--collection',
+                        envvar=database.EnvVariables.collection.value,
+                        default=database.EnvDefaults.collection.value,
+                        help='Collection to load data into in Database')(func)
+    func = click.option('--db_name',
+                        envvar=database.EnvVariables.database.value,
+                        default=database.EnvDefaults.database.value,
+                        help='Database name for MongoDB Server')(func)
+    func = click.option('--port',
+                        envvar=database.EnvVariables.port.value,
+                        default=database.EnvDefaults.port.value,
+                        type=int,
+                        help='Port for MongoDB Server')(func)
+    func = click.option('--host',
+                        envvar=database.EnvVariables.host.value,
+                        default=database.EnvDefaults.host.value,
+                        help='Hostname for MongoDB Server')(func)
+    func = click.option('--password',
+                        envvar=database.EnvVariables.password.value,
+                        default=database.EnvDefaults.password.value,
+                        help='Password for MongoDB Server')(func)
+    func = click.option('--username',
+                        envvar=database.EnvVariables.username.value,
+                        default=database.EnvDefaults.username.value,
+                        help='Username for MongoDB Server')(func)
+    return func
+
+
+@contextlib.contextmanager
+def _profiled(profile: str, workers: int) -> typing.Iterator[None]:
+    if workers > 1:
+        LOGGER.warning(f'--profile only covers the main process, not the {workers} worker processes')
+    profiler = cProfile.Profile()
+    profiler.enable()
+
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(profile)
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(PROFILE_TOP_FUNCTIONS)
+        click.echo(summary.getvalue())
+        LOGGER.info(f'Wrote profile to {profile}')
+
+
+@contextlib.contextmanager
+def _instrumented(profile: typing.Optional[str], show_timings: bool, workers: int = 1) -> typing.Iterator[None]:
+    if show_timings:
+        timings.TIMINGS.enable()
+
+    try:
+        with contextlib.ExitStack() as stack:
+            if profile is not None:
+                stack.enter_context(_profiled(profile, workers))
+            yield
+    finally:
+        if show_timings:
+            timings.TIMINGS.disable()
+            click.echo(timings.TIMINGS.report())
+
+
+@contextlib.contextmanager
+def _transform_cache(filename: typing.Optional[str],
+                     update: bool) -> typing.Iterator[typing.Optional[transform_cache.TransformCache]]:
+    if filename is None:
+        yield None
+        return
+
+    cache = transform_cache.TransformCache(filename, dwelling.Dwelling.GROUPING_FIELD)
+    try:
+        if not update:
+            cache.clear()
+        yield cache
+        cache.commit()
+    finally:
+        cache.close()
 
 
 @main.command()
-@click.option('--username',
-              envvar=database.EnvVariables.username.value,
-              default=database.EnvDefaults.username.value,
-              help='Username for MongoDB Server')
-@click.option('--password',
-              envvar=database.EnvVariables.password.value,
-              default=database.EnvDefaults.password.value,
-              help='Password for MongoDB Server')
-@click.option('--host',
-              envvar=database.EnvVariables.host.value,
-              default=database.EnvDefaults.host.value,
-              help='Hostname for MongoDB Server')
-@click.option('--port',
-              envvar=database.EnvVariables.port.value,
-              default=database.EnvDefaults.port.value,
-              type=int,
-              help='Port for MongoDB Server')
-@click.option('--db_name',
-              envvar=database.EnvVariables.database.value,
-              default=database.EnvDefaults.database.value,
-              help='Database name for MongoDB Server')
-@click.option('--collection',
-              envvar=database.EnvVariables.collection.value,
-              default=database.EnvDefaults.collection.value,
-              help='Collection to load data into in Database')
+@_database_options
 @click.option('--azure',
               is_flag=True,
               help='Download data from Azure')
+@click.option('--download-workers',
+              type=click.IntRange(min=1),
+              default=prefetch.DEFAULT_WORKERS,
+              help='Number of threads downloading blobs ahead of the transform when using azure')
+@click.option('--download-window',
+              type=click.IntRange(min=1),
+              default=prefetch.DEFAULT_WINDOW,
+              help='Maximum number of blobs downloaded ahead of the transform when using azure')
+@click.option('--full-scan',
+              is_flag=True,
+              default=False,
+              help='Ignore the manifest checkpoint and scan the whole container for new blobs when using azure')
 @click.option('--filename',
               type=click.Path(exists=True),
               required=False,
@@ -54,10 +163,41 @@ def main() -> None:
 @click.option('--update/--no-update',
               default=True,
               help='Update data instead of rebuilding from empty')
-@click.option('--production/--local',
-              envvar=database.EnvVariables.production.value,
-              default=False,
-              help='Generate a connection string to an Atlas managed MongoDB instance')
+@click.option('--workers',
+              type=click.IntRange(min=1),
+              default=1,
+              help='Number of processes to transform dwellings with')
+@click.option('--ordered/--unordered',
+              default=True,
+              help='Keep dwellings in input order when transforming with several workers')
+@click.option('--group-memory',
+              type=click.IntRange(min=1),
+              default=grouping.DEFAULT_MEMORY_BUDGET // (1024 * 1024),
+              help='Megabytes of rows to hold in memory while grouping before spilling sorted runs to disk')
+@click.option('--cache', 'cache_file',
+              type=click.Path(dir_okay=False),
+              required=False,
+              help='SQLite file of input hashes; dwellings whose input and code are unchanged since the last load '
+                   'are skipped')
+@click.option('--batch-size',
+              type=click.IntRange(min=1),
+              default=database.DEFAULT_BATCH_SIZE,
+              help='Maximum number of dwellings sent to the database in one bulk write')
+@click.option('--batch-memory',
+              type=click.IntRange(min=1),
+              default=database.DEFAULT_BATCH_BYTES // (1024 * 1024),
+              help='Maximum megabytes of BSON sent to the database in one bulk write')
+@click.option('--pipeline-depth',
+              type=click.IntRange(min=0),
+              default=pipeline.DEFAULT_DEPTH,
+              help='Batches queued between the transform and the database writer thread; 0 writes inline')
+@click.option('--sync-indexes/--no-sync-indexes',
+              default=True,
+              help='Build missing query indexes and report index usage after loading')
+@click.option('--skip-unchanged/--write-all',
+              default=True,
+              help='Only write dwellings whose content fingerprint differs from the stored document when updating')
+@_profile_options
 def load(username: str,
          password: str,
          host: str,
@@ -65,10 +205,24 @@ def load(username: str,
          db_name: str,
          collection: str,
          azure: bool,
+         download_workers: int,
+         download_window: int,
+         full_scan: bool,
          filename: typing.Optional[str],
          update: bool,
          progress: bool,
          production: bool,
+         workers: int,
+         ordered: bool,
+         group_memory: int,
+         cache_file: typing.Optional[str],
+         batch_size: int,
+         batch_memory: int,
+         skip_unchanged: bool,
+         sync_indexes: bool,
+         pipeline_depth: int,
+         profile: typing.Optional[str],
+         show_timings: bool,
         ) -> None:
 
     coords = database.DatabaseCoordinates(
@@ -83,18 +237,68 @@ def load(username: str,
     if azure:
         LOGGER.info(f'Loading data from Azure into {db_name}.{collection}')
         azure_coords = transform.AzureCoordinates.from_env()
-        reader = transform.AzureExtractReader(azure_coords)
+        reader = transform.AzureExtractReader(azure_coords, workers=download_workers, window=download_window,
+                                              full_scan=full_scan)
     elif filename:
         LOGGER.info(f'Loading data from {filename} into {db_name}.{collection}')
         reader = transform.LocalExtractReader(filename)
     else:
         LOGGER.error('Must supply a filename or use azure')
         raise ValueError('Must supply a filename or use azure')
-    data = transform.transform(reader, progress)
-    database.load(coords, db_name, collection, data, update)
+    with _instrumented(profile, show_timings, workers), _transform_cache(cache_file, update) as cache:
+        data = transform.transform(reader, progress, workers=workers, ordered=ordered,
+                                   group_memory_budget=group_memory * 1024 * 1024, cache=cache)
+        result = database.load(coords, db_name, collection, data, update,
+                               batch_size=batch_size, batch_bytes=batch_memory * 1024 * 1024,
+                               skip_unchanged=skip_unchanged, sync_indexes=sync_indexes,
+                               pipeline_depth=pipeline_depth)
+        if not result.succeeded:
+            raise click.ClickException(f'{len(result.errors)} dwellings could not be written to the database')
+        if isinstance(reader, transform.AzureExtractReader):
+            reader.commit_checkpoint()
     LOGGER.info(f'Finished loading data')
 
 
+@main.group(name='indexes')
+def indexes_group() -> None:
+    pass
+
+
+def _format_index_report(statuses: typing.List[indexes.IndexStatus]) -> str:
+    lines = [f'{"index":<36} {"size KB":>10} {"accesses":>10}  notes']
+    for status in statuses:
+        notes = [note for note, flag in [('created', status.created),
+                                         ('undeclared', not status.declared),
+                                         ('unused', status.unused)] if flag]
+        accesses = '-' if status.accesses is None else str(status.accesses)
+        lines.append(f'{status.name:<36} {status.size_bytes / 1024:>10.1f} {accesses:>10}  {", ".join(notes)}')
+    return '\n'.join(lines)
+
+
+@indexes_group.command(name='sync')
+@_database_options
+def sync_indexes(username: str,
+                 password: str,
+                 host: str,
+                 port: int,
+                 db_name: str,
+                 collection: str,
+                 production: bool) -> None:
+    coords = database.DatabaseCoordinates(
+        username=username,
+        password=password,
+        host=host,
+        port=port,
+        production=production
+    )
+    LOGGER.info(f'Syncing indexes on {db_name}.{collection}')
+    try:
+        statuses = database.sync_indexes(coords, db_name, collection)
+    except indexes.IndexSyncError as exc:
+        raise click.ClickException(str(exc))
+    click.echo(_format_index_report(statuses))
+
+
 @main.command()
 @click.option('--infile',
               type=click.Path(exists=True),
@@ -105,11 +309,60 @@ def load(username: str,
               type=click.Path(),
               help='Path to output file')
 @click.option('--progress/--no-progress', default=True)
-def extract(infile: str, outfile: str, progress: bool) -> None:
+@click.option('--workers',
+              type=click.IntRange(min=1),
+              default=1,
+              help='Number of processes to extract rows with')
+@click.option('--format', 'output_format',
+              type=click.Choice(extractor.OUTPUT_FORMATS),
+              default=extractor.ZIP_FORMAT,
+              help='Write a zip file of JSON members or a sorted, block-compressed record log')
+@click.option('--group-memory',
+              type=click.IntRange(min=1),
+              default=grouping.DEFAULT_MEMORY_BUDGET // (1024 * 1024),
+              help='Megabytes of rows to hold in memory while sorting a record log before spilling sorted runs '
+                   'to disk')
+@_profile_options
+def extract(infile: str,
+            outfile: str,
+            progress: bool,
+            workers: int,
+            output_format: str,
+            group_memory: int,
+            profile: typing.Optional[str],
+            show_timings: bool) -> None:
     LOGGER.info(f'Extracting data from {infile} into {outfile}')
     if os.path.exists(outfile):
         LOGGER.warning(f'Warning: file {outfile} exists. Overwriting.')
-    extracted = extractor.extract_data(infile, show_progress=progress)
-    records_written, records_failed = extractor.write_data(extracted, outfile)
+    with _instrumented(profile, show_timings, workers):
+        extracted = extractor.extract_data(infile, show_progress=progress, workers=workers)
+        records_written, records_failed = extractor.write_data(extracted, outfile, output_format,
+                                                                 memory_budget=group_memory * 1024 * 1024)
     LOGGER.info(f'Finished extracting data into {outfile}. '
                 f'Successfully written: {records_written}. Failed: {records_failed}')
+
+
+@main.command()
+@click.option('--rows',
+              type=click.IntRange(min=1),
+              required=True,
+              help='Number of rows to generate')
+@click.option('--seed',
+              type=int,
+              default=0,
+              help='Seed for the random number generator')
+@click.option('--outfile',
+              required=True,
+              type=click.Path(),
+              help='Path to output CSV file')
+@click.option('--template',
+              type=click.Path(exists=True),
+              required=True,
+              help='CSV file to sample houses, locations and component counts from')
+@click.option('--progress/--no-progress', default=True)
+def generate(rows: int, seed: int, outfile: str, template: str, progress: bool) -> None:
+    LOGGER.info(f'Generating {rows} rows from {template} into {outfile}')
+    profile = generator.Profile.from_csv(template)
+    generated = tqdm(generator.generate_rows(profile, rows, seed), total=rows, unit=' rows', disable=not progress)
+    rows_written = generator.write_csv(generated, profile.fieldnames, outfile)
+    LOGGER.info(f'Finished generating {rows_written} rows into {outfile}')
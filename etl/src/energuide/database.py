@@ -1,15 +1,59 @@
 from contextlib import contextmanager
 import enum
+import hashlib
+import time
 import typing
 
 import pymongo
+from bson import raw_bson
+from pymongo import errors
 
-from energuide import dwelling
+from energuide import indexes
+from energuide import transform
 from energuide import logger
+from energuide import pipeline
+from energuide import serialization
+from energuide import timings
+from energuide.exceptions import EnerguideError
 
 
 LOGGER = logger.get_logger(__name__)
 
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_BATCH_BYTES = 8 * 1024 * 1024
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_RETRY_DELAY = 0.5
+
+# Server error codes for failovers, interrupted operations and timeouts; any other write error is permanent.
+_RETRYABLE_CODES = {
+    6,  # HostUnreachable
+    7,  # HostNotFound
+    50,  # MaxTimeMSExpired
+    64,  # WriteConcernFailed
+    89,  # NetworkTimeout
+    91,  # ShutdownInProgress
+    112,  # WriteConflict
+    189,  # PrimarySteppedDown
+    262,  # ExceededTimeLimit
+    9001,  # SocketException
+    10107,  # NotMaster
+    11600,  # InterruptedAtShutdown
+    11602,  # InterruptedDueToReplStateChange
+    13435,  # NotMasterNoSlaveOk
+    13436,  # NotMasterOrSecondary
+}
+
+FINGERPRINT_FIELD = 'fingerprint'
+STAGING_SUFFIX = '_staging'
+
+Document = typing.Mapping[str, typing.Any]
+Batch = typing.List[typing.Tuple[int, str, Document]]
+WriteErrors = typing.List[typing.Dict[str, typing.Any]]
+
+
+class RebuildValidationError(EnerguideError):
+    pass
+
 
 class EnvVariables(enum.Enum):
     username = 'ENERGUIDE_USERNAME'
@@ -31,7 +75,6 @@ class EnvDefaults(enum.Enum):
     production = False
 
 
-
 class _DatabaseCoordinates(typing.NamedTuple):
     username: str
     password: str
@@ -64,23 +107,287 @@ def mongo_client(database_coordinates: DatabaseCoordinates) -> typing.Iterable[p
         yield client
 
 
+class _WriteFailure(typing.NamedTuple):
+    house_id: int
+    code: typing.Optional[int]
+    message: str
+
+
+class WriteFailure(_WriteFailure):
+    __slots__ = ()
+
+
+class _LoadResult(typing.NamedTuple):
+    rows: int
+    matched: int
+    modified: int
+    upserted: int
+    unchanged: int
+    batches: int
+    retries: int
+    errors: typing.List[WriteFailure]
+    stalls: typing.Optional[pipeline.StallReport] = None
+
+
+class LoadResult(_LoadResult):
+    __slots__ = ()
+
+    @property
+    def succeeded(self) -> bool:
+        return not self.errors
+
+
+class _LoadCounts:
+
+    def __init__(self) -> None:
+        self.rows = 0
+        self.matched = 0
+        self.modified = 0
+        self.upserted = 0
+        self.unchanged = 0
+        self.batches = 0
+        self.retries = 0
+        self.errors: typing.List[WriteFailure] = []
+        self.stalls: typing.Optional[pipeline.StallReport] = None
+
+    def add(self, details: typing.Mapping[str, typing.Any]) -> None:
+        self.matched += details.get('nMatched', 0)
+        self.modified += details.get('nModified', 0)
+        self.upserted += details.get('nUpserted', 0)
+
+    def result(self) -> LoadResult:
+        return LoadResult(rows=self.rows,
+                          matched=self.matched,
+                          modified=self.modified,
+                          upserted=self.upserted,
+                          unchanged=self.unchanged,
+                          batches=self.batches,
+                          retries=self.retries,
+                          errors=self.errors,
+                          stalls=self.stalls)
+
+
+def fingerprint(document: raw_bson.RawBSONDocument) -> str:
+    return hashlib.sha256(document.raw).hexdigest()
+
+
+def _batches(data: typing.Iterable[transform.DocumentProtocol],
+             batch_size: int,
+             batch_bytes: int) -> typing.Iterator[Batch]:
+    batch: Batch = []
+    size = 0
+    for row in data:
+        with timings.TIMINGS.timed('to_bson'):
+            content = row.to_bson()
+            digest = fingerprint(content)
+            document = serialization.with_field(content, FINGERPRINT_FIELD, digest)
+        document_size = len(document.raw)
+
+        if batch and (len(batch) >= batch_size or size + document_size > batch_bytes):
+            yield batch
+            batch = []
+            size = 0
+
+        batch.append((row.house_id, digest, document))
+        size += document_size
+
+    if batch:
+        yield batch
+
+
+def _stored_fingerprints(collection: pymongo.collection.Collection,
+                         house_ids: typing.List[int]) -> typing.Dict[int, typing.Optional[str]]:
+    with timings.TIMINGS.timed('mongo_read'):
+        cursor = collection.find({'houseId': {'$in': house_ids}},
+                                 projection={'_id': False, 'houseId': True, FINGERPRINT_FIELD: True})
+        return {document['houseId']: document.get(FINGERPRINT_FIELD) for document in cursor}
+
+
+def _changed(collection: pymongo.collection.Collection, batch: Batch) -> Batch:
+    stored = _stored_fingerprints(collection, [house_id for house_id, _, _ in batch])
+    return [item for item in batch if stored.get(item[0]) != item[1]]
+
+
+def _bulk_write(collection: pymongo.collection.Collection,
+                batch: Batch) -> typing.Tuple[typing.Mapping[str, typing.Any], WriteErrors]:
+    requests = [pymongo.ReplaceOne({'houseId': house_id}, document, upsert=True) for house_id, _, document in batch]
+    try:
+        with timings.TIMINGS.timed('mongo_write'):
+            result = collection.bulk_write(requests, ordered=False)
+    except errors.BulkWriteError as exc:
+        return exc.details, exc.details.get('writeErrors', []) + _write_concern_errors(exc.details, len(batch))
+    return result.bulk_api_result, []
+
+
+def _write_concern_errors(details: typing.Mapping[str, typing.Any], batch_size: int) -> WriteErrors:
+    concern_errors = details.get('writeConcernErrors', [])
+    if not concern_errors:
+        return []
+
+    failed = {error['index'] for error in details.get('writeErrors', [])}
+    concern_error = concern_errors[0]
+    return [{'index': index, 'code': concern_error.get('code'), 'errmsg': concern_error.get('errmsg', '')}
+            for index in range(batch_size) if index not in failed]
+
+
+def _failures(pending: Batch, write_errors: WriteErrors) -> typing.List[WriteFailure]:
+    return [
+        WriteFailure(house_id=pending[error['index']][0], code=error.get('code'), message=error.get('errmsg', ''))
+        for error in write_errors
+    ]
+
+
+def _retryable(error: typing.Mapping[str, typing.Any]) -> bool:
+    code = error.get('code')
+    return code is None or code in _RETRYABLE_CODES
+
+
+def _write_batch(collection: pymongo.collection.Collection,
+                 batch: Batch,
+                 counts: _LoadCounts,
+                 max_retries: int,
+                 retry_delay: float) -> None:
+    pending = batch
+    attempt = 0
+    while pending:
+        try:
+            details, write_errors = _bulk_write(collection, pending)
+        except errors.AutoReconnect as exc:
+            if attempt >= max_retries:
+                raise
+            write_errors = [{'index': index, 'code': None, 'errmsg': str(exc)} for index in range(len(pending))]
+        else:
+            counts.add(details)
+
+        transient = [error for error in write_errors if _retryable(error)]
+        permanent = [error for error in write_errors if not _retryable(error)]
+        counts.errors.extend(_failures(pending, permanent))
+        if not transient:
+            return
+        if attempt >= max_retries:
+            counts.errors.extend(_failures(pending, transient))
+            return
+
+        attempt += 1
+        counts.retries += 1
+        LOGGER.warning(f'retrying {len(transient)} of {len(pending)} failed writes (attempt {attempt})')
+        time.sleep(retry_delay * attempt)
+        pending = [pending[error['index']] for error in transient]
+
+
+def _write_dwellings(collection: pymongo.collection.Collection,
+                     data: typing.Iterable[transform.DocumentProtocol],
+                     batch_size: int = DEFAULT_BATCH_SIZE,
+                     batch_bytes: int = DEFAULT_BATCH_BYTES,
+                     max_retries: int = DEFAULT_MAX_RETRIES,
+                     retry_delay: float = DEFAULT_RETRY_DELAY,
+                     skip_unchanged: bool = False,
+                     pipeline_depth: int = 0) -> LoadResult:
+    counts = _LoadCounts()
+
+    def write(batch: Batch) -> None:
+        counts.rows += len(batch)
+        if skip_unchanged:
+            changed = _changed(collection, batch)
+            counts.unchanged += len(batch) - len(changed)
+            batch = changed
+
+        if batch:
+            counts.batches += 1
+            _write_batch(collection, batch, counts, max_retries, retry_delay)
+
+    batches = _batches(data, batch_size, batch_bytes)
+    if pipeline_depth > 0:
+        counts.stalls = pipeline.run(batches, write, pipeline_depth)
+    else:
+        for batch in batches:
+            write(batch)
+    return counts.result()
+
+
+def _log_result(result: LoadResult) -> None:
+    LOGGER.info(f'wrote {result.rows - result.unchanged} of {result.rows} rows in {result.batches} batches: '
+                f'{result.upserted} upserted, {result.matched} matched, {result.modified} modified, '
+                f'{result.unchanged} unchanged, {len(result.errors)} failed')
+    for failure in result.errors:
+        LOGGER.error(f'failed to write dwelling {failure.house_id}: {failure.message} (code {failure.code})')
+    if result.stalls is not None:
+        LOGGER.info(f'pipeline: {result.stalls}')
+
+
+def _update(collection: pymongo.collection.Collection,
+            data: typing.Iterable[transform.DocumentProtocol],
+            skip_unchanged: bool,
+            sync_indexes: bool,
+            **write_options: typing.Any) -> LoadResult:
+    indexes.ensure(collection, indexes.UPSERT_INDEXES)
+    result = _write_dwellings(collection, data, skip_unchanged=skip_unchanged, **write_options)
+    _log_result(result)
+
+    if sync_indexes:
+        indexes.sync(collection)
+    return result
+
+
+def _rebuild(collection: pymongo.collection.Collection,
+             data: typing.Iterable[transform.DocumentProtocol],
+             sync_indexes: bool,
+             **write_options: typing.Any) -> LoadResult:
+    staging = collection.database[f'{collection.name}{STAGING_SUFFIX}']
+    staging.drop()
+    indexes.ensure(staging, [indexes.HOUSE_ID_INDEX])
+
+    result = _write_dwellings(staging, data, **write_options)
+    _log_result(result)
+    if not result.succeeded:
+        LOGGER.error(f'rebuild of {collection.full_name} failed, leaving the live collection untouched')
+        staging.drop()
+        return result
+
+    staged = staging.count_documents({})
+    if staged != result.rows:
+        staging.drop()
+        raise RebuildValidationError(
+            f'Staging collection {staging.full_name} holds {staged} dwellings but {result.rows} were written'
+        )
+
+    indexes.ensure(staging)
+    live = collection.count_documents({})
+    with timings.TIMINGS.timed('mongo_swap'):
+        staging.rename(collection.name, dropTarget=True)
+    LOGGER.info(f'swapped {staging.full_name} in as {collection.full_name}: {live} -> {staged} dwellings')
+
+    if sync_indexes:
+        indexes.sync(collection, warn_unused=False)
+    return result
+
+
 def load(coords: DatabaseCoordinates,
          database_name: str,
          collection_name: str,
-         data: typing.Iterable[dwelling.Dwelling],
-         update: bool = True) -> None:
+         data: typing.Iterable[transform.DocumentProtocol],
+         update: bool = True,
+         batch_size: int = DEFAULT_BATCH_SIZE,
+         batch_bytes: int = DEFAULT_BATCH_BYTES,
+         max_retries: int = DEFAULT_MAX_RETRIES,
+         skip_unchanged: bool = True,
+         sync_indexes: bool = True,
+         pipeline_depth: int = pipeline.DEFAULT_DEPTH) -> LoadResult:
+
+    client: pymongo.MongoClient
+    with mongo_client(coords) as client:
+        collection = client[database_name][collection_name]
+        write_options = dict(batch_size=batch_size, batch_bytes=batch_bytes, max_retries=max_retries,
+                             pipeline_depth=pipeline_depth)
+
+        if update:
+            return _update(collection, data, skip_unchanged, sync_indexes, **write_options)
+        return _rebuild(collection, data, sync_indexes, **write_options)
+
 
+def sync_indexes(coords: DatabaseCoordinates,
+                 database_name: str,
+                 collection_name: str) -> typing.List[indexes.IndexStatus]:
     client: pymongo.MongoClient
     with mongo_client(coords) as client:
-        database = client[database_name]
-        collection = database[collection_name]
-
-        if not update:
-            collection.drop()
-
-        num_rows = 0
-        for row in data:
-            num_rows += 1
-            data_row = row.to_dict()
-            collection.update({'houseId': data_row['houseId']}, data_row, upsert=True)
-        LOGGER.info(f"updated {num_rows} rows in the database")
+        return indexes.sync(client[database_name][collection_name])
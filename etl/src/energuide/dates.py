@@ -0,0 +1,81 @@
+import datetime
+import functools
+import re
+import typing
+from dateutil import parser
+
+
+DEFAULT_CACHE_SIZE = 4096
+
+_ISO_DATETIME = re.compile(r'(\d{4})-(\d{2})-(\d{2})(?:[ T](\d{2}):(\d{2})(?::(\d{2})(?:\.(\d{1,6}))?)?)?')
+
+
+class _DateParseInfo(typing.NamedTuple):
+    fast: int
+    fallbacks: int
+    cache_hits: int
+    cache_misses: int
+
+
+class DateParseInfo(_DateParseInfo):
+
+    def __str__(self) -> str:
+        return (f'{self.fast} ISO, {self.fallbacks} dateutil fallbacks, '
+                f'{self.cache_hits} cache hits, {self.cache_misses} cache misses')
+
+
+def _parse_iso(value: str) -> typing.Optional[datetime.datetime]:
+    match = _ISO_DATETIME.fullmatch(value.strip())
+    if match is None:
+        return None
+
+    year, month, day, hour, minute, second, fraction = match.groups()
+    try:
+        return datetime.datetime(
+            int(year), int(month), int(day),
+            int(hour or 0), int(minute or 0), int(second or 0),
+            int(fraction.ljust(6, '0')) if fraction else 0,
+        )
+    except ValueError:
+        return None
+
+
+class DateParser:
+
+    def __init__(self, cache_size: int = DEFAULT_CACHE_SIZE) -> None:
+        self._fast = 0
+        self._fallbacks = 0
+        self._cached_parse = functools.lru_cache(maxsize=cache_size)(self._parse)
+
+    def _parse(self, value: str) -> datetime.datetime:
+        parsed = _parse_iso(value)
+        if parsed is not None:
+            self._fast += 1
+            return parsed
+
+        self._fallbacks += 1
+        return parser.parse(value)
+
+    def parse(self, value: typing.Any) -> datetime.datetime:
+        if not isinstance(value, str):
+            return parser.parse(value)
+        return self._cached_parse(value)
+
+    def info(self) -> DateParseInfo:
+        cache_info = self._cached_parse.cache_info()
+        return DateParseInfo(fast=self._fast,
+                             fallbacks=self._fallbacks,
+                             cache_hits=cache_info.hits,
+                             cache_misses=cache_info.misses)
+
+    def clear(self) -> None:
+        self._cached_parse.cache_clear()
+        self._fast = 0
+        self._fallbacks = 0
+
+
+DATE_PARSER = DateParser()
+
+
+def parse_datetime(value: typing.Any) -> datetime.datetime:
+    return DATE_PARSER.parse(value)
@@ -1,7 +1,11 @@
 import datetime
 import enum
 import typing
-from dateutil import parser
+from bson import raw_bson
+from energuide import dates
+from energuide import element
+from energuide import serialization
+from energuide import snippets
 from energuide import validator
 from energuide.embedded import ceiling
 from energuide.embedded import code
@@ -105,18 +109,25 @@ def _cast_nullable_string(value: str) -> typing.Optional[int]:
     return int(value)
 
 
-class ParsedDwellingDataRow(_ParsedDwellingDataRow):
+def _snippet_schema(snip: typing.Callable[[element.Element], typing.Any],
+                    type_: str = 'dict',
+                    nullable: bool = False) -> typing.Dict[str, typing.Any]:
+    return {'type': type_, 'nullable': nullable, 'required': True, 'coerce': validator.snippet_coercer(snip)}
+
 
-    _XML_SCHEMA = {'type': 'xml', 'required': True, 'coerce': 'parse_xml'}
-    _NULLABLE_XML_SCHEMA = {'type': 'xml', 'nullable': True, 'required': True, 'coerce': 'parse_xml'}
-    _XML_LIST_SCHEMA = {'type': 'list', 'required': True, 'schema': _XML_SCHEMA}
+def _snippet_list_schema(snip: typing.Callable[[element.Element], typing.Any]) -> typing.Dict[str, typing.Any]:
+    return {'type': 'list', 'required': True, 'schema': _snippet_schema(snip)}
+
+
+class ParsedDwellingDataRow(_ParsedDwellingDataRow):
+    __slots__ = ()
 
     _SCHEMA = {
         'EVAL_ID': {'type': 'integer', 'required': True, 'coerce': int},
         'EVAL_TYPE': {'type': 'string', 'required': True, 'allowed': [eval_type.value for eval_type in EvaluationType]},
-        'ENTRYDATE': {'type': 'date', 'required': True, 'coerce': parser.parse},
-        'CREATIONDATE': {'type': 'datetime', 'required': True, 'coerce': parser.parse},
-        'MODIFICATIONDATE': {'type': 'datetime', 'nullable': True, 'required': True, 'coerce': parser.parse},
+        'ENTRYDATE': {'type': 'date', 'required': True, 'coerce': dates.parse_datetime},
+        'CREATIONDATE': {'type': 'datetime', 'required': True, 'coerce': dates.parse_datetime},
+        'MODIFICATIONDATE': {'type': 'datetime', 'nullable': True, 'required': True, 'coerce': dates.parse_datetime},
         'YEARBUILT': {'type': 'integer', 'required': True, 'coerce': int},
         'CLIENTCITY': {'type': 'string', 'required': True},
         'forwardSortationArea': {'type': 'string', 'required': True, 'regex': '[A-Z][0-9][A-Z]'},
@@ -124,42 +135,46 @@ class ParsedDwellingDataRow(_ParsedDwellingDataRow):
         'ersRating': {'type': 'integer', 'nullable': True, 'coerce': _cast_nullable_string},
         'BUILDER': {'type': 'string', 'required': True},
 
-        'ceilings': _XML_LIST_SCHEMA,
-        'floors': _XML_LIST_SCHEMA,
-        'walls': _XML_LIST_SCHEMA,
-        'doors': _XML_LIST_SCHEMA,
-        'windows': _XML_LIST_SCHEMA,
-        'heatedFloorArea': _NULLABLE_XML_SCHEMA,
-        'heating_cooling': _NULLABLE_XML_SCHEMA,
-        'ventilations': _XML_LIST_SCHEMA,
-        'waterHeatings': _NULLABLE_XML_SCHEMA,
-        'basements': _XML_LIST_SCHEMA,
-        'crawlspaces': _XML_LIST_SCHEMA,
-        'slabs': _XML_LIST_SCHEMA,
-
-        'codes': {'type': 'dict', 'required': True, 'schema': {'wall': _XML_LIST_SCHEMA, 'window': _XML_LIST_SCHEMA}},
-        'upgrades': _XML_LIST_SCHEMA,
+        'ceilings': _snippet_list_schema(snippets.snip_ceiling),
+        'floors': _snippet_list_schema(snippets.snip_floor),
+        'walls': _snippet_list_schema(snippets.snip_wall),
+        'doors': _snippet_list_schema(snippets.snip_door),
+        'windows': _snippet_list_schema(snippets.snip_window),
+        'heatedFloorArea': _snippet_schema(snippets.snip_heated_floor_area, nullable=True),
+        'heating_cooling': _snippet_schema(snippets.snip_heating, nullable=True),
+        'ventilations': _snippet_list_schema(snippets.snip_ventilation),
+        'waterHeatings': _snippet_schema(snippets.snip_water_heating, type_='list', nullable=True),
+        'basements': _snippet_list_schema(snippets.snip_basement),
+        'crawlspaces': _snippet_list_schema(snippets.snip_basement),
+        'slabs': _snippet_list_schema(snippets.snip_basement),
+
+        'codes': {'type': 'dict', 'required': True, 'schema': {
+            'wall': _snippet_list_schema(snippets.snip_wall_code),
+            'window': _snippet_list_schema(snippets.snip_window_code),
+        }},
+        'upgrades': _snippet_list_schema(snippets.snip_upgrade),
     }
 
+    _VALIDATOR = validator.CompiledValidator(_SCHEMA, allow_unknown=True, validator_class=validator.DwellingValidator)
+
     @classmethod
     def from_row(cls, row: typing.Dict[str, typing.Any]) -> 'ParsedDwellingDataRow':
-        checker = validator.DwellingValidator(cls._SCHEMA, allow_unknown=True)
-        if not checker.validate(row):
-            error_keys = ', '.join(checker.errors.keys())
+        parsed, errors = cls._VALIDATOR.check(row)
+        if errors:
+            error_keys = ', '.join(errors.keys())
             raise InvalidInputDataError(f'Validator failed on keys: {error_keys}')
 
-        parsed = checker.document
-        codes = code.Codes.from_data(parsed['codes'])
+        codes = code.Codes.from_snippet(parsed['codes'])
 
         foundations = []
         foundations.extend(
-            [basement.Basement.from_data(basement_node) for basement_node in parsed['basements']]
+            [basement.Basement.from_snippet(basement_node) for basement_node in parsed['basements']]
         )
         foundations.extend(
-            [basement.Basement.from_data(crawlspace_node) for crawlspace_node in parsed['crawlspaces']]
+            [basement.Basement.from_snippet(crawlspace_node) for crawlspace_node in parsed['crawlspaces']]
         )
         foundations.extend(
-            [basement.Basement.from_data(slab_node) for slab_node in parsed['slabs']]
+            [basement.Basement.from_snippet(slab_node) for slab_node in parsed['slabs']]
         )
 
         return ParsedDwellingDataRow(
@@ -172,30 +187,49 @@ class ParsedDwellingDataRow(_ParsedDwellingDataRow):
             city=parsed['CLIENTCITY'],
             region=Region.from_data(parsed['HOUSEREGION']),
             forward_sortation_area=parsed['forwardSortationArea'],
-            ceilings=[ceiling.Ceiling.from_data(ceiling_node) for ceiling_node in parsed['ceilings']],
-            floors=[floor.Floor.from_data(floor_node) for floor_node in parsed['floors']],
-            walls=[wall.Wall.from_data(wall_node, codes.wall) for wall_node in parsed['walls']],
-            doors=[door.Door.from_data(door_node) for door_node in parsed['doors']],
-            windows=[window.Window.from_data(window_node, codes.window) for window_node in parsed['windows']],
-            heated_floor=heated_floor_area.HeatedFloorArea.from_data(parsed['heatedFloorArea'])
+            ceilings=[ceiling.Ceiling.from_snippet(ceiling_node) for ceiling_node in parsed['ceilings']],
+            floors=[floor.Floor.from_snippet(floor_node) for floor_node in parsed['floors']],
+            walls=[wall.Wall.from_snippet(wall_node, codes.wall) for wall_node in parsed['walls']],
+            doors=[door.Door.from_snippet(door_node) for door_node in parsed['doors']],
+            windows=[window.Window.from_snippet(window_node, codes.window) for window_node in parsed['windows']],
+            heated_floor=heated_floor_area.HeatedFloorArea.from_snippet(parsed['heatedFloorArea'])
             if parsed['heatedFloorArea'] is not None else None,
 
-            water_heatings=water_heating.WaterHeating.from_data(parsed['waterHeatings'])
+            water_heatings=water_heating.WaterHeating.from_snippet(parsed['waterHeatings'])
             if parsed['waterHeatings'] is not None else [],
 
-            ventilations=[ventilation.Ventilation.from_data(ventilation_node)
+            ventilations=[ventilation.Ventilation.from_snippet(ventilation_node)
                           for ventilation_node in parsed['ventilations']],
-            heating_system=heating.Heating.from_data(parsed['heating_cooling'])
+            heating_system=heating.Heating.from_snippet(parsed['heating_cooling'])
             if parsed['heating_cooling'] is not None else None,
 
             foundations=foundations,
             ers_rating=parsed['ersRating'],
-            energy_upgrades=[upgrade.Upgrade.from_data(upgrade_node) for upgrade_node in parsed['upgrades']],
+            energy_upgrades=[upgrade.Upgrade.from_snippet(upgrade_node) for upgrade_node in parsed['upgrades']],
             file_id=parsed['BUILDER'],
         )
 
 
 class Evaluation:
+    __slots__ = (
+        '_evaluation_type',
+        '_entry_date',
+        '_creation_date',
+        '_modification_date',
+        '_ceilings',
+        '_floors',
+        '_walls',
+        '_doors',
+        '_windows',
+        '_heated_floor_area',
+        '_ventilations',
+        '_water_heatings',
+        '_foundations',
+        '_ers_rating',
+        '_energy_upgrades',
+        '_heating_system',
+        '_file_id',
+    )
 
     def __init__(self, *,
                  evaluation_type: EvaluationType,
@@ -347,6 +381,14 @@ class Evaluation:
 
 
 class Dwelling:
+    __slots__ = (
+        '_house_id',
+        '_year_built',
+        '_city',
+        '_region',
+        '_forward_sortation_area',
+        '_evaluations',
+    )
 
     GROUPING_FIELD = 'EVAL_ID'
 
@@ -420,3 +462,6 @@ class Dwelling:
             'forwardSortationArea': self.forward_sortation_area,
             'evaluations': [evaluation.to_dict() for evaluation in self.evaluations]
         }
+
+    def to_bson(self) -> raw_bson.RawBSONDocument:
+        return serialization.to_raw_bson(self.to_dict())
@@ -1,3 +1,4 @@
+import io
 import typing
 from lxml import etree
 from energuide.exceptions import EnerguideError, ElementGetValueError
@@ -10,6 +11,49 @@ class MalformedXmlError(EnerguideError):
 T = typing.TypeVar('T', int, float, str)
 
 
+class _XPathCacheInfo(typing.NamedTuple):
+    hits: int
+    misses: int
+    size: int
+
+
+class XPathCacheInfo(_XPathCacheInfo):
+    pass
+
+
+class XPathCache:
+
+    def __init__(self) -> None:
+        self._compiled: typing.Dict[str, etree.XPath] = {}
+        self._hits = 0
+        self._misses = 0
+
+    def compile(self, expression: str) -> etree.XPath:
+        compiled = self._compiled.get(expression)
+        if compiled is not None:
+            self._hits += 1
+            return compiled
+
+        self._misses += 1
+        if '{' in expression:
+            compiled = etree.ETXPath(expression, smart_strings=False)
+        else:
+            compiled = etree.XPath(expression, smart_strings=False)
+        self._compiled[expression] = compiled
+        return compiled
+
+    def info(self) -> XPathCacheInfo:
+        return XPathCacheInfo(hits=self._hits, misses=self._misses, size=len(self._compiled))
+
+    def clear(self) -> None:
+        self._compiled.clear()
+        self._hits = 0
+        self._misses = 0
+
+
+XPATH_CACHE = XPathCache()
+
+
 class Element:
 
     _PARSER = etree.XMLParser(ns_clean=True, recover=True, encoding='utf-8')
@@ -28,16 +72,39 @@ class Element:
             raise MalformedXmlError(f'Invalid XML fragment: {data}')
         return cls(output)
 
+    @classmethod
+    def iterparse(cls,
+                  data: str,
+                  events: typing.Sequence[str] = ('end',),
+                  tags: typing.Optional[typing.Sequence[str]] = None) -> typing.Iterator[typing.Tuple[str, 'Element']]:
+        context = etree.iterparse(io.BytesIO(data.encode('utf-8')), events=events, tag=tags, recover=True)
+        for event, node in context:
+            yield event, cls(node)
+        if context.root is None:
+            raise MalformedXmlError(f'Invalid XML fragment: {data}')
+
     @classmethod
     def parse(cls, *args, **kwargs):
         output = etree.parse(*args, **kwargs)
         return cls(output.find('.'))
 
+    def _first(self, path: str) -> typing.Optional[etree._Element]:
+        for node in XPATH_CACHE.compile(path)(self.__node):
+            if isinstance(node, etree._Element):
+                return node
+        return None
+
     def findtext(self, *args, **kwargs) -> typing.Optional[str]:
-        return self.__node.findtext(*args, **kwargs)
+        if len(args) != 1 or kwargs:
+            return self.__node.findtext(*args, **kwargs)
+
+        output = self._first(args[0])
+        if output is None:
+            return None
+        return output.text or ''
 
     def get_text(self, *args, **kwargs) -> str:
-        result: typing.Optional[str] = self.__node.findtext(*args, **kwargs)
+        result: typing.Optional[str] = self.findtext(*args, **kwargs)
         if result is None:
             error_message = (
                 f"Couldn't find text at path {args[0]} in tag {self.tag}"
@@ -52,11 +119,25 @@ class Element:
         return self.__node.attrib
 
     def xpath(self, *args, **kwargs) -> typing.List[typing.Any]:
-        output = self.__node.xpath(*args, **kwargs)
+        if len(args) == 1 and not kwargs:
+            output = XPATH_CACHE.compile(args[0])(self.__node)
+        else:
+            output = self.__node.xpath(*args, **kwargs)
         return [Element(node) if isinstance(node, etree._Element) else node for node in output]
 
     def find(self, *args, **kwargs) -> typing.Optional['Element']:
-        output = self.__node.find(*args, **kwargs)
+        if len(args) == 1 and not kwargs:
+            output = self._first(args[0])
+        else:
+            output = self.__node.find(*args, **kwargs)
+        return Element(output) if output is not None else None
+
+    def iterdescendants(self, *tags: str) -> typing.Iterator['Element']:
+        for node in self.__node.iterdescendants(*tags):
+            yield Element(node)
+
+    def getparent(self) -> typing.Optional['Element']:
+        output = self.__node.getparent()
         return Element(output) if output is not None else None
 
     def to_string(self) -> str:
@@ -75,7 +156,7 @@ class Element:
 
     def get(self, xpath: str, type_: typing.Type[T]) -> T:
         try:
-            value = self.__node.xpath(xpath)[0]
+            value = XPATH_CACHE.compile(xpath)(self.__node)[0]
         except IndexError as ex:
             raise ElementGetValueError(f"Couldn't find element at {xpath} in {self.tag}") from ex
 
@@ -1,4 +1,6 @@
 class Area:
+    __slots__ = ('_area_metric',)
+
     _FEET_SQUARED_MULTIPLIER = 3.28084 ** 2
 
     def __init__(self, area_metric: float) -> None:
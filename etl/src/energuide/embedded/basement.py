@@ -2,9 +2,11 @@ import enum
 import typing
 from energuide import element
 from energuide import bilingual
+from energuide import snippets
 from energuide.embedded import area
 from energuide.embedded import distance
 from energuide.embedded import insulation
+from energuide.embedded import serializers
 from energuide.exceptions import ElementGetValueError
 from energuide.exceptions import InvalidEmbeddedDataTypeError
 
@@ -62,14 +64,19 @@ class _BasementHeader(typing.NamedTuple):
 
 
 class BasementHeader(_BasementHeader):
+    __slots__ = ()
 
     @classmethod
     def from_data(cls, header: element.Element) -> 'BasementHeader':
+        return cls.from_snippet(snippets.snip_basement_header(header))
+
+    @classmethod
+    def from_snippet(cls, header: snippets.Snippet) -> 'BasementHeader':
         try:
-            nominal_insulation = header.get('Construction/Type/@nominalInsulation', float)
-            effective_insulation = header.get('Construction/Type/@rValue', float)
-            height = header.get('Measurements/@height', float)
-            width = header.get('Measurements/@perimeter', float)
+            nominal_insulation = snippets.get_value(header, 'nominalInsulation', float)
+            effective_insulation = snippets.get_value(header, 'rValue', float)
+            height = snippets.get_value(header, 'height', float)
+            width = snippets.get_value(header, 'perimeter', float)
         except ElementGetValueError as exc:
             raise InvalidEmbeddedDataTypeError(BasementHeader, 'Invalid/Missing attribute value') from exc
 
@@ -101,6 +108,7 @@ class BasementHeader(_BasementHeader):
 
 
 class BasementFloor(_BasementFloor):
+    __slots__ = ()
 
     _FLOOR_TYPE_TRANSLATION = {
         FloorType.SLAB: bilingual.Bilingual(
@@ -112,6 +120,7 @@ class BasementFloor(_BasementFloor):
             french='Plancher au-dessus du vide sanitaire',
         ),
     }
+    _floor_type_columns = staticmethod(serializers.translation_columns(_FLOOR_TYPE_TRANSLATION, 'floorType'))
 
     @classmethod
     def _empty_floor(cls, floor_type: FloorType) -> 'BasementFloor':
@@ -127,31 +136,32 @@ class BasementFloor(_BasementFloor):
         )
 
     @classmethod
-    def _from_data(cls,
-                   floor: element.Element,
-                   construction_type: str,
-                   floor_type: FloorType) -> 'BasementFloor':
+    def _from_snippet(cls,
+                      floor: snippets.Snippet,
+                      construction_type: str,
+                      floor_type: FloorType) -> 'BasementFloor':
 
         length: typing.Optional[float] = None
         width: typing.Optional[float] = None
 
         try:
-            rectangular = floor.get('Measurements/@isRectangular', str) == 'true'
+            rectangular = snippets.get_value(floor, 'isRectangular', str) == 'true'
             if rectangular:
-                length = floor.get('Measurements/@length', float)
-                width = floor.get('Measurements/@width', float)
+                length = snippets.get_value(floor, 'length', float)
+                width = snippets.get_value(floor, 'width', float)
                 perimeter = (2 * length) + (2 * width)
                 floor_area = length * width
             else:
-                floor_area = floor.get('Measurements/@area', float)
-                perimeter = floor.get('Measurements/@perimeter', float)
+                floor_area = snippets.get_value(floor, 'area', float)
+                perimeter = snippets.get_value(floor, 'perimeter', float)
 
-            nominal_insulation_node = floor.xpath(f'Construction/{construction_type}/@nominalInsulation')
-            effective_insulation_node = floor.xpath(f'Construction/{construction_type}/@rValue')
+            construction = floor['construction'][construction_type]
+            nominal_insulation_value = construction['nominalInsulation']
+            effective_insulation_value = construction['rValue']
 
-            nominal_insulation = float(nominal_insulation_node[0]) if nominal_insulation_node else None
+            nominal_insulation = float(nominal_insulation_value) if nominal_insulation_value is not None else None
 
-            effective_insulation = float(effective_insulation_node[0]) if effective_insulation_node else None
+            effective_insulation = float(effective_insulation_value) if effective_insulation_value is not None else None
         except ValueError as exc:
             raise InvalidEmbeddedDataTypeError(BasementFloor, 'Invalid insulation attribute values') from exc
         except ElementGetValueError as exc:
@@ -175,34 +185,43 @@ class BasementFloor(_BasementFloor):
 
     @classmethod
     def from_basement(cls, floor: typing.Optional[element.Element]) -> typing.List['BasementFloor']:
+        return cls.from_basement_snippet(snippets.snip_basement_floor(floor) if floor is not None else None)
+
+    @classmethod
+    def from_basement_snippet(cls, floor: typing.Optional[snippets.Snippet]) -> typing.List['BasementFloor']:
         return [
-            cls._from_data(floor, 'AddedToSlab', FloorType.SLAB)
+            cls._from_snippet(floor, 'AddedToSlab', FloorType.SLAB)
             if floor is not None else cls._empty_floor(FloorType.SLAB)
         ]
 
     @classmethod
     def from_crawlspace(cls, floor: typing.Optional[element.Element]) -> typing.List['BasementFloor']:
+        return cls.from_crawlspace_snippet(snippets.snip_basement_floor(floor) if floor is not None else None)
+
+    @classmethod
+    def from_crawlspace_snippet(cls, floor: typing.Optional[snippets.Snippet]) -> typing.List['BasementFloor']:
         if floor is None:
             return [cls._empty_floor(FloorType.SLAB), cls._empty_floor(FloorType.FLOOR_ABOVE_CRAWLSPACE)]
 
         return [
-            cls._from_data(floor, 'AddedToSlab', FloorType.SLAB),
-            cls._from_data(floor, 'FloorsAbove', FloorType.FLOOR_ABOVE_CRAWLSPACE),
+            cls._from_snippet(floor, 'AddedToSlab', FloorType.SLAB),
+            cls._from_snippet(floor, 'FloorsAbove', FloorType.FLOOR_ABOVE_CRAWLSPACE),
         ]
 
     @classmethod
     def from_slab(cls, floor: typing.Optional[element.Element]) -> typing.List['BasementFloor']:
+        return cls.from_slab_snippet(snippets.snip_basement_floor(floor) if floor is not None else None)
+
+    @classmethod
+    def from_slab_snippet(cls, floor: typing.Optional[snippets.Snippet]) -> typing.List['BasementFloor']:
         return [
-            cls._from_data(floor, 'AddedToSlab', FloorType.SLAB)
+            cls._from_snippet(floor, 'AddedToSlab', FloorType.SLAB)
             if floor is not None else cls._empty_floor(FloorType.SLAB)
         ]
 
     def to_dict(self) -> typing.Dict[str, typing.Any]:
-        floor_type = self._FLOOR_TYPE_TRANSLATION.get(self.floor_type)
-
         return {
-            'floorTypeEnglish': floor_type.english if floor_type is not None else None,
-            'floorTypeFrench': floor_type.french if floor_type is not None else None,
+            **self._floor_type_columns(self.floor_type),
             'insulationNominalRsi': self.nominal_insulation.rsi if self.nominal_insulation is not None else None,
             'insulationNominalR': self.nominal_insulation.r_value if self.nominal_insulation is not None else None,
             'insulationEffectiveRsi': self.effective_insulation.rsi if self.effective_insulation is not None else None,
@@ -220,6 +239,7 @@ class BasementFloor(_BasementFloor):
 
 
 class BasementWall(_BasementWall):
+    __slots__ = ()
 
     _WALL_TYPE_TRANSLATION = {
         WallType.INTERIOR: bilingual.Bilingual(
@@ -239,21 +259,22 @@ class BasementWall(_BasementWall):
             french='Mur',
         ),
     }
+    _wall_type_columns = staticmethod(serializers.translation_columns(_WALL_TYPE_TRANSLATION, 'wallType'))
 
     @classmethod
-    def _from_data(cls,
-                   wall: element.Element,
-                   wall_perimeter: float,
-                   wall_height: float,
-                   tag: WallType,
-                   backup_percentage: float) -> 'BasementWall':
-
-        maybe_percentage = wall.attrib.get('percentage')
+    def _from_snippet(cls,
+                      wall: snippets.Snippet,
+                      wall_perimeter: float,
+                      wall_height: float,
+                      tag: WallType,
+                      backup_percentage: float) -> 'BasementWall':
+
+        maybe_percentage = wall.get('percentage')
         percentage = float(maybe_percentage) if maybe_percentage else backup_percentage
 
         try:
-            nominal_insulation = wall.get('@nominalRsi', float)
-            effective_insulation = wall.get('@rsi', float)
+            nominal_insulation = snippets.get_value(wall, 'nominalRsi', float)
+            effective_insulation = snippets.get_value(wall, 'rsi', float)
         except ElementGetValueError as exc:
             raise InvalidEmbeddedDataTypeError(BasementWall, 'Invalid insulation attributes') from exc
 
@@ -268,13 +289,17 @@ class BasementWall(_BasementWall):
 
     @classmethod
     def from_basement(cls, wall: element.Element, wall_perimeter: float) -> typing.List['BasementWall']:
-        interior_wall_sections = wall.xpath('Construction/InteriorAddedInsulation/Composite/Section')
-        exterior_wall_sections = wall.xpath('Construction/ExteriorAddedInsulation/Composite/Section')
-        pony_wall_sections = wall.xpath('Construction/PonyWallType/Composite/Section')
+        return cls.from_basement_snippet(snippets.snip_basement_wall(wall), wall_perimeter)
+
+    @classmethod
+    def from_basement_snippet(cls, wall: snippets.Snippet, wall_perimeter: float) -> typing.List['BasementWall']:
+        interior_wall_sections = wall['sections']['InteriorAddedInsulation']
+        exterior_wall_sections = wall['sections']['ExteriorAddedInsulation']
+        pony_wall_sections = wall['sections']['PonyWallType']
 
         try:
-            wall_height = wall.get('Measurements/@height', float)
-            pony_height = wall.get('Measurements/@ponyWallHeight', float)
+            wall_height = snippets.get_value(wall, 'height', float)
+            pony_height = snippets.get_value(wall, 'ponyWallHeight', float)
         except ElementGetValueError as exc:
             raise InvalidEmbeddedDataTypeError(BasementWall, 'Missing/invalid basement wall height') from exc
 
@@ -282,21 +307,21 @@ class BasementWall(_BasementWall):
         sections = (interior_wall_sections, exterior_wall_sections, pony_wall_sections)
 
         parsers = (
-            lambda section, percentage: BasementWall._from_data(
+            lambda section, percentage: BasementWall._from_snippet(
                 section,
                 wall_perimeter,
                 wall_height,
                 WallType.INTERIOR,
                 percentage
             ),
-            lambda section, percentage: BasementWall._from_data(
+            lambda section, percentage: BasementWall._from_snippet(
                 section,
                 wall_perimeter,
                 wall_height,
                 WallType.EXTERIOR,
                 percentage
             ),
-            lambda section, percentage: BasementWall._from_data(
+            lambda section, percentage: BasementWall._from_snippet(
                 section,
                 wall_perimeter,
                 pony_height,
@@ -306,27 +331,31 @@ class BasementWall(_BasementWall):
         )
 
         for parser, wall_sections in zip(parsers, sections):
-            percentages = [wall.attrib.get('percentage') for wall in wall_sections]
+            percentages = [section.get('percentage') for section in wall_sections]
             accounted_for = sum(float(percentage) for percentage in percentages if percentage is not None)
 
-            walls.extend([parser(wall, 100-accounted_for) for wall in wall_sections])
+            walls.extend([parser(section, 100-accounted_for) for section in wall_sections])
 
         return walls
 
     @classmethod
     def from_crawlspace(cls, wall: element.Element, wall_perimeter: float) -> typing.List['BasementWall']:
-        wall_sections = wall.xpath('Construction/Type/Composite/Section')
+        return cls.from_crawlspace_snippet(snippets.snip_basement_wall(wall), wall_perimeter)
+
+    @classmethod
+    def from_crawlspace_snippet(cls, wall: snippets.Snippet, wall_perimeter: float) -> typing.List['BasementWall']:
+        wall_sections = wall['sections']['Type']
 
         try:
-            wall_height = wall.get('Measurements/@height', float)
+            wall_height = snippets.get_value(wall, 'height', float)
         except ElementGetValueError as exc:
             raise InvalidEmbeddedDataTypeError(BasementWall, 'Missing/invalid wall height') from exc
 
-        percentages = [wall.attrib.get('percentage') for wall in wall_sections]
+        percentages = [section.get('percentage') for section in wall_sections]
         accounted_for = sum(float(percentage) for percentage in percentages if percentage is not None)
 
         return [
-            BasementWall._from_data(
+            BasementWall._from_snippet(
                 wall_section,
                 wall_perimeter,
                 wall_height,
@@ -337,10 +366,8 @@ class BasementWall(_BasementWall):
         ]
 
     def to_dict(self) -> typing.Dict[str, typing.Any]:
-        wall_type = self._WALL_TYPE_TRANSLATION.get(self.wall_type)
         return {
-            'wallTypeEnglish': wall_type.english if wall_type is not None else None,
-            'wallTypeFrench': wall_type.french if wall_type is not None else None,
+            **self._wall_type_columns(self.wall_type),
             'insulationNominalRsi': self.nominal_insulation.rsi,
             'insulationNominalR': self.nominal_insulation.r_value,
             'insulationEffectiveRsi': self.effective_insulation.rsi,
@@ -362,6 +389,7 @@ class _Basement(typing.NamedTuple):
 
 
 class Basement(_Basement):
+    __slots__ = ()
 
     _MATERIAL_TRANSLATIONS = {
         MaterialType.UNKNOWN: bilingual.Bilingual(english='', french=''),
@@ -378,6 +406,7 @@ class Basement(_Basement):
             french='béton et bois',
         ),
     }
+    _material_columns = staticmethod(serializers.translation_columns(_MATERIAL_TRANSLATIONS, 'material'))
 
     _FOUNDATION_TRANSLATIONS = {
         FoundationType.BASEMENT: bilingual.Bilingual(
@@ -393,37 +422,42 @@ class Basement(_Basement):
             french='Dalle',
         ),
     }
+    _foundation_columns = staticmethod(serializers.translation_columns(_FOUNDATION_TRANSLATIONS, 'foundationType'))
 
     @classmethod
     def from_data(cls, basement: element.Element) -> 'Basement':
-        foundation_type = cls._derive_foundation_type(basement.tag)
+        return cls.from_snippet(snippets.snip_basement(basement))
+
+    @classmethod
+    def from_snippet(cls, basement: snippets.Snippet) -> 'Basement':
+        tag = basement['foundationType']
+        foundation_type = cls._derive_foundation_type(tag)
         if foundation_type is FoundationType.UNKNOWN:
-            raise InvalidEmbeddedDataTypeError(Basement, f'Invalid foundation type: {basement.tag}')
+            raise InvalidEmbeddedDataTypeError(Basement, f'Invalid foundation type: {tag}')
 
         if foundation_type is FoundationType.BASEMENT:
-            floor_from_data = BasementFloor.from_basement
-            wall_from_data = BasementWall.from_basement
-            header_from_data = BasementHeader.from_data
+            floor_from_snippet = BasementFloor.from_basement_snippet
+            wall_from_snippet = BasementWall.from_basement_snippet
+            header_from_snippet = BasementHeader.from_snippet
         elif foundation_type is FoundationType.CRAWLSPACE:
-            floor_from_data = BasementFloor.from_crawlspace
-            wall_from_data = BasementWall.from_crawlspace
-            header_from_data = BasementHeader.from_data
+            floor_from_snippet = BasementFloor.from_crawlspace_snippet
+            wall_from_snippet = BasementWall.from_crawlspace_snippet
+            header_from_snippet = BasementHeader.from_snippet
         else:
-            floor_from_data = BasementFloor.from_slab
-            wall_from_data = lambda *args: []
-            header_from_data = lambda *args: None
+            floor_from_snippet = BasementFloor.from_slab_snippet
+            wall_from_snippet = lambda *args: []
+            header_from_snippet = lambda *args: None
 
-        floor_nodes = basement.xpath('Floor')
-        header_nodes = basement.xpath('Components/FloorHeader')
-        wall_nodes = basement.xpath('Wall')
+        wall = basement['wall']
+        header_snippet = basement['header']
 
-        floors = floor_from_data(floor_nodes[0] if floor_nodes else None)
-        walls = wall_from_data(wall_nodes[0], floors[0].perimeter.metres) if wall_nodes else []
-        header = header_from_data(header_nodes[0]) if header_nodes else None
+        floors = floor_from_snippet(basement['floor'])
+        walls = wall_from_snippet(wall, floors[0].perimeter.metres) if wall is not None else []
+        header = header_from_snippet(header_snippet) if header_snippet is not None else None
 
         try:
-            configuration_type = basement.get('Configuration/@type', str)
-            label = basement.get_text('Label')
+            configuration_type = snippets.get_value(basement, 'configurationType', str)
+            label = snippets.get_value(basement, 'label', str)
         except ElementGetValueError as exc:
             raise InvalidEmbeddedDataTypeError(Basement, 'Missing/invalid foundation attributes') from exc
 
@@ -465,15 +499,11 @@ class Basement(_Basement):
         return Basement._derive_material(self.configuration_type)
 
     def to_dict(self) -> typing.Dict[str, typing.Any]:
-        material = self._MATERIAL_TRANSLATIONS.get(self.material)
-        foundation = self._FOUNDATION_TRANSLATIONS.get(self.foundation_type)
         return {
-            'foundationTypeEnglish': foundation.english if foundation else None,
-            'foundationTypeFrench': foundation.french if foundation else None,
+            **self._foundation_columns(self.foundation_type),
             'label': self.label,
             'configurationType': self.configuration_type,
-            'materialEnglish': material.english if material else None,
-            'materialFrench': material.french if material else None,
+            **self._material_columns(self.material),
             'walls': [wall.to_dict() for wall in self.walls],
             'floors': [floor.to_dict() for floor in self.floors],
             'header': self.header.to_dict() if self.header is not None else None,
@@ -1,6 +1,7 @@
 import typing
 from energuide import bilingual
 from energuide import element
+from energuide import snippets
 from energuide.embedded import area
 from energuide.embedded import distance
 from energuide.embedded import insulation
@@ -17,22 +18,25 @@ class _Ceiling(typing.NamedTuple):
 
 
 class Ceiling(_Ceiling):
+    __slots__ = ()
 
     @classmethod
     def from_data(cls, ceiling: element.Element) -> 'Ceiling':
+        return cls.from_snippet(snippets.snip_ceiling(ceiling))
+
+    @classmethod
+    def from_snippet(cls, ceiling: snippets.Snippet) -> 'Ceiling':
         try:
             return Ceiling(
-                label=ceiling.get_text('Label'),
+                label=snippets.get_value(ceiling, 'label', str),
                 ceiling_type=bilingual.Bilingual(
-                    english=ceiling.get_text('Construction/Type/English'),
-                    french=ceiling.get_text('Construction/Type/French'),
+                    english=snippets.get_value(ceiling, 'typeEnglish', str),
+                    french=snippets.get_value(ceiling, 'typeFrench', str),
                 ),
-                nominal_insulation=insulation.Insulation(
-                    ceiling.get('Construction/CeilingType/@nominalInsulation', float)),
-                effective_insulation=insulation.Insulation(
-                    ceiling.get('Construction/CeilingType/@rValue', float)),
-                ceiling_area=area.Area(ceiling.get('Measurements/@area', float)),
-                ceiling_length=distance.Distance(ceiling.get('Measurements/@length', float)),
+                nominal_insulation=insulation.Insulation(snippets.get_value(ceiling, 'nominalInsulation', float)),
+                effective_insulation=insulation.Insulation(snippets.get_value(ceiling, 'rValue', float)),
+                ceiling_area=area.Area(snippets.get_value(ceiling, 'area', float)),
+                ceiling_length=distance.Distance(snippets.get_value(ceiling, 'length', float)),
             )
         except (ElementGetValueError) as exc:
             raise InvalidEmbeddedDataTypeError(Ceiling) from exc
@@ -2,6 +2,7 @@ import enum
 import typing
 from energuide import bilingual
 from energuide import element
+from energuide import snippets
 from energuide.exceptions import InvalidEmbeddedDataTypeError, ElementGetValueError
 
 
@@ -17,19 +18,24 @@ class _WallCode(typing.NamedTuple):
 
 
 class WallCode(_WallCode):
+    __slots__ = ()
 
     @classmethod
     def from_data(cls, wall_code: element.Element) -> 'WallCode':
-        structure_type_english = wall_code.findtext('Layers/StructureType/English')
-        structure_type_french = wall_code.findtext('Layers/StructureType/French')
+        return cls.from_snippet(snippets.snip_wall_code(wall_code))
 
-        component_type_size_english = wall_code.findtext('Layers/ComponentTypeSize/English')
-        component_type_size_french = wall_code.findtext('Layers/ComponentTypeSize/French')
+    @classmethod
+    def from_snippet(cls, wall_code: snippets.Snippet) -> 'WallCode':
+        structure_type_english = wall_code.get('structureTypeEnglish')
+        structure_type_french = wall_code.get('structureTypeFrench')
+
+        component_type_size_english = wall_code.get('componentTypeSizeEnglish')
+        component_type_size_french = wall_code.get('componentTypeSizeFrench')
 
         try:
             return WallCode(
-                identifier=wall_code.get('@id', str),
-                label=wall_code.get_text('Label'),
+                identifier=snippets.get_value(wall_code, 'id', str),
+                label=snippets.get_value(wall_code, 'label', str),
                 tags={
                     WallCodeTag.STRUCTURE_TYPE: bilingual.Bilingual(
                         english=structure_type_english,
@@ -61,32 +67,36 @@ class _WindowCode(typing.NamedTuple):
 
 
 class WindowCode(_WindowCode):
+    __slots__ = ()
 
     @classmethod
     def from_data(cls, window_code: element.Element) -> 'WindowCode':
+        return cls.from_snippet(snippets.snip_window_code(window_code))
 
-        glazing_type_english = window_code.findtext('Layers/GlazingTypes/English')
-        glazing_type_french = window_code.findtext('Layers/GlazingTypes/French')
+    @classmethod
+    def from_snippet(cls, window_code: snippets.Snippet) -> 'WindowCode':
+        glazing_type_english = window_code.get('glazingTypesEnglish')
+        glazing_type_french = window_code.get('glazingTypesFrench')
 
-        coating_tint_english = window_code.findtext('Layers/CoatingsTints/English')
-        coating_tint_french = window_code.findtext('Layers/CoatingsTints/French')
+        coating_tint_english = window_code.get('coatingsTintsEnglish')
+        coating_tint_french = window_code.get('coatingsTintsFrench')
 
-        fill_type_english = window_code.findtext('Layers/FillType/English')
-        fill_type_french = window_code.findtext('Layers/FillType/French')
+        fill_type_english = window_code.get('fillTypeEnglish')
+        fill_type_french = window_code.get('fillTypeFrench')
 
-        spacer_type_english = window_code.findtext('Layers/SpacerType/English')
-        spacer_type_french = window_code.findtext('Layers/SpacerType/French')
+        spacer_type_english = window_code.get('spacerTypeEnglish')
+        spacer_type_french = window_code.get('spacerTypeFrench')
 
-        window_code_type_english = window_code.findtext('Layers/Type/English')
-        window_code_type_french = window_code.findtext('Layers/Type/French')
+        window_code_type_english = window_code.get('typeEnglish')
+        window_code_type_french = window_code.get('typeFrench')
 
-        frame_material_english = window_code.findtext('Layers/FrameMaterial/English')
-        frame_material_french = window_code.findtext('Layers/FrameMaterial/French')
+        frame_material_english = window_code.get('frameMaterialEnglish')
+        frame_material_french = window_code.get('frameMaterialFrench')
 
         try:
             return WindowCode(
-                identifier=window_code.get('@id', str),
-                label=window_code.get_text('Label'),
+                identifier=snippets.get_value(window_code, 'id', str),
+                label=snippets.get_value(window_code, 'label', str),
                 tags={
                     WindowCodeTag.GLAZING_TYPE: bilingual.Bilingual(
                         english=glazing_type_english,
@@ -124,11 +134,19 @@ class _Codes(typing.NamedTuple):
 
 
 class Codes(_Codes):
+    __slots__ = ()
 
     @classmethod
     def from_data(cls, codes: typing.Dict[str, typing.List[element.Element]]) -> 'Codes':
-        wall_code_list = [WallCode.from_data(wall_code) for wall_code in codes['wall']]
-        window_code_list = [WindowCode.from_data(window_code) for window_code in codes['window']]
+        return cls.from_snippet({
+            'wall': [snippets.snip_wall_code(wall_code) for wall_code in codes['wall']],
+            'window': [snippets.snip_window_code(window_code) for window_code in codes['window']],
+        })
+
+    @classmethod
+    def from_snippet(cls, codes: typing.Dict[str, typing.List[snippets.Snippet]]) -> 'Codes':
+        wall_code_list = [WallCode.from_snippet(wall_code) for wall_code in codes['wall']]
+        window_code_list = [WindowCode.from_snippet(window_code) for window_code in codes['window']]
 
         wall_codes = {wall_code.identifier: wall_code for wall_code in wall_code_list}
         window_codes = {window_code.identifier: window_code for window_code in window_code_list}
@@ -1,4 +1,6 @@
 class Distance:
+    __slots__ = ('_distance',)
+
     _FEET_MULTIPLIER = 3.28084
 
     def __init__(self, distance_metres: float) -> None:
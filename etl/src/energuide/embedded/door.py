@@ -1,6 +1,7 @@
 import typing
 from energuide import bilingual
 from energuide import element
+from energuide import snippets
 from energuide.embedded import distance
 from energuide.embedded import area
 from energuide.embedded import insulation
@@ -16,20 +17,26 @@ class _Door(typing.NamedTuple):
 
 
 class Door(_Door):
+    __slots__ = ()
+
     _RSI_MULTIPLIER = 5.678263337
 
     @classmethod
     def from_data(cls, door: element.Element) -> 'Door':
+        return cls.from_snippet(snippets.snip_door(door))
+
+    @classmethod
+    def from_snippet(cls, door: snippets.Snippet) -> 'Door':
         try:
             return Door(
-                label=door.get_text('Label'),
+                label=snippets.get_value(door, 'label', str),
                 door_type=bilingual.Bilingual(
-                    english=door.get_text('Construction/Type/English'),
-                    french=door.get_text('Construction/Type/French'),
+                    english=snippets.get_value(door, 'typeEnglish', str),
+                    french=snippets.get_value(door, 'typeFrench', str),
                 ),
-                door_insulation=insulation.Insulation(door.get('Construction/Type/@value', float)),
-                height=distance.Distance(door.get('Measurements/@height', float)),
-                width=distance.Distance(door.get('Measurements/@width', float)),
+                door_insulation=insulation.Insulation(snippets.get_value(door, 'rsi', float)),
+                height=distance.Distance(snippets.get_value(door, 'height', float)),
+                width=distance.Distance(snippets.get_value(door, 'width', float)),
             )
         except (ElementGetValueError) as exc:
             raise InvalidEmbeddedDataTypeError(Door) from exc
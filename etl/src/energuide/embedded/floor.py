@@ -1,5 +1,6 @@
 import typing
 from energuide import element
+from energuide import snippets
 from energuide.embedded import area
 from energuide.embedded import distance
 from energuide.embedded import insulation
@@ -15,16 +16,21 @@ class _Floor(typing.NamedTuple):
 
 
 class Floor(_Floor):
+    __slots__ = ()
 
     @classmethod
     def from_data(cls, floor: element.Element) -> 'Floor':
+        return cls.from_snippet(snippets.snip_floor(floor))
+
+    @classmethod
+    def from_snippet(cls, floor: snippets.Snippet) -> 'Floor':
         try:
             return Floor(
-                label=floor.get_text('Label'),
-                nominal_insulation=insulation.Insulation(floor.get('Construction/Type/@nominalInsulation', float)),
-                effective_insulation=insulation.Insulation(floor.get('Construction/Type/@rValue', float)),
-                floor_area=area.Area(floor.get('Measurements/@area', float)),
-                floor_length=distance.Distance(floor.get('Measurements/@length', float)),
+                label=snippets.get_value(floor, 'label', str),
+                nominal_insulation=insulation.Insulation(snippets.get_value(floor, 'nominalInsulation', float)),
+                effective_insulation=insulation.Insulation(snippets.get_value(floor, 'rValue', float)),
+                floor_area=area.Area(snippets.get_value(floor, 'area', float)),
+                floor_length=distance.Distance(snippets.get_value(floor, 'length', float)),
             )
         except (ElementGetValueError) as exc:
             raise InvalidEmbeddedDataTypeError(Floor) from exc
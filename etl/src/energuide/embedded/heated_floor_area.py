@@ -1,7 +1,8 @@
 import typing
 from energuide import element
+from energuide import snippets
 from energuide.embedded import area
-from energuide.exceptions import InvalidEmbeddedDataTypeError
+from energuide.exceptions import InvalidEmbeddedDataTypeError, ElementGetValueError
 
 
 class _HeatedFloorArea(typing.NamedTuple):
@@ -10,15 +11,20 @@ class _HeatedFloorArea(typing.NamedTuple):
 
 
 class HeatedFloorArea(_HeatedFloorArea):
+    __slots__ = ()
 
     @classmethod
     def from_data(cls, heated_floor_area: element.Element) -> 'HeatedFloorArea':
+        return cls.from_snippet(snippets.snip_heated_floor_area(heated_floor_area))
+
+    @classmethod
+    def from_snippet(cls, heated_floor_area: snippets.Snippet) -> 'HeatedFloorArea':
         try:
             return HeatedFloorArea(
-                area_above_grade=area.Area(float(heated_floor_area.attrib['aboveGrade'])),
-                area_below_grade=area.Area(float(heated_floor_area.attrib['belowGrade'])),
+                area_above_grade=area.Area(snippets.get_value(heated_floor_area, 'aboveGrade', float)),
+                area_below_grade=area.Area(snippets.get_value(heated_floor_area, 'belowGrade', float)),
             )
-        except (KeyError, ValueError) as exc:
+        except ElementGetValueError as exc:
             raise InvalidEmbeddedDataTypeError(HeatedFloorArea) from exc
 
     def to_dict(self) -> typing.Dict[str, typing.Optional[float]]:
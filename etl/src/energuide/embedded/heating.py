@@ -2,6 +2,8 @@ import enum
 import typing
 from energuide import bilingual
 from energuide import element
+from energuide import snippets
+from energuide.embedded import serializers
 from energuide.exceptions import InvalidEmbeddedDataTypeError
 from energuide.exceptions import ElementGetValueError
 
@@ -33,6 +35,7 @@ class _Heating(typing.NamedTuple):
 
 
 class Heating(_Heating):
+    __slots__ = ()
 
     _KWH_TO_BTU = 3412.142
 
@@ -54,6 +57,7 @@ class Heating(_Heating):
                                               french='Système combiné certifié pour le chauffage '
                                                      'des locaux et de l’eau'),
     }
+    _heating_type_columns = staticmethod(serializers.translation_columns(_HEATING_TYPE_TRANSLATIONS, 'heatingType'))
 
     _ENERGY_SOURCE_CODES = {
         1: EnergySource.ELECTRIC,
@@ -77,15 +81,16 @@ class Heating(_Heating):
                                                french='Chauffage au bois(Bois mélangé, Bois dur, Bois mou, '
                                                       'Granules de bois)'),
     }
+    _energy_source_columns = staticmethod(serializers.translation_columns(_ENERGY_SOURCE_TRANSLATIONS, 'energySource'))
 
     @classmethod
-    def _get_output_size(cls, node: element.Element) -> float:
-        capacity_node = node.find('Type1/*/Specifications/OutputCapacity')
+    def _get_output_size(cls, node: snippets.Snippet) -> float:
+        capacity_node = node.get('outputCapacity')
         assert capacity_node is not None
 
         try:
-            units = capacity_node.get('@uiUnits', str)
-            capacity_value = capacity_node.get('@value', float)
+            units = snippets.get_value(capacity_node, 'units', str)
+            capacity_value = snippets.get_value(capacity_node, 'value', float)
         except ElementGetValueError as exc:
             raise InvalidEmbeddedDataTypeError(Heating, 'Invalid/missing attribute values') from exc
 
@@ -101,8 +106,8 @@ class Heating(_Heating):
         return capacity
 
     @classmethod
-    def _get_heating_type(cls, node: element.Element) -> HeatingType:
-        candidates = [candidate.tag for candidate in node.xpath('Type1/*')]
+    def _get_heating_type(cls, node: snippets.Snippet) -> HeatingType:
+        candidates = node.get('heatingTypes') or []
         heating_type: typing.Optional[HeatingType] = None
         for candidate in candidates:
             if candidate in cls._HEATING_TYPE_NODE_NAMES:
@@ -114,9 +119,9 @@ class Heating(_Heating):
         return heating_type
 
     @classmethod
-    def _get_energy_source(cls, node: element.Element) -> EnergySource:
+    def _get_energy_source(cls, node: snippets.Snippet) -> EnergySource:
         try:
-            code = node.get('Type1/*/Equipment/EnergySource/@code', int)
+            code = snippets.get_value(node, 'energySourceCode', int)
         except ElementGetValueError as exc:
             raise InvalidEmbeddedDataTypeError(Heating, 'No EnergySource heating code') from exc
 
@@ -127,15 +132,15 @@ class Heating(_Heating):
         return energy_source
 
     @classmethod
-    def _get_equipment_type(cls, node: element.Element) -> bilingual.Bilingual:
-        english_text = node.get_text('Type1/*/Equipment/EquipmentType/English')
-        french_text = node.get_text('Type1/*/Equipment/EquipmentType/French')
+    def _get_equipment_type(cls, node: snippets.Snippet) -> bilingual.Bilingual:
+        english_text = snippets.get_value(node, 'equipmentTypeEnglish', str)
+        french_text = snippets.get_value(node, 'equipmentTypeFrench', str)
         return bilingual.Bilingual(english=english_text, french=french_text)
 
     @staticmethod
-    def _get_steady_state(node: element.Element) -> str:
+    def _get_steady_state(node: snippets.Snippet) -> str:
         try:
-            steady_state_value = node.get('Type1/*/Specifications/@isSteadyState', str)
+            steady_state_value = snippets.get_value(node, 'isSteadyState', str)
         except ElementGetValueError as exc:
             raise InvalidEmbeddedDataTypeError(Heating, 'No isSteadyState property value') from exc
 
@@ -143,9 +148,13 @@ class Heating(_Heating):
 
     @classmethod
     def from_data(cls, node: element.Element) -> 'Heating':
+        return cls.from_snippet(snippets.snip_heating(node))
+
+    @classmethod
+    def from_snippet(cls, node: snippets.Snippet) -> 'Heating':
         try:
-            label = node.get_text('Label')
-            efficiency = node.get('Type1/*/Specifications/@efficiency', float)
+            label = snippets.get_value(node, 'label', str)
+            efficiency = snippets.get_value(node, 'efficiency', float)
         except ElementGetValueError as exc:
             raise InvalidEmbeddedDataTypeError(Heating, 'Invalid/missing Heating values') from exc
 
@@ -174,10 +183,8 @@ class Heating(_Heating):
     def to_dict(self) -> typing.Dict[str, typing.Any]:
         return {
             'label': self.label,
-            'heatingTypeEnglish': self._HEATING_TYPE_TRANSLATIONS[self.heating_type].english,
-            'heatingTypeFrench': self._HEATING_TYPE_TRANSLATIONS[self.heating_type].french,
-            'energySourceEnglish': self._ENERGY_SOURCE_TRANSLATIONS[self.energy_source].english,
-            'energySourceFrench': self._ENERGY_SOURCE_TRANSLATIONS[self.energy_source].french,
+            **self._heating_type_columns(self.heating_type),
+            **self._energy_source_columns(self.energy_source),
             'equipmentTypeEnglish': self.equipment_type.english,
             'equipmentTypeFrench': self.equipment_type.french,
             'outputSizeKW': self.output_size,
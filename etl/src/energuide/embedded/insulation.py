@@ -1,4 +1,6 @@
 class Insulation:
+    __slots__ = ('_rsi',)
+
     _RSI_MULTIPLIER = 5.678263337
 
     def __init__(self, rsi: float) -> None:
@@ -0,0 +1,53 @@
+import typing
+from energuide import bilingual
+
+
+K = typing.TypeVar('K')
+Columns = typing.Dict[str, typing.Optional[str]]
+CodeTags = typing.Mapping[typing.Any, typing.Optional[bilingual.Bilingual]]
+
+
+def _bilingual_keys(name: str) -> typing.Tuple[str, str]:
+    return f'{name}English', f'{name}French'
+
+
+def code_tag_columns(translations: typing.List[typing.Tuple[typing.Any, str]]
+                    ) -> typing.Callable[[typing.Optional[CodeTags]], Columns]:
+    namespace: typing.Dict[str, typing.Any] = {
+        'EMPTY': {key: None for _, name in translations for key in _bilingual_keys(name)},
+    }
+    lookups = []
+    entries = []
+    for index, (tag, name) in enumerate(translations):
+        english, french = _bilingual_keys(name)
+        namespace[f'TAG_{index}'] = tag
+        lookups.append(f'    tag_{index} = tags.get(TAG_{index})')
+        entries.append(f'        {english!r}: tag_{index}.english if tag_{index} is not None else None,')
+        entries.append(f'        {french!r}: tag_{index}.french if tag_{index} is not None else None,')
+
+    source = '\n'.join([
+        'def code_tag_columns(tags):',
+        '    if tags is None:',
+        '        return EMPTY',
+        *lookups,
+        '    return {',
+        *entries,
+        '    }',
+    ])
+    filename = f'<code_tag_columns {", ".join(name for _, name in translations)}>'
+    exec(compile(source, filename, 'exec'), namespace)  # pylint: disable=exec-used
+    return namespace['code_tag_columns']
+
+
+def translation_columns(translations: typing.Mapping[K, bilingual.Bilingual],
+                        name: str) -> typing.Callable[[K], Columns]:
+    english, french = _bilingual_keys(name)
+    table: typing.Dict[K, Columns] = {
+        key: {english: translation.english, french: translation.french}
+        for key, translation in translations.items()
+    }
+    empty: Columns = {english: None, french: None}
+
+    def columns(key: K) -> Columns:
+        return table.get(key, empty)
+    return columns
@@ -1,5 +1,6 @@
 import typing
 from energuide import element
+from energuide import snippets
 
 
 class _Upgrade(typing.NamedTuple):
@@ -9,13 +10,18 @@ class _Upgrade(typing.NamedTuple):
 
 
 class Upgrade(_Upgrade):
+    __slots__ = ()
 
     @classmethod
     def from_data(cls, setting: element.Element) -> 'Upgrade':
+        return cls.from_snippet(snippets.snip_upgrade(setting))
+
+    @classmethod
+    def from_snippet(cls, setting: snippets.Snippet) -> 'Upgrade':
         return Upgrade(
-            upgrade_type=setting.tag,
-            cost=int(setting.attrib['cost']),
-            priority=int(setting.attrib['priority'])
+            upgrade_type=setting['upgradeType'],
+            cost=snippets.get_value(setting, 'cost', int),
+            priority=snippets.get_value(setting, 'priority', int),
         )
 
     def to_dict(self) -> typing.Dict[str, typing.Any]:
@@ -1,8 +1,9 @@
 import enum
 import typing
 from energuide import element
+from energuide import snippets
 from energuide import bilingual
-from energuide.exceptions import InvalidEmbeddedDataTypeError
+from energuide.exceptions import InvalidEmbeddedDataTypeError, ElementGetValueError
 
 
 class VentilationType(enum.Enum):
@@ -20,6 +21,7 @@ class _Ventilation(typing.NamedTuple):
 
 
 class Ventilation(_Ventilation):
+    __slots__ = ()
 
     _CFM_MULTIPLIER = 2.11888
 
@@ -60,19 +62,23 @@ class Ventilation(_Ventilation):
 
     @classmethod
     def from_data(cls, ventilation: element.Element) -> 'Ventilation':
+        return cls.from_snippet(snippets.snip_ventilation(ventilation))
+
+    @classmethod
+    def from_snippet(cls, ventilation: snippets.Snippet) -> 'Ventilation':
         try:
-            energy_star = ventilation.attrib['isEnergyStar'] == 'true'
-            institute_certified = ventilation.attrib['isHomeVentilatingInstituteCertified'] == 'true'
-            total_supply_flow = float(ventilation.attrib['supplyFlowrate'])
+            energy_star = snippets.get_value(ventilation, 'isEnergyStar', str) == 'true'
+            institute_certified = snippets.get_value(ventilation, 'isHomeVentilatingInstituteCertified', str) == 'true'
+            total_supply_flow = snippets.get_value(ventilation, 'supplyFlowrate', float)
 
             ventilation_type = cls._derive_ventilation_type(total_supply_flow, energy_star, institute_certified)
 
             return Ventilation(
                 ventilation_type=ventilation_type,
                 air_flow_rate=total_supply_flow,
-                efficiency=float(ventilation.attrib['efficiency1']),
+                efficiency=snippets.get_value(ventilation, 'efficiency', float),
             )
-        except (KeyError, ValueError) as exc:
+        except ElementGetValueError as exc:
             raise InvalidEmbeddedDataTypeError(Ventilation) from exc
 
     @property
@@ -3,7 +3,9 @@ from energuide.embedded import area
 from energuide.embedded import code
 from energuide.embedded import insulation
 from energuide.embedded import distance
+from energuide.embedded import serializers
 from energuide import element
+from energuide import snippets
 from energuide.exceptions import InvalidEmbeddedDataTypeError, ElementGetValueError
 
 
@@ -17,28 +19,36 @@ class _Wall(typing.NamedTuple):
 
 
 class Wall(_Wall):
+    __slots__ = ()
 
     _CODE_TAG_TRANSLATIONS = [
         (code.WallCodeTag.STRUCTURE_TYPE, 'structureType'),
         (code.WallCodeTag.COMPONENT_TYPE_SIZE, 'componentTypeSize')
     ]
+    _code_tag_columns = staticmethod(serializers.code_tag_columns(_CODE_TAG_TRANSLATIONS))
 
     @classmethod
     def from_data(cls,
                   wall: element.Element,
                   wall_codes: typing.Dict[str, code.WallCode]) -> 'Wall':
+        return cls.from_snippet(snippets.snip_wall(wall), wall_codes)
 
-        code_id = wall.xpath('Construction/Type/@idref')
-        wall_code = wall_codes[code_id[0]] if code_id else None
+    @classmethod
+    def from_snippet(cls,
+                     wall: snippets.Snippet,
+                     wall_codes: typing.Dict[str, code.WallCode]) -> 'Wall':
+
+        code_id = wall.get('codeId')
+        wall_code = wall_codes[code_id] if code_id else None
 
         try:
             return Wall(
-                label=wall.get_text('Label'),
+                label=snippets.get_value(wall, 'label', str),
                 wall_code=wall_code,
-                nominal_insulation=insulation.Insulation(wall.get('Construction/Type/@nominalInsulation', float)),
-                effective_insulation=insulation.Insulation(wall.get('Construction/Type/@rValue', float)),
-                perimeter=distance.Distance(wall.get('Measurements/@perimeter', float)),
-                height=distance.Distance(wall.get('Measurements/@height', float)),
+                nominal_insulation=insulation.Insulation(snippets.get_value(wall, 'nominalInsulation', float)),
+                effective_insulation=insulation.Insulation(snippets.get_value(wall, 'rValue', float)),
+                perimeter=distance.Distance(snippets.get_value(wall, 'perimeter', float)),
+                height=distance.Distance(snippets.get_value(wall, 'height', float)),
             )
         except (ElementGetValueError) as exc:
             raise InvalidEmbeddedDataTypeError(Wall) from exc
@@ -48,33 +58,16 @@ class Wall(_Wall):
         return area.Area(self.perimeter.metres * self.height.metres)
 
     def to_dict(self) -> typing.Dict[str, typing.Any]:
-        code_tags: typing.Dict[str, typing.Optional[str]] = dict(
-            item
-            for _, tag_name in self._CODE_TAG_TRANSLATIONS
-            for item in [
-                (f'{tag_name}English', None),
-                (f'{tag_name}French', None),
-            ]
-        )
-
-        if self.wall_code:
-            for tag_type, tag_name in self._CODE_TAG_TRANSLATIONS:
-                tag_value = self.wall_code.tags.get(tag_type)
-                code_tags.update(
-                    **{
-                        f'{tag_name}English': tag_value.english if tag_value else None,
-                        f'{tag_name}French': tag_value.french if tag_value else None,
-                    }
-                )
+        wall_area = self._wall_area
         return {
             'label': self.label,
-            **code_tags,
+            **self._code_tag_columns(self.wall_code.tags if self.wall_code else None),
             'insulationNominalRsi': self.nominal_insulation.rsi,
             'insulationNominalR': self.nominal_insulation.r_value,
             'insulationEffectiveRsi': self.effective_insulation.rsi,
             'insulationEffectiveR': self.effective_insulation.r_value,
-            'areaMetres': self._wall_area.square_metres,
-            'areaFeet': self._wall_area.square_feet,
+            'areaMetres': wall_area.square_metres,
+            'areaFeet': wall_area.square_feet,
             'perimeterMetres': self.perimeter.metres,
             'perimeterFeet': self.perimeter.feet,
             'heightMetres': self.height.metres,
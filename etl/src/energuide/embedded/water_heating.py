@@ -2,6 +2,8 @@ import enum
 import typing
 from energuide import bilingual
 from energuide import element
+from energuide import snippets
+from energuide.embedded import serializers
 from energuide.exceptions import InvalidEmbeddedDataTypeError, ElementGetValueError
 
 
@@ -55,6 +57,7 @@ class _WaterHeating(typing.NamedTuple):
 
 
 class WaterHeating(_WaterHeating):
+    __slots__ = ()
 
     _LITRE_TO_GALLON = 0.264172
 
@@ -277,54 +280,54 @@ class WaterHeating(_WaterHeating):
             french="Système combiné certifié pour le chauffage des locaux et de l’eau",
         ),
     }
+    _type_columns = staticmethod(serializers.translation_columns(_WATER_HEATER_TYPE_TRANSLATION, 'type'))
 
     @classmethod
-    def _from_data(cls, water_heating: element.Element) -> 'WaterHeating':
+    def _from_snippet(cls, water_heating: snippets.Snippet) -> 'WaterHeating':
         drain_water_efficiency: typing.Optional[float] = None
-        if water_heating.get('@hasDrainWaterHeatRecovery', str) == 'true':
-            drain_water_efficiency = water_heating.get('DrainWaterHeatRecovery/@effectivenessAt9.5', float)
+        if snippets.get_value(water_heating, 'hasDrainWaterHeatRecovery', str) == 'true':
+            drain_water_efficiency = snippets.get_value(water_heating, 'drainWaterHeatRecoveryEffectiveness', float)
 
         try:
-            energy_type = water_heating.get_text('EnergySource/English')
-            tank_type = water_heating.get_text('TankType/English')
+            energy_type = snippets.get_value(water_heating, 'energySourceEnglish', str)
+            tank_type = snippets.get_value(water_heating, 'tankTypeEnglish', str)
 
             water_heater_type = cls._TYPE_MAP[(energy_type.lower(), tank_type.lower())]
-            volume = water_heating.get('TankVolume/@value', float)
+            volume = snippets.get_value(water_heating, 'tankVolume', float)
         except ElementGetValueError as exc:
             raise InvalidEmbeddedDataTypeError(WaterHeating, 'Missing/invalid attribue or text') from exc
         except KeyError as exc:
             raise InvalidEmbeddedDataTypeError(WaterHeating, 'Invlaid energy and tank type combination') from exc
 
-        efficiency_ef_node = water_heating.xpath('EnergyFactor/@value')
-        efficiency_percent_node = water_heating.xpath('EnergyFactor/@thermalEfficiency')
+        efficiency_ef = water_heating.get('energyFactor')
+        efficiency_percent = water_heating.get('thermalEfficiency')
 
-        if not efficiency_ef_node and not efficiency_percent_node:
+        if efficiency_ef is None and efficiency_percent is None:
             raise InvalidEmbeddedDataTypeError(WaterHeating, 'No efficiency values')
 
         return WaterHeating(
             water_heater_type=water_heater_type,
             tank_volume=volume,
-            efficiency_ef=float(efficiency_ef_node[0]) if efficiency_ef_node else None,
-            efficiency_percentage=float(efficiency_percent_node[0]) if efficiency_percent_node else None,
+            efficiency_ef=float(efficiency_ef) if efficiency_ef is not None else None,
+            efficiency_percentage=float(efficiency_percent) if efficiency_percent is not None else None,
             drain_water_heat_recovery_efficiency_percentage=drain_water_efficiency,
         )
 
     @classmethod
     def from_data(cls, water_heating: element.Element) -> typing.List['WaterHeating']:
-        water_heatings = water_heating.xpath("*[self::Primary or self::Secondary]")
+        return cls.from_snippet(snippets.snip_water_heating(water_heating))
 
-        return [cls._from_data(heater) for heater in water_heatings]
+    @classmethod
+    def from_snippet(cls, water_heatings: typing.List[snippets.Snippet]) -> typing.List['WaterHeating']:
+        return [cls._from_snippet(heater) for heater in water_heatings]
 
     @property
     def tank_volume_gallon(self) -> float:
         return self.tank_volume * self._LITRE_TO_GALLON
 
     def to_dict(self) -> typing.Dict[str, typing.Union[str, float, None]]:
-        translation = self._WATER_HEATER_TYPE_TRANSLATION[self.water_heater_type]
-
         return {
-            'typeEnglish': translation.english,
-            'typeFrench': translation.french,
+            **self._type_columns(self.water_heater_type),
             'tankVolumeLitres': self.tank_volume,
             'tankVolumeGallon': self.tank_volume_gallon,
             'efficiencyEf': self.efficiency_ef,
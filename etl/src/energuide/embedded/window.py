@@ -3,7 +3,9 @@ from energuide.embedded import area
 from energuide.embedded import code
 from energuide.embedded import insulation
 from energuide.embedded import distance
+from energuide.embedded import serializers
 from energuide import element
+from energuide import snippets
 from energuide.exceptions import InvalidEmbeddedDataTypeError, ElementGetValueError
 
 
@@ -19,6 +21,7 @@ class _Window(typing.NamedTuple):
 
 
 class Window(_Window):
+    __slots__ = ()
 
     _CODE_TAG_TRANSLATIONS = [
         (code.WindowCodeTag.GLAZING_TYPE, 'glazingTypes'),
@@ -28,22 +31,29 @@ class Window(_Window):
         (code.WindowCodeTag.CODE_TYPE, 'type'),
         (code.WindowCodeTag.FRAME_MATERIAL, 'frameMaterial'),
     ]
+    _code_tag_columns = staticmethod(serializers.code_tag_columns(_CODE_TAG_TRANSLATIONS))
 
     @classmethod
     def from_data(cls,
                   window: element.Element,
                   window_codes: typing.Dict[str, code.WindowCode]) -> 'Window':
+        return cls.from_snippet(snippets.snip_window(window), window_codes)
 
-        code_id = window.xpath('Construction/Type/@idref')
-        window_code = window_codes[code_id[0]] if code_id else None
+    @classmethod
+    def from_snippet(cls,
+                     window: snippets.Snippet,
+                     window_codes: typing.Dict[str, code.WindowCode]) -> 'Window':
+
+        code_id = window.get('codeId')
+        window_code = window_codes[code_id] if code_id else None
 
         try:
             return Window(
-                label=window.get_text('Label'),
+                label=snippets.get_value(window, 'label', str),
                 window_code=window_code,
-                window_insulation=insulation.Insulation(window.get('Construction/Type/@rValue', float)),
-                width=distance.Distance(window.get('Measurements/@width', float) / _MILLIMETRES_TO_METRES),
-                height=distance.Distance(window.get('Measurements/@height', float) / _MILLIMETRES_TO_METRES),
+                window_insulation=insulation.Insulation(snippets.get_value(window, 'rValue', float)),
+                width=distance.Distance(snippets.get_value(window, 'width', float) / _MILLIMETRES_TO_METRES),
+                height=distance.Distance(snippets.get_value(window, 'height', float) / _MILLIMETRES_TO_METRES),
             )
         except (ElementGetValueError) as exc:
             raise InvalidEmbeddedDataTypeError(Window) from exc
@@ -53,32 +63,14 @@ class Window(_Window):
         return area.Area(self.width.metres * self.height.metres)
 
     def to_dict(self) -> typing.Dict[str, typing.Any]:
-        code_tags: typing.Dict[str, typing.Optional[str]] = dict(
-            item
-            for _, tag_name in self._CODE_TAG_TRANSLATIONS
-            for item in [
-                (f'{tag_name}English', None),
-                (f'{tag_name}French', None),
-            ]
-        )
-
-        if self.window_code:
-            for tag_type, tag_name in self._CODE_TAG_TRANSLATIONS:
-                tag_value = self.window_code.tags.get(tag_type)
-                code_tags.update(
-                    **{
-                        f'{tag_name}English': tag_value.english if tag_value else None,
-                        f'{tag_name}French': tag_value.french if tag_value else None,
-                    }
-                )
-
+        window_area = self._window_area
         return {
             'label': self.label,
             'insulationRsi': self.window_insulation.rsi,
             'insulationR': self.window_insulation.r_value,
-            **code_tags,
-            'areaMetres': self._window_area.square_metres,
-            'areaFeet': self._window_area.square_feet,
+            **self._code_tag_columns(self.window_code.tags if self.window_code else None),
+            'areaMetres': window_area.square_metres,
+            'areaFeet': window_area.square_feet,
             'widthMetres': self.width.metres,
             'widthFeet': self.width.feet,
             'heightMetres': self.height.metres,
@@ -1,13 +1,20 @@
+import collections
 import csv
-import json
+import itertools
+import os
 import typing
 import sys
 import zipfile
-import cerberus
+from concurrent import futures
 from tqdm import tqdm
-from energuide import element
+from energuide import dwelling
+from energuide import grouping
 from energuide import logger
+from energuide import record_log
+from energuide import serialization
 from energuide import snippets
+from energuide import timings
+from energuide import validator
 from energuide.exceptions import InvalidInputDataError, EnerguideError
 
 
@@ -33,8 +40,16 @@ INPUT_SCHEMA = {field: {'type': 'string', 'required': True} for field in REQUIRE
 for field in NULLABLE_FIELDS:
     INPUT_SCHEMA[field] = {'type': 'string', 'required': True, 'nullable': True}
 
+INPUT_VALIDATOR = validator.CompiledValidator(INPUT_SCHEMA, purge_unknown=True)
+
 _WINDOWS_LONG_SIZE = (2 ** 31) - 1
 
+EXTRACT_CHUNKSIZE = 32
+
+_CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+T = typing.TypeVar('T')
+
 
 def _empty_to_none(row: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing.Any]:
     for key, value in row.items():
@@ -43,11 +58,18 @@ def _empty_to_none(row: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing
     return row
 
 
-def _validated(row: typing.Dict[str, typing.Any], validator: cerberus.Validator) -> typing.Dict[str, typing.Any]:
-    if not validator.validate(row):
-        error_keys = ', '.join(validator.errors.keys())
+def _validated(row: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing.Any]:
+    document, errors = INPUT_VALIDATOR.check(row)
+    if errors:
+        error_keys = ', '.join(errors.keys())
         raise InvalidInputDataError(f'Validator failed on keys: {error_keys} for {row.get("BUILDER")}')
-    return validator.document
+    return document
+
+
+def _decoded_lines(file: typing.BinaryIO, progress: tqdm) -> typing.Iterator[str]:
+    for line in file:
+        progress.update(len(line))
+        yield line.decode('utf-8')
 
 
 def _read_csv(filepath: str, show_progress: bool) -> typing.Iterator[typing.Dict[str, typing.Any]]:
@@ -56,12 +78,10 @@ def _read_csv(filepath: str, show_progress: bool) -> typing.Iterator[typing.Dict
     except OverflowError:
         csv.field_size_limit(_WINDOWS_LONG_SIZE)
 
-    with open(filepath, 'r', encoding='utf-8', newline='') as file:
-        total_lines = sum(1 for _ in file)
-
-    with tqdm(open(filepath, 'r', encoding='utf-8', newline=''),
-              total=total_lines, unit=' lines', disable=not show_progress) as file:
-        csv_reader = csv.DictReader(file)
+    total_bytes = os.stat(filepath).st_size
+    with open(filepath, 'rb') as file, \
+            tqdm(total=total_bytes, unit='B', unit_scale=True, disable=not show_progress) as progress:
+        csv_reader = csv.DictReader(_decoded_lines(file, progress))
         for row in csv_reader:
             yield row
 
@@ -75,60 +95,110 @@ def _safe_merge(data: typing.Dict[str, typing.Any],
 
 
 def _extract_snippets(row: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing.Any]:
-    doc = element.Element.from_string(row['RAW_XML'])
-    house_node = doc.xpath('House')
-    if house_node:
-        house_snippets = snippets.snip_house(house_node[0])
-        row = _safe_merge(row, house_snippets.to_dict())
-    else:
-        row = _safe_merge(row, snippets.HouseSnippet.EMPTY_SNIPPET)
+    document_snippets = snippets.snip_document(row['RAW_XML'])
+    return _safe_merge(row, document_snippets.to_dict())
 
-    code_node = doc.xpath('Codes')
-    if code_node:
-        code_snippets = snippets.snip_codes(code_node[0])
-        row = _safe_merge(row, code_snippets.to_dict())
-    else:
-        row = _safe_merge(row, snippets.Codes.EMPTY_SNIPPET)
 
-    upgrades_node = doc.xpath('EnergyUpgrades')
-    if upgrades_node:
-        energy_snippets = snippets.snip_energy_upgrades(upgrades_node[0])
-        row = _safe_merge(row, energy_snippets.to_dict())
-    else:
-        row = _safe_merge(row, snippets.EnergyUpgradesSnippet.EMPTY_SNIPPET)
+def _extract_row(row: typing.Dict[str, typing.Any]) -> typing.Optional[typing.Dict[str, typing.Any]]:
+    try:
+        patched = _empty_to_none(row)
+        with timings.TIMINGS.timed('validation'):
+            validated_data = _validated(patched)
+        with timings.TIMINGS.timed('parsing'):
+            return _extract_snippets(validated_data)
+    except EnerguideError as ex:
+        LOGGER.error(f"Error extracting data from row {row.get('BUILDER', 'Unknown ID')}. Details: {ex}")
+        return None
+
+
+def _extract_chunk(rows: typing.List[typing.Dict[str, typing.Any]]
+                  ) -> typing.List[typing.Optional[typing.Dict[str, typing.Any]]]:
+    return [_extract_row(row) for row in rows]
+
+
+def _chunk(data: typing.Iterable[T], size: int) -> typing.Iterator[typing.List[T]]:
+    iterator = iter(data)
+    chunk = list(itertools.islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(itertools.islice(iterator, size))
 
-    tsv_fields = snippets.snip_other_data(doc)
-    row = _safe_merge(row, tsv_fields.to_dict())
-    return row
+
+def _extract_parallel(rows: typing.Iterable[typing.Dict[str, typing.Any]],
+                      workers: int,
+                      chunk_size: int) -> typing.Iterator[typing.Optional[typing.Dict[str, typing.Any]]]:
+    pending: typing.Deque[futures.Future] = collections.deque()
+    with futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk in _chunk(rows, chunk_size):
+            pending.append(executor.submit(timings.timed_call, timings.TIMINGS.enabled, _extract_chunk, chunk))
+            if len(pending) >= workers * _CHUNKS_IN_FLIGHT_PER_WORKER:
+                yield from timings.merged_result(pending.popleft())
+
+        while pending:
+            yield from timings.merged_result(pending.popleft())
 
 
 def extract_data(input_path: str,
-                 show_progress: bool = False) -> typing.Iterator[typing.Optional[typing.Dict[str, typing.Any]]]:
-    validator = cerberus.Validator(INPUT_SCHEMA, purge_unknown=True)
-    rows = _read_csv(input_path, show_progress)
+                 show_progress: bool = False,
+                 workers: int = 1,
+                 chunk_size: int = EXTRACT_CHUNKSIZE
+                ) -> typing.Iterator[typing.Optional[typing.Dict[str, typing.Any]]]:
+    rows = timings.TIMINGS.timed_iter('read', _read_csv(input_path, show_progress))
+
+    if workers > 1:
+        yield from _extract_parallel(rows, workers, chunk_size)
+    else:
+        for row in rows:
+            yield _extract_row(row)
 
-    for row in rows:
-        try:
-            patched = _empty_to_none(row)
-            validated_data = _validated(patched, validator)
-            result = _extract_snippets(validated_data)
-            yield result
-        except EnerguideError as ex:
-            LOGGER.error(f"Error extracting data from row {row.get('BUILDER', 'Unknown ID')}. Details: {ex}")
-            yield None
 
+ZIP_FORMAT = 'zip'
+RECORD_LOG_FORMAT = 'log'
+OUTPUT_FORMATS = [ZIP_FORMAT, RECORD_LOG_FORMAT]
 
-def write_data(data: typing.Iterable[typing.Optional[typing.Dict[str, typing.Any]]],
-               output_path: str) -> typing.Tuple[int, int]:
-    records_written, records_failed = 0, 0
+
+def _record_name(blob: typing.Dict[str, typing.Any]) -> str:
+    return f"{blob['EVAL_ID']}-{blob['BUILDER']}"
+
+
+def _write_zip(blobs: typing.Iterable[typing.Dict[str, typing.Any]], output_path: str) -> None:
     with zipfile.ZipFile(output_path, mode='w', compression=zipfile.ZIP_DEFLATED) as output_zip:
+        for blob in blobs:
+            with timings.TIMINGS.timed('write'):
+                output_zip.writestr(_record_name(blob), serialization.dumps(blob))
+
+
+def _write_record_log(blobs: typing.Iterable[typing.Dict[str, typing.Any]],
+                      output_path: str,
+                      memory_budget: int) -> None:
+    groups = grouping.group_rows(blobs, dwelling.Dwelling.GROUPING_FIELD, memory_budget)
+    with open(output_path, 'wb') as output_file:
+        writer = record_log.RecordLogWriter(output_file, dwelling.Dwelling.GROUPING_FIELD)
+        for group in groups:
+            for blob in sorted(group, key=_record_name):
+                with timings.TIMINGS.timed('write'):
+                    writer.write(blob)
+        with timings.TIMINGS.timed('write'):
+            writer.close()
+
+
+def write_data(data: typing.Iterable[typing.Optional[typing.Dict[str, typing.Any]]],
+               output_path: str,
+               output_format: str = ZIP_FORMAT,
+               memory_budget: int = grouping.DEFAULT_MEMORY_BUDGET) -> typing.Tuple[int, int]:
+    counts: typing.Counter[str] = collections.Counter()
+
+    def valid_blobs() -> typing.Iterator[typing.Dict[str, typing.Any]]:
         for blob in data:
             if blob is None or not blob.get('BUILDER'):
-                records_failed += 1
+                counts['failed'] += 1
             else:
-                blob_id: str = blob['BUILDER']
-                eval_id: str = blob['EVAL_ID']
-                output_zip.writestr(f'{eval_id}-{blob_id}', json.dumps(blob))
-                records_written += 1
+                counts['written'] += 1
+                yield blob
+
+    if output_format == RECORD_LOG_FORMAT:
+        _write_record_log(valid_blobs(), output_path, memory_budget)
+    else:
+        _write_zip(valid_blobs(), output_path)
 
-    return records_written, records_failed
+    return counts['written'], counts['failed']
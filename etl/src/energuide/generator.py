@@ -0,0 +1,184 @@
+import collections
+import copy
+import csv
+import functools
+import random
+import typing
+from lxml import etree
+from energuide import extractor
+from energuide.exceptions import EnerguideError
+
+
+COMPONENT_TAGS = ['Ceiling', 'Floor', 'Wall']
+NESTED_COMPONENT_TAGS = ['Window', 'Door']
+
+_XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" ?>\n'
+_POSTAL_CODE_PLACEHOLDER = '@@POSTAL_CODE@@'
+_XML_CACHE_SIZE = 64
+
+Row = typing.Dict[str, str]
+
+
+class GeneratorError(EnerguideError):
+    pass
+
+
+class _Location(typing.NamedTuple):
+    city: str
+    region: str
+    postal_code: str
+
+
+class Location(_Location):
+    pass
+
+
+class _Profile(typing.NamedTuple):
+    fieldnames: typing.List[str]
+    groups: typing.List[typing.List[Row]]
+    locations: typing.List[Location]
+    years_built: typing.List[str]
+    component_counts: typing.Dict[str, typing.List[int]]
+    pair_ratio: float
+
+
+class Profile(_Profile):
+
+    @classmethod
+    def from_csv(cls, filepath: str) -> 'Profile':
+        fieldnames: typing.List[str] = []
+        groups: typing.Dict[str, typing.List[Row]] = collections.OrderedDict()
+        locations: typing.List[Location] = []
+        years_built: typing.List[str] = []
+        component_counts: typing.Dict[str, typing.List[int]] = collections.defaultdict(list)
+
+        for row in extractor._read_csv(filepath, show_progress=False):
+            if not fieldnames:
+                fieldnames = list(row.keys())
+            if not row.get('RAW_XML') or not row.get('EVAL_ID'):
+                continue
+
+            groups.setdefault(row['EVAL_ID'], []).append(row)
+            if row.get('CLIENTCITY') and row.get('HOUSEREGION') and row.get('CLIENTPCODE'):
+                locations.append(Location(city=row['CLIENTCITY'],
+                                          region=row['HOUSEREGION'],
+                                          postal_code=row['CLIENTPCODE']))
+            if row.get('YEARBUILT'):
+                years_built.append(row['YEARBUILT'])
+
+            components = _parse(row['RAW_XML']).find('House/Components')
+            if components is not None:
+                for tag in COMPONENT_TAGS:
+                    component_counts[tag].append(len(components.findall(tag)))
+                for tag in NESTED_COMPONENT_TAGS:
+                    component_counts[tag].append(len(components.findall(f'.//Components/{tag}')))
+
+        if not groups or not locations:
+            raise GeneratorError(f'No usable template rows in {filepath}')
+
+        group_list = [sorted(group, key=lambda row: row.get('EVAL_TYPE', '')) for group in groups.values()]
+        return Profile(
+            fieldnames=fieldnames,
+            groups=group_list,
+            locations=locations,
+            years_built=years_built,
+            component_counts=dict(component_counts),
+            pair_ratio=sum(1 for group in group_list if len(group) > 1) / len(group_list),
+        )
+
+
+def _parse(raw_xml: str) -> etree._Element:
+    parser = etree.XMLParser(recover=True, encoding='utf-8', remove_blank_text=True)
+    return etree.fromstring(raw_xml.encode('utf-8'), parser=parser)
+
+
+def _resize(nodes: typing.List[etree._Element], count: int) -> None:
+    if not nodes:
+        return
+
+    for node in nodes[count:]:
+        node.getparent().remove(node)
+    if count <= len(nodes):
+        return
+
+    last = nodes[-1]
+    for _ in range(count - len(nodes)):
+        clone = copy.deepcopy(last)
+        last.addnext(clone)
+        last = clone
+
+
+def _build_xml(template: etree._Element, counts: typing.Dict[str, int]) -> str:
+    root = copy.deepcopy(template)
+    components = root.find('House/Components')
+    if components is not None:
+        for tag in COMPONENT_TAGS:
+            if tag in counts:
+                _resize(components.findall(tag), max(counts[tag], 1))
+
+        for tag in NESTED_COMPONENT_TAGS:
+            nested = components.findall(f'.//Components/{tag}')
+            if nested and tag in counts:
+                siblings = nested[0].getparent().findall(tag)
+                _resize(siblings, max(counts[tag] - (len(nested) - len(siblings)), 0))
+
+    postal_code = root.find('ProgramInformation/Client/StreetAddress/PostalCode')
+    if postal_code is not None:
+        postal_code.text = _POSTAL_CODE_PLACEHOLDER
+
+    return _XML_DECLARATION + etree.tostring(root, encoding='unicode')
+
+
+def generate_rows(profile: Profile, num_rows: int, seed: int) -> typing.Iterator[Row]:
+    rng = random.Random(seed)
+    parsed = {id(row): _parse(row['RAW_XML']) for group in profile.groups for row in group}
+    templates = [[(row, id(row)) for row in group] for group in profile.groups]
+    multi_row_templates = [group for group in templates if len(group) > 1]
+
+    @functools.lru_cache(maxsize=_XML_CACHE_SIZE)
+    def xml_for(template_id: int, counts: typing.Tuple[typing.Tuple[str, int], ...]) -> str:
+        return _build_xml(parsed[template_id], dict(counts))
+
+    eval_id = 0
+    remaining = num_rows
+    while remaining > 0:
+        eval_id += 1
+        paired = remaining > 1 and bool(multi_row_templates) and rng.random() < profile.pair_ratio
+        group = rng.choice(multi_row_templates)[:remaining] if paired else [rng.choice(rng.choice(templates))]
+        location = rng.choice(profile.locations)
+        year_built = rng.choice(profile.years_built) if profile.years_built else None
+        counts = tuple((tag, rng.choice(observed)) for tag, observed in sorted(profile.component_counts.items()))
+
+        previous_file_id = ''
+        for template_row, template_id in group:
+            row = dict(template_row)
+            eval_type = row.get('EVAL_TYPE') or 'D'
+            builder = f"{row.get('BUILDER', '')[:4]}{eval_type}{eval_id:08d}"
+
+            row.update({
+                'EVAL_ID': str(eval_id),
+                'BUILDER': builder,
+                'IDNUMBER': str(eval_id),
+                'PREVIOUSFILEID': previous_file_id,
+                'CLIENTCITY': location.city,
+                'HOUSEREGION': location.region,
+                'CLIENTPCODE': location.postal_code,
+                'RAW_XML': xml_for(template_id, counts).replace(_POSTAL_CODE_PLACEHOLDER, location.postal_code),
+            })
+            if year_built is not None:
+                row['YEARBUILT'] = year_built
+
+            previous_file_id = builder
+            remaining -= 1
+            yield row
+
+
+def write_csv(rows: typing.Iterable[Row], fieldnames: typing.List[str], output_path: str) -> int:
+    written = 0
+    with open(output_path, 'w', newline='', encoding='utf-8') as output_file:
+        writer = csv.DictWriter(output_file, fieldnames=fieldnames, extrasaction='ignore')
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            written += 1
+    return written
@@ -0,0 +1,156 @@
+import collections
+import heapq
+import itertools
+import os
+import sys
+import tempfile
+import typing
+from energuide import serialization
+from energuide.exceptions import EnerguideError
+
+
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+
+MAX_MERGE_FAN_IN = 64
+
+SIZE_SAMPLE_INTERVAL = 64
+
+Row = typing.Dict[str, typing.Any]
+_KeyedRow = typing.Tuple[str, Row]
+
+
+class GroupingError(EnerguideError):
+    pass
+
+
+def _in_memory_size(value: typing.Any) -> int:
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_in_memory_size(key) + _in_memory_size(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(_in_memory_size(item) for item in value)
+    return size
+
+
+def _read_run(path: str) -> typing.Iterator[_KeyedRow]:
+    with open(path, 'rb') as run:
+        for line in run:
+            key, row = serialization.loads(line)
+            yield key, row
+
+
+def _merged(paths: typing.List[str]) -> typing.Iterator[_KeyedRow]:
+    return heapq.merge(*[_read_run(path) for path in paths], key=lambda keyed_row: keyed_row[0])
+
+
+class ExternalGrouper:
+
+    def __init__(self,
+                 key_field: str,
+                 memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                 tmpdir: typing.Optional[str] = None) -> None:
+        self._key_field = key_field
+        self._memory_budget = memory_budget
+        self._tmpdir = tmpdir
+
+        self._buffer: typing.Dict[str, typing.List[Row]] = collections.defaultdict(list)
+        self._buffered_count = 0
+        self._sampled_rows = 0
+        self._sampled_bytes = 0
+        self._runs: typing.List[str] = []
+
+    @property
+    def num_runs(self) -> int:
+        return len(self._runs)
+
+    def _estimated_bytes(self) -> float:
+        return self._buffered_count * self._sampled_bytes / self._sampled_rows
+
+    def add(self, row: Row) -> None:
+        key = str(row.get(self._key_field))
+        self._buffer[key].append(row)
+        if self._buffered_count % SIZE_SAMPLE_INTERVAL == 0:
+            self._sampled_bytes += _in_memory_size(row)
+            self._sampled_rows += 1
+        self._buffered_count += 1
+
+        if self._estimated_bytes() >= self._memory_budget:
+            self._spill()
+
+    def _write_run(self, rows: typing.Iterable[_KeyedRow]) -> str:
+        file_descriptor, path = tempfile.mkstemp(prefix='energuide-group-', suffix='.run', dir=self._tmpdir)
+        try:
+            with os.fdopen(file_descriptor, 'wb') as run:
+                for key, row in rows:
+                    run.write(serialization.dumps([key, row]))
+                    run.write(b'\n')
+        except BaseException:
+            os.remove(path)
+            raise
+        return path
+
+    def _spill(self) -> None:
+        if not self._buffer:
+            return
+
+        self._runs.append(self._write_run(self._buffered_rows()))
+        self._buffer = collections.defaultdict(list)
+        self._buffered_count = 0
+
+    def _reduce_runs(self) -> None:
+        while len(self._runs) > MAX_MERGE_FAN_IN:
+            merging = self._runs[:MAX_MERGE_FAN_IN]
+            self._runs[:MAX_MERGE_FAN_IN] = [self._write_run(_merged(merging))]
+            for path in merging:
+                os.remove(path)
+
+    def _buffered_rows(self) -> typing.Iterator[_KeyedRow]:
+        for key in sorted(self._buffer):
+            for row in self._buffer[key]:
+                yield key, row
+
+    def groups(self) -> typing.Iterator[typing.List[Row]]:
+        try:
+            if self._runs:
+                self._spill()
+                self._reduce_runs()
+                rows: typing.Iterable[_KeyedRow] = _merged(self._runs)
+            else:
+                rows = self._buffered_rows()
+
+            for _, group in itertools.groupby(rows, key=lambda keyed_row: keyed_row[0]):
+                yield [row for _, row in group]
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        for path in self._runs:
+            if os.path.exists(path):
+                os.remove(path)
+        self._runs = []
+        self._buffer = collections.defaultdict(list)
+        self._buffered_count = 0
+
+
+def _presorted_groups(rows: typing.Iterable[Row], key_field: str) -> typing.Iterator[typing.List[Row]]:
+    last_key: typing.Optional[str] = None
+    for key, group in itertools.groupby(rows, key=lambda row: str(row.get(key_field))):
+        if last_key is not None and key <= last_key:
+            raise GroupingError(f'Rows must be sorted by {key_field}: {key} follows {last_key}')
+        last_key = key
+        yield list(group)
+
+
+def group_rows(rows: typing.Iterable[Row],
+               key_field: str,
+               memory_budget: int = DEFAULT_MEMORY_BUDGET,
+               tmpdir: typing.Optional[str] = None,
+               presorted: bool = False) -> typing.Iterator[typing.List[Row]]:
+    if presorted:
+        yield from _presorted_groups(rows, key_field)
+        return
+
+    grouper = ExternalGrouper(key_field, memory_budget, tmpdir)
+    for row in rows:
+        grouper.add(row)
+    yield from grouper.groups()
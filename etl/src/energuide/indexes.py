@@ -0,0 +1,148 @@
+import typing
+import pymongo
+from pymongo import errors
+from energuide import logger
+from energuide.exceptions import EnerguideError
+
+
+LOGGER = logger.get_logger(__name__)
+
+ID_INDEX = '_id_'
+
+Keys = typing.List[typing.Tuple[str, int]]
+
+
+class IndexSyncError(EnerguideError):
+    pass
+
+
+class _IndexSpec(typing.NamedTuple):
+    keys: Keys
+    unique: bool = False
+
+
+class IndexSpec(_IndexSpec):
+    __slots__ = ()
+
+    @property
+    def name(self) -> str:
+        return '_'.join(f'{field}_{direction}' for field, direction in self.keys)
+
+    def matches(self, info: typing.Mapping[str, typing.Any]) -> bool:
+        return [tuple(key) for key in info['key']] == self.keys and bool(info.get('unique')) == self.unique
+
+
+def _ascending(field: str, unique: bool = False) -> IndexSpec:
+    return IndexSpec(keys=[(field, pymongo.ASCENDING)], unique=unique)
+
+
+HOUSE_ID_INDEX = _ascending('houseId', unique=True)
+
+UPSERT_INDEXES = [
+    HOUSE_ID_INDEX,
+    IndexSpec(keys=[('houseId', pymongo.ASCENDING), ('fingerprint', pymongo.ASCENDING)]),
+]
+
+DWELLING_FIELDS = ['yearBuilt', 'city', 'region', 'forwardSortationArea']
+
+EVALUATION_FIELDS = [
+    'evaluationType',
+    'fileId',
+    'houseType',
+    'entryDate',
+    'creationDate',
+    'modificationDate',
+    'heatedFloorArea',
+]
+
+REQUIRED_INDEXES = UPSERT_INDEXES + [_ascending(field) for field in DWELLING_FIELDS] + [
+    _ascending(f'evaluations.{field}') for field in EVALUATION_FIELDS
+]
+
+
+class _IndexStatus(typing.NamedTuple):
+    name: str
+    size_bytes: int
+    accesses: typing.Optional[int]
+    declared: bool
+    created: bool
+
+
+class IndexStatus(_IndexStatus):
+    __slots__ = ()
+
+    @property
+    def unused(self) -> bool:
+        return self.name != ID_INDEX and self.accesses == 0
+
+
+def _create(collection: pymongo.collection.Collection, spec: IndexSpec) -> None:
+    LOGGER.info(f'building index {spec.name} on {collection.full_name}')
+    try:
+        collection.create_index(spec.keys, name=spec.name, unique=spec.unique, background=True)
+    except errors.OperationFailure as exc:
+        raise IndexSyncError(f'Unable to build index {spec.name} on {collection.full_name}: {exc}') from exc
+
+
+def ensure(collection: pymongo.collection.Collection,
+           specs: typing.Sequence[IndexSpec] = REQUIRED_INDEXES) -> typing.List[str]:
+    existing = collection.index_information()
+    created = []
+    for spec in specs:
+        info = existing.get(spec.name)
+        if info is not None and spec.matches(info):
+            continue
+
+        if info is not None:
+            LOGGER.warning(f'index {spec.name} on {collection.full_name} does not match its declaration, rebuilding')
+            collection.drop_index(spec.name)
+
+        _create(collection, spec)
+        created.append(spec.name)
+    return created
+
+
+def _index_sizes(collection: pymongo.collection.Collection) -> typing.Dict[str, int]:
+    stats = collection.database.command('collStats', collection.name)
+    return stats.get('indexSizes', {})
+
+
+def _index_accesses(collection: pymongo.collection.Collection) -> typing.Dict[str, int]:
+    try:
+        return {stats['name']: stats['accesses']['ops'] for stats in collection.aggregate([{'$indexStats': {}}])}
+    except errors.OperationFailure as exc:
+        LOGGER.warning(f'index usage is unavailable for {collection.full_name}: {exc}')
+        return {}
+
+
+def report(collection: pymongo.collection.Collection,
+           created: typing.Sequence[str] = (),
+           specs: typing.Sequence[IndexSpec] = REQUIRED_INDEXES) -> typing.List[IndexStatus]:
+    declared = {spec.name for spec in specs} | {ID_INDEX}
+    sizes = _index_sizes(collection)
+    accesses = _index_accesses(collection)
+    return [
+        IndexStatus(name=name,
+                    size_bytes=sizes.get(name, 0),
+                    accesses=accesses.get(name),
+                    declared=name in declared,
+                    created=name in created)
+        for name in sorted(collection.index_information())
+    ]
+
+
+def sync(collection: pymongo.collection.Collection,
+         specs: typing.Sequence[IndexSpec] = REQUIRED_INDEXES,
+         warn_unused: bool = True) -> typing.List[IndexStatus]:
+    created = ensure(collection, specs)
+    statuses = report(collection, created, specs)
+
+    for status in statuses:
+        LOGGER.info(f'index {status.name}: {status.size_bytes} bytes, {status.accesses} accesses'
+                    f'{", created" if status.created else ""}{"" if status.declared else ", undeclared"}')
+    if warn_unused:
+        for status in statuses:
+            if status.unused and not status.created:
+                LOGGER.warning(f'index {status.name} on {collection.full_name} has not been used since the server '
+                               f'started')
+    return statuses
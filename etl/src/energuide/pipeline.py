@@ -0,0 +1,117 @@
+import queue
+import threading
+import time
+import typing
+
+
+DEFAULT_DEPTH = 4
+STALL_THRESHOLD = 0.001
+_POLL_INTERVAL = 0.1
+
+T = typing.TypeVar('T')
+
+_DONE = object()
+
+
+class _StallReport(typing.NamedTuple):
+    items: int
+    producer_stalls: int
+    producer_stall_seconds: float
+    consumer_stalls: int
+    consumer_stall_seconds: float
+    elapsed_seconds: float
+
+
+class StallReport(_StallReport):
+    __slots__ = ()
+
+    @property
+    def bound(self) -> str:
+        if self.producer_stall_seconds > self.consumer_stall_seconds:
+            return 'database'
+        return 'transform'
+
+    def __str__(self) -> str:
+        return (f'{self.items} batches in {self.elapsed_seconds:.1f} s, transform waited '
+                f'{self.producer_stall_seconds:.1f} s on a full queue ({self.producer_stalls} stalls), writer waited '
+                f'{self.consumer_stall_seconds:.1f} s on an empty queue ({self.consumer_stalls} stalls): '
+                f'{self.bound} bound')
+
+
+class _Stalls:
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.seconds += seconds
+        if seconds > STALL_THRESHOLD:
+            self.count += 1
+
+
+class _Writer(threading.Thread):
+
+    def __init__(self, items: 'queue.Queue[typing.Any]', consume: typing.Callable[[typing.Any], None]) -> None:
+        super().__init__(name='energuide-writer', daemon=True)
+        self._items = items
+        self._consume = consume
+        self.stalls = _Stalls()
+        self.consumed = 0
+        self.error: typing.Optional[BaseException] = None
+
+    def run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            item = self._items.get()
+            self.stalls.record(time.perf_counter() - start)
+            if item is _DONE:
+                return
+
+            try:
+                self._consume(item)
+            except BaseException as exc:  # pylint: disable=broad-except
+                self.error = exc
+                return
+            self.consumed += 1
+
+
+def _put(items: 'queue.Queue[typing.Any]', item: typing.Any, writer: _Writer) -> bool:
+    while writer.is_alive():
+        try:
+            items.put(item, timeout=_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def run(items: typing.Iterable[T],
+        consume: typing.Callable[[T], None],
+        depth: int = DEFAULT_DEPTH) -> StallReport:
+    started = time.perf_counter()
+    pending: 'queue.Queue[typing.Any]' = queue.Queue(maxsize=max(depth, 1))
+    writer = _Writer(pending, consume)
+    producer_stalls = _Stalls()
+    writer.start()
+
+    try:
+        for item in items:
+            start = time.perf_counter()
+            accepted = _put(pending, item, writer)
+            producer_stalls.record(time.perf_counter() - start)
+            if not accepted:
+                break
+    finally:
+        _put(pending, _DONE, writer)
+        writer.join()
+
+    if writer.error is not None:
+        raise writer.error
+
+    return StallReport(items=writer.consumed,
+                       producer_stalls=producer_stalls.count,
+                       producer_stall_seconds=producer_stalls.seconds,
+                       consumer_stalls=writer.stalls.count,
+                       consumer_stall_seconds=writer.stalls.seconds,
+                       elapsed_seconds=time.perf_counter() - started)
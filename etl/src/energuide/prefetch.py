@@ -0,0 +1,92 @@
+import collections
+import threading
+import time
+import typing
+from concurrent import futures
+
+
+DEFAULT_WORKERS = 16
+DEFAULT_WINDOW = 256
+
+K = typing.TypeVar('K')
+V = typing.TypeVar('V')
+
+
+class _LatencySummary(typing.NamedTuple):
+    downloads: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+
+
+class LatencySummary(_LatencySummary):
+
+    def __str__(self) -> str:
+        return (f'{self.downloads} downloads, mean {self.mean_ms:.1f} ms, p50 {self.p50_ms:.1f} ms, '
+                f'p95 {self.p95_ms:.1f} ms, max {self.max_ms:.1f} ms')
+
+
+class LatencyStats:
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._latencies: typing.List[float] = []
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def latencies(self) -> typing.List[float]:
+        with self._lock:
+            return list(self._latencies)
+
+    def summary(self) -> LatencySummary:
+        latencies = sorted(self.latencies())
+        if not latencies:
+            return LatencySummary(downloads=0, mean_ms=0.0, p50_ms=0.0, p95_ms=0.0, max_ms=0.0)
+
+        def percentile(fraction: float) -> float:
+            return 1000 * latencies[min(int(fraction * len(latencies)), len(latencies) - 1)]
+
+        return LatencySummary(
+            downloads=len(latencies),
+            mean_ms=1000 * sum(latencies) / len(latencies),
+            p50_ms=percentile(0.5),
+            p95_ms=percentile(0.95),
+            max_ms=1000 * latencies[-1],
+        )
+
+
+def timed_fetch(fetch: typing.Callable[[K], V], stats: LatencyStats) -> typing.Callable[[K], V]:
+    def fetch_and_record(key: K) -> V:
+        start = time.perf_counter()
+        try:
+            return fetch(key)
+        finally:
+            stats.record(time.perf_counter() - start)
+    return fetch_and_record
+
+
+def prefetched(fetch: typing.Callable[[K], V],
+               keys: typing.Iterable[K],
+               workers: int = DEFAULT_WORKERS,
+               window: int = DEFAULT_WINDOW) -> typing.Iterator[V]:
+    if workers <= 1:
+        for key in keys:
+            yield fetch(key)
+        return
+
+    pending: typing.Deque[futures.Future] = collections.deque()
+    with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            for key in keys:
+                pending.append(executor.submit(fetch, key))
+                if len(pending) >= max(window, 1):
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,152 @@
+import io
+import json
+import struct
+import typing
+import zlib
+from energuide import serialization
+from energuide.exceptions import EnerguideError
+
+
+MAGIC = b'EGRLOG01'
+BLOCK_SIZE = 4 * 1024 * 1024
+
+_LENGTH = struct.Struct('>I')
+_TRAILER = struct.Struct(f'>QQ{len(MAGIC)}s')
+
+
+class RecordLogError(EnerguideError):
+    pass
+
+
+Record = typing.Dict[str, typing.Any]
+
+
+def is_record_log(filename: str) -> bool:
+    with open(filename, 'rb') as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+class RecordLogWriter:
+
+    def __init__(self, file: typing.BinaryIO, key_field: str, block_size: int = BLOCK_SIZE) -> None:
+        self._file = file
+        self._key_field = key_field
+        self._block_size = block_size
+
+        self._block = io.BytesIO()
+        self._block_keys: typing.List[str] = []
+        self._index: typing.Dict[str, int] = {}
+        self._last_key: typing.Optional[str] = None
+        self._num_records = 0
+
+        self._file.write(MAGIC)
+
+    def write(self, record: Record) -> None:
+        key = str(record[self._key_field])
+        if self._last_key is not None and key < self._last_key:
+            raise RecordLogError(f'Records must be sorted by {self._key_field}: {key} follows {self._last_key}')
+
+        if key != self._last_key:
+            self._block_keys.append(key)
+            self._last_key = key
+
+        data = serialization.dumps(record)
+        self._block.write(_LENGTH.pack(len(data)))
+        self._block.write(data)
+        self._num_records += 1
+
+        if self._block.tell() >= self._block_size:
+            self._flush_block()
+
+    def _flush_block(self) -> None:
+        if not self._block.tell():
+            return
+
+        offset = self._file.tell()
+        compressed = zlib.compress(self._block.getvalue())
+        self._file.write(_LENGTH.pack(len(compressed)))
+        self._file.write(compressed)
+
+        for key in self._block_keys:
+            self._index[key] = offset
+
+        self._block = io.BytesIO()
+        self._block_keys = []
+
+    def close(self) -> None:
+        self._flush_block()
+
+        footer = zlib.compress(json.dumps({
+            'keyField': self._key_field,
+            'numRecords': self._num_records,
+            'index': self._index,
+        }).encode('utf-8'))
+
+        footer_offset = self._file.tell()
+        self._file.write(footer)
+        self._file.write(_TRAILER.pack(footer_offset, len(footer), MAGIC))
+
+
+class RecordLogReader:
+
+    def __init__(self, filename: str) -> None:
+        self._filename = filename
+
+        with open(self._filename, 'rb') as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise RecordLogError(f'{self._filename} is not a record log')
+
+            if file.seek(0, io.SEEK_END) < len(MAGIC) + _TRAILER.size:
+                raise RecordLogError(f'{self._filename} is truncated or corrupt')
+
+            file.seek(-_TRAILER.size, io.SEEK_END)
+            footer_offset, footer_length, magic = _TRAILER.unpack(file.read(_TRAILER.size))
+            if magic != MAGIC:
+                raise RecordLogError(f'{self._filename} is truncated or corrupt')
+
+            file.seek(footer_offset)
+            footer = json.loads(zlib.decompress(file.read(footer_length)).decode('utf-8'))
+
+        self._footer_offset: int = footer_offset
+        self._key_field: str = footer['keyField']
+        self._num_records: int = footer['numRecords']
+        self._index: typing.Dict[str, int] = footer['index']
+
+    def num_records(self) -> int:
+        return self._num_records
+
+    def _blocks(self, offset: int) -> typing.Iterator[typing.List[Record]]:
+        with open(self._filename, 'rb') as file:
+            file.seek(offset)
+            while file.tell() < self._footer_offset:
+                length, = _LENGTH.unpack(file.read(_LENGTH.size))
+                block = zlib.decompress(file.read(length))
+
+                records = []
+                position = 0
+                while position < len(block):
+                    record_length, = _LENGTH.unpack_from(block, position)
+                    position += _LENGTH.size
+                    records.append(serialization.loads(block[position:position + record_length]))
+                    position += record_length
+                yield records
+
+    def records(self) -> typing.Iterator[Record]:
+        for block in self._blocks(len(MAGIC)):
+            yield from block
+
+    def lookup(self, key: typing.Any) -> typing.List[Record]:
+        key = str(key)
+        offset = self._index.get(key)
+        if offset is None:
+            return []
+
+        found: typing.List[Record] = []
+        for block in self._blocks(offset):
+            for record in block:
+                record_key = str(record[self._key_field])
+                if record_key == key:
+                    found.append(record)
+                elif record_key > key:
+                    return found
+        return found
@@ -0,0 +1,93 @@
+import json
+import struct
+import typing
+import bson
+from bson import raw_bson
+from energuide.exceptions import EnerguideError
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+AUTO_BACKEND = 'auto'
+ORJSON_BACKEND = 'orjson'
+UJSON_BACKEND = 'ujson'
+STDLIB_BACKEND = 'json'
+JSON_BACKENDS = [AUTO_BACKEND, ORJSON_BACKEND, UJSON_BACKEND, STDLIB_BACKEND]
+
+BACKEND_ENV_VARIABLE = 'ENERGUIDE_JSON_BACKEND'
+
+
+class SerializationError(EnerguideError):
+    pass
+
+
+class _JsonBackend(typing.NamedTuple):
+    name: str
+    dumps: typing.Callable[[typing.Any], bytes]
+    loads: typing.Callable[[typing.Union[str, bytes]], typing.Any]
+
+
+class JsonBackend(_JsonBackend):
+    pass
+
+
+def _stdlib_dumps(obj: typing.Any) -> bytes:
+    return json.dumps(obj).encode('utf-8')
+
+
+def _ujson_dumps(obj: typing.Any) -> bytes:
+    return ujson.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+def available_backends() -> typing.List[str]:
+    modules = {ORJSON_BACKEND: orjson, UJSON_BACKEND: ujson}
+    return [name for name, module in modules.items() if module is not None] + [STDLIB_BACKEND]
+
+
+def get_backend(name: str = AUTO_BACKEND) -> JsonBackend:
+    if name == AUTO_BACKEND:
+        name = available_backends()[0]
+
+    if name == ORJSON_BACKEND and orjson is not None:
+        return JsonBackend(name=name, dumps=orjson.dumps, loads=orjson.loads)
+    if name == UJSON_BACKEND and ujson is not None:
+        return JsonBackend(name=name, dumps=_ujson_dumps, loads=ujson.loads)
+    if name == STDLIB_BACKEND:
+        return JsonBackend(name=name, dumps=_stdlib_dumps, loads=json.loads)
+
+    raise SerializationError(f'JSON backend {name} is not available, choose from {", ".join(available_backends())}')
+
+
+BACKEND = get_backend()
+
+
+def set_backend(name: str) -> JsonBackend:
+    global BACKEND  # pylint: disable=global-statement
+    BACKEND = get_backend(name)
+    return BACKEND
+
+
+def dumps(obj: typing.Any) -> bytes:
+    return BACKEND.dumps(obj)
+
+
+def loads(data: typing.Union[str, bytes]) -> typing.Any:
+    return BACKEND.loads(data)
+
+
+def to_raw_bson(document: typing.Mapping[str, typing.Any]) -> raw_bson.RawBSONDocument:
+    return raw_bson.RawBSONDocument(bson.BSON.encode(document))
+
+
+def with_field(document: raw_bson.RawBSONDocument, name: str, value: typing.Any) -> raw_bson.RawBSONDocument:
+    element = bson.BSON.encode({name: value})[4:-1]
+    raw = document.raw
+    return raw_bson.RawBSONDocument(struct.pack('<i', len(raw) + len(element)) + raw[4:-1] + element + b'\x00')
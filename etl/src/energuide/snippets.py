@@ -1,23 +1,29 @@
+import collections
 import typing
 from energuide import element
 from energuide.exceptions import ElementGetValueError
 
 
+Snippet = typing.Dict[str, typing.Any]
+
+T = typing.TypeVar('T', int, float, str)
+
+
 class _Codes(typing.NamedTuple):
-    wall: typing.List[str]
-    window: typing.List[str]
+    wall: typing.List[Snippet]
+    window: typing.List[Snippet]
 
 
 class Codes(_Codes):
 
-    EMPTY_SNIPPET: typing.Dict[str, typing.Dict[str, typing.List[str]]] = {
+    EMPTY_SNIPPET: typing.Dict[str, typing.Dict[str, typing.List[Snippet]]] = {
         'codes': {
             'wall': [],
             'window': [],
         }
     }
 
-    def to_dict(self) -> typing.Dict[str, typing.Dict[str, typing.List[str]]]:
+    def to_dict(self) -> typing.Dict[str, typing.Dict[str, typing.List[Snippet]]]:
         return {
             'codes': {
                 'wall': self.wall,
@@ -27,23 +33,23 @@ class Codes(_Codes):
 
 
 class _HouseSnippet(typing.NamedTuple):
-    ceilings: typing.List[str]
-    floors: typing.List[str]
-    walls: typing.List[str]
-    doors: typing.List[str]
-    windows: typing.List[str]
-    heated_floor_area: typing.Optional[str]
-    heating_cooling: typing.Optional[str]
-    ventilation: typing.List[str]
-    water_heating: typing.Optional[str]
-    basements: typing.List[str]
-    crawlspaces: typing.List[str]
-    slabs: typing.List[str]
+    ceilings: typing.List[Snippet]
+    floors: typing.List[Snippet]
+    walls: typing.List[Snippet]
+    doors: typing.List[Snippet]
+    windows: typing.List[Snippet]
+    heated_floor_area: typing.Optional[Snippet]
+    heating_cooling: typing.Optional[Snippet]
+    ventilation: typing.List[Snippet]
+    water_heating: typing.Optional[typing.List[Snippet]]
+    basements: typing.List[Snippet]
+    crawlspaces: typing.List[Snippet]
+    slabs: typing.List[Snippet]
 
 
 class HouseSnippet(_HouseSnippet):
 
-    EMPTY_SNIPPET: typing.Dict[str, typing.Union[typing.List[str], typing.Optional[str]]] = {
+    EMPTY_SNIPPET: typing.Dict[str, typing.Union[typing.List[Snippet], typing.Optional[Snippet]]] = {
         'ceilings': [],
         'floors': [],
         'walls': [],
@@ -76,12 +82,12 @@ class HouseSnippet(_HouseSnippet):
 
 
 class _EnergyUpgradesSnippet(typing.NamedTuple):
-    upgrades: typing.List[str]
+    upgrades: typing.List[Snippet]
 
 
 class EnergyUpgradesSnippet(_EnergyUpgradesSnippet):
 
-    EMPTY_SNIPPET: typing.Dict[str, typing.List[str]] = {
+    EMPTY_SNIPPET: typing.Dict[str, typing.List[Snippet]] = {
         'upgrades': [],
     }
 
@@ -105,10 +111,6 @@ class OtherDataSnippet(_OtherDataSnippet):
         }
 
 
-def _extract_nodes(node: element.Element, path: str) -> typing.List[element.Element]:
-    return node.xpath(path)
-
-
 def _get_nullable_fields(root: element.Element, path: str) -> typing.Optional[str]:
     data: typing.Optional[str]
     try:
@@ -118,6 +120,18 @@ def _get_nullable_fields(root: element.Element, path: str) -> typing.Optional[st
     return data
 
 
+def get_value(snippet: Snippet, key: str, type_: typing.Type[T]) -> T:
+    value = snippet.get(key)
+    if value is None:
+        raise ElementGetValueError(f"Couldn't find value for {key} in snippet")
+
+    try:
+        result = type_(value)
+    except ValueError as ex:
+        raise ElementGetValueError(f"Unable to cast {value} to {type_} for {key} in snippet") from ex
+    return typing.cast(T, result)
+
+
 def snip_other_data(root: element.Element) -> OtherDataSnippet:
     postal_code = _get_nullable_fields(root, 'ProgramInformation/Client/StreetAddress/PostalCode/text()')
     return OtherDataSnippet(
@@ -126,54 +140,382 @@ def snip_other_data(root: element.Element) -> OtherDataSnippet:
     )
 
 
+def snip_ceiling(ceiling: element.Element) -> Snippet:
+    return {
+        'label': ceiling.findtext('Label'),
+        'typeEnglish': ceiling.findtext('Construction/Type/English'),
+        'typeFrench': ceiling.findtext('Construction/Type/French'),
+        'nominalInsulation': _get_nullable_fields(ceiling, 'Construction/CeilingType/@nominalInsulation'),
+        'rValue': _get_nullable_fields(ceiling, 'Construction/CeilingType/@rValue'),
+        'area': _get_nullable_fields(ceiling, 'Measurements/@area'),
+        'length': _get_nullable_fields(ceiling, 'Measurements/@length'),
+    }
+
+
+def snip_floor(floor: element.Element) -> Snippet:
+    return {
+        'label': floor.findtext('Label'),
+        'nominalInsulation': _get_nullable_fields(floor, 'Construction/Type/@nominalInsulation'),
+        'rValue': _get_nullable_fields(floor, 'Construction/Type/@rValue'),
+        'area': _get_nullable_fields(floor, 'Measurements/@area'),
+        'length': _get_nullable_fields(floor, 'Measurements/@length'),
+    }
+
+
+def snip_wall(wall: element.Element) -> Snippet:
+    return {
+        'label': wall.findtext('Label'),
+        'codeId': _get_nullable_fields(wall, 'Construction/Type/@idref'),
+        'nominalInsulation': _get_nullable_fields(wall, 'Construction/Type/@nominalInsulation'),
+        'rValue': _get_nullable_fields(wall, 'Construction/Type/@rValue'),
+        'perimeter': _get_nullable_fields(wall, 'Measurements/@perimeter'),
+        'height': _get_nullable_fields(wall, 'Measurements/@height'),
+    }
+
+
+def snip_door(door: element.Element) -> Snippet:
+    return {
+        'label': door.findtext('Label'),
+        'typeEnglish': door.findtext('Construction/Type/English'),
+        'typeFrench': door.findtext('Construction/Type/French'),
+        'rsi': _get_nullable_fields(door, 'Construction/Type/@value'),
+        'height': _get_nullable_fields(door, 'Measurements/@height'),
+        'width': _get_nullable_fields(door, 'Measurements/@width'),
+    }
+
+
+def snip_window(window: element.Element) -> Snippet:
+    return {
+        'label': window.findtext('Label'),
+        'codeId': _get_nullable_fields(window, 'Construction/Type/@idref'),
+        'rValue': _get_nullable_fields(window, 'Construction/Type/@rValue'),
+        'width': _get_nullable_fields(window, 'Measurements/@width'),
+        'height': _get_nullable_fields(window, 'Measurements/@height'),
+    }
+
+
+def snip_heated_floor_area(heated_floor_area: element.Element) -> Snippet:
+    return {
+        'aboveGrade': heated_floor_area.attrib.get('aboveGrade'),
+        'belowGrade': heated_floor_area.attrib.get('belowGrade'),
+    }
+
+
+def snip_heating(heating: element.Element) -> Snippet:
+    capacity_node = heating.find('Type1/*/Specifications/OutputCapacity')
+    return {
+        'label': heating.findtext('Label'),
+        'efficiency': _get_nullable_fields(heating, 'Type1/*/Specifications/@efficiency'),
+        'heatingTypes': [candidate.tag for candidate in heating.xpath('Type1/*')],
+        'outputCapacity': {
+            'units': capacity_node.attrib.get('uiUnits'),
+            'value': capacity_node.attrib.get('value'),
+        } if capacity_node is not None else None,
+        'energySourceCode': _get_nullable_fields(heating, 'Type1/*/Equipment/EnergySource/@code'),
+        'equipmentTypeEnglish': heating.findtext('Type1/*/Equipment/EquipmentType/English'),
+        'equipmentTypeFrench': heating.findtext('Type1/*/Equipment/EquipmentType/French'),
+        'isSteadyState': _get_nullable_fields(heating, 'Type1/*/Specifications/@isSteadyState'),
+    }
+
+
+def snip_ventilation(ventilation: element.Element) -> Snippet:
+    return {
+        'isEnergyStar': ventilation.attrib.get('isEnergyStar'),
+        'isHomeVentilatingInstituteCertified': ventilation.attrib.get('isHomeVentilatingInstituteCertified'),
+        'supplyFlowrate': ventilation.attrib.get('supplyFlowrate'),
+        'efficiency': ventilation.attrib.get('efficiency1'),
+    }
+
+
+def _snip_water_heater(water_heater: element.Element) -> Snippet:
+    return {
+        'hasDrainWaterHeatRecovery': _get_nullable_fields(water_heater, '@hasDrainWaterHeatRecovery'),
+        'drainWaterHeatRecoveryEffectiveness': _get_nullable_fields(
+            water_heater, 'DrainWaterHeatRecovery/@effectivenessAt9.5'),
+        'energySourceEnglish': water_heater.findtext('EnergySource/English'),
+        'tankTypeEnglish': water_heater.findtext('TankType/English'),
+        'tankVolume': _get_nullable_fields(water_heater, 'TankVolume/@value'),
+        'energyFactor': _get_nullable_fields(water_heater, 'EnergyFactor/@value'),
+        'thermalEfficiency': _get_nullable_fields(water_heater, 'EnergyFactor/@thermalEfficiency'),
+    }
+
+
+def snip_water_heating(water_heating: element.Element) -> typing.List[Snippet]:
+    water_heaters = water_heating.xpath('*[self::Primary or self::Secondary]')
+    return [_snip_water_heater(water_heater) for water_heater in water_heaters]
+
+
+def _snip_floor_construction(floor: element.Element, construction_type: str) -> Snippet:
+    return {
+        'nominalInsulation': _get_nullable_fields(floor, f'Construction/{construction_type}/@nominalInsulation'),
+        'rValue': _get_nullable_fields(floor, f'Construction/{construction_type}/@rValue'),
+    }
+
+
+def snip_basement_floor(floor: element.Element) -> Snippet:
+    return {
+        'isRectangular': _get_nullable_fields(floor, 'Measurements/@isRectangular'),
+        'length': _get_nullable_fields(floor, 'Measurements/@length'),
+        'width': _get_nullable_fields(floor, 'Measurements/@width'),
+        'area': _get_nullable_fields(floor, 'Measurements/@area'),
+        'perimeter': _get_nullable_fields(floor, 'Measurements/@perimeter'),
+        'construction': {
+            construction_type: _snip_floor_construction(floor, construction_type)
+            for construction_type in ('AddedToSlab', 'FloorsAbove')
+        },
+    }
+
+
+def _snip_wall_section(section: element.Element) -> Snippet:
+    return {
+        'percentage': section.attrib.get('percentage'),
+        'nominalRsi': section.attrib.get('nominalRsi'),
+        'rsi': section.attrib.get('rsi'),
+    }
+
+
+def snip_basement_wall(wall: element.Element) -> Snippet:
+    return {
+        'height': _get_nullable_fields(wall, 'Measurements/@height'),
+        'ponyWallHeight': _get_nullable_fields(wall, 'Measurements/@ponyWallHeight'),
+        'sections': {
+            wall_type: [
+                _snip_wall_section(section) for section in wall.xpath(f'Construction/{wall_type}/Composite/Section')
+            ]
+            for wall_type in ('InteriorAddedInsulation', 'ExteriorAddedInsulation', 'PonyWallType', 'Type')
+        },
+    }
+
+
+def snip_basement_header(header: element.Element) -> Snippet:
+    return {
+        'nominalInsulation': _get_nullable_fields(header, 'Construction/Type/@nominalInsulation'),
+        'rValue': _get_nullable_fields(header, 'Construction/Type/@rValue'),
+        'height': _get_nullable_fields(header, 'Measurements/@height'),
+        'perimeter': _get_nullable_fields(header, 'Measurements/@perimeter'),
+    }
+
+
+def snip_basement(basement: element.Element) -> Snippet:
+    floor_nodes = basement.xpath('Floor')
+    header_nodes = basement.xpath('Components/FloorHeader')
+    wall_nodes = basement.xpath('Wall')
+
+    return {
+        'foundationType': basement.tag,
+        'label': basement.findtext('Label'),
+        'configurationType': _get_nullable_fields(basement, 'Configuration/@type'),
+        'floor': snip_basement_floor(floor_nodes[0]) if floor_nodes else None,
+        'header': snip_basement_header(header_nodes[0]) if header_nodes else None,
+        'wall': snip_basement_wall(wall_nodes[0]) if wall_nodes else None,
+    }
+
+
+def snip_wall_code(wall_code: element.Element) -> Snippet:
+    return {
+        'id': _get_nullable_fields(wall_code, '@id'),
+        'label': wall_code.findtext('Label'),
+        'structureTypeEnglish': wall_code.findtext('Layers/StructureType/English'),
+        'structureTypeFrench': wall_code.findtext('Layers/StructureType/French'),
+        'componentTypeSizeEnglish': wall_code.findtext('Layers/ComponentTypeSize/English'),
+        'componentTypeSizeFrench': wall_code.findtext('Layers/ComponentTypeSize/French'),
+    }
+
+
+def snip_window_code(window_code: element.Element) -> Snippet:
+    return {
+        'id': _get_nullable_fields(window_code, '@id'),
+        'label': window_code.findtext('Label'),
+        'glazingTypesEnglish': window_code.findtext('Layers/GlazingTypes/English'),
+        'glazingTypesFrench': window_code.findtext('Layers/GlazingTypes/French'),
+        'coatingsTintsEnglish': window_code.findtext('Layers/CoatingsTints/English'),
+        'coatingsTintsFrench': window_code.findtext('Layers/CoatingsTints/French'),
+        'fillTypeEnglish': window_code.findtext('Layers/FillType/English'),
+        'fillTypeFrench': window_code.findtext('Layers/FillType/French'),
+        'spacerTypeEnglish': window_code.findtext('Layers/SpacerType/English'),
+        'spacerTypeFrench': window_code.findtext('Layers/SpacerType/French'),
+        'typeEnglish': window_code.findtext('Layers/Type/English'),
+        'typeFrench': window_code.findtext('Layers/Type/French'),
+        'frameMaterialEnglish': window_code.findtext('Layers/FrameMaterial/English'),
+        'frameMaterialFrench': window_code.findtext('Layers/FrameMaterial/French'),
+    }
+
+
+def snip_upgrade(setting: element.Element) -> Snippet:
+    return {
+        'upgradeType': setting.tag,
+        'cost': setting.attrib.get('cost'),
+        'priority': setting.attrib.get('priority'),
+    }
+
+
+_COMPONENTS = {
+    'Ceiling': 'ceilings',
+    'Floor': 'floors',
+    'Wall': 'walls',
+    'HotWater': 'water_heating',
+    'Basement': 'basements',
+    'Crawlspace': 'crawlspaces',
+    'Slab': 'slabs',
+}
+
+_NESTED_COMPONENTS = {
+    'Door': 'doors',
+    'Window': 'windows',
+}
+
+DOCUMENT_SECTIONS = frozenset(['House', 'Codes', 'EnergyUpgrades', 'ProgramInformation', 'Program'])
+
+_Nodes = typing.DefaultDict[str, typing.List[element.Element]]
+
+
+def _children(node: element.Element, tag: str) -> typing.Iterator[element.Element]:
+    for child in node:
+        if child.tag == tag:
+            yield child
+
+
+def _elements(node: element.Element) -> typing.Iterator[element.Element]:
+    for child in node:
+        if isinstance(child.tag, str):
+            yield child
+
+
+def _walk_house(house: element.Element) -> _Nodes:
+    nodes: _Nodes = collections.defaultdict(list)
+    for child in house:
+        if child.tag == 'Components':
+            for component in child:
+                name = _COMPONENTS.get(component.tag)
+                if name is not None:
+                    nodes[name].append(component)
+
+                for nested in component.iterdescendants(*_NESTED_COMPONENTS):
+                    parent = nested.getparent()
+                    if parent is not None and parent.tag == 'Components':
+                        nodes[_NESTED_COMPONENTS[nested.tag]].append(nested)
+        elif child.tag == 'Specifications':
+            nodes['heated_floor_area'].extend(_children(child, 'HeatedFloorArea'))
+        elif child.tag == 'HeatingCooling':
+            nodes['heating_cooling'].append(child)
+        elif child.tag == 'Ventilation':
+            for ventilator_list in _children(child, 'WholeHouseVentilatorList'):
+                nodes['ventilation'].extend(_children(ventilator_list, 'Hrv'))
+    return nodes
+
+
+def _first(nodes: typing.List[element.Element]) -> typing.Optional[element.Element]:
+    return nodes[0] if nodes else None
+
+
 def snip_house(house: element.Element) -> HouseSnippet:
-    ceilings = _extract_nodes(house, 'Components/Ceiling')
-    floors = _extract_nodes(house, 'Components/Floor')
-    walls = _extract_nodes(house, 'Components/Wall')
-    doors = _extract_nodes(house, 'Components//Components/Door')
-    windows = _extract_nodes(house, 'Components//Components/Window')
-    heated_floor_area = _extract_nodes(house, 'Specifications/HeatedFloorArea')
-    heating_cooling = _extract_nodes(house, 'HeatingCooling')
-    heating_cooling_string = heating_cooling[0].to_string() if heating_cooling else None
-    ventilation = _extract_nodes(house, 'Ventilation/WholeHouseVentilatorList/Hrv')
-    ventilation_strings = [hrv.to_string() for hrv in ventilation]
-
-    water_heating = _extract_nodes(house, 'Components/HotWater')
-    water_heating_string = water_heating[0].to_string() if water_heating else None
-
-    basements = _extract_nodes(house, 'Components/Basement')
-    crawlspaces = _extract_nodes(house, 'Components/Crawlspace')
-    slabs = _extract_nodes(house, 'Components/Slab')
+    nodes = _walk_house(house)
+    heated_floor_area = _first(nodes['heated_floor_area'])
+    heating_cooling = _first(nodes['heating_cooling'])
+    water_heating = _first(nodes['water_heating'])
 
     return HouseSnippet(
-        ceilings=[node.to_string() for node in ceilings],
-        floors=[node.to_string() for node in floors],
-        walls=[node.to_string() for node in walls],
-        doors=[node.to_string() for node in doors],
-        windows=[node.to_string() for node in windows],
-        heated_floor_area=heated_floor_area[0].to_string() if heated_floor_area else None,
-        heating_cooling=heating_cooling_string,
-        ventilation=ventilation_strings,
-        water_heating=water_heating_string,
-        basements=[node.to_string() for node in basements],
-        crawlspaces=[node.to_string() for node in crawlspaces],
-        slabs=[node.to_string() for node in slabs],
+        ceilings=[snip_ceiling(node) for node in nodes['ceilings']],
+        floors=[snip_floor(node) for node in nodes['floors']],
+        walls=[snip_wall(node) for node in nodes['walls']],
+        doors=[snip_door(node) for node in nodes['doors']],
+        windows=[snip_window(node) for node in nodes['windows']],
+        heated_floor_area=snip_heated_floor_area(heated_floor_area) if heated_floor_area is not None else None,
+        heating_cooling=snip_heating(heating_cooling) if heating_cooling is not None else None,
+        ventilation=[snip_ventilation(node) for node in nodes['ventilation']],
+        water_heating=snip_water_heating(water_heating) if water_heating is not None else None,
+        basements=[snip_basement(node) for node in nodes['basements']],
+        crawlspaces=[snip_basement(node) for node in nodes['crawlspaces']],
+        slabs=[snip_basement(node) for node in nodes['slabs']],
     )
 
 
-def snip_codes(codes: element.Element) -> Codes:
-    wall_codes = codes.xpath('Wall/*/Code')
-    window_codes = codes.xpath('Window/*/Code')
+def _code_nodes(codes: element.Element, code_type: str) -> typing.List[element.Element]:
+    return [code for types in _children(codes, code_type)
+            for group in _elements(types)
+            for code in _children(group, 'Code')]
+
 
+def snip_codes(codes: element.Element) -> Codes:
     return Codes(
-        wall=[node.to_string() for node in wall_codes],
-        window=[node.to_string() for node in window_codes],
+        wall=[snip_wall_code(node) for node in _code_nodes(codes, 'Wall')],
+        window=[snip_window_code(node) for node in _code_nodes(codes, 'Window')],
     )
 
 
 def snip_energy_upgrades(energy_upgrades: element.Element) -> EnergyUpgradesSnippet:
-    upgrades = _extract_nodes(energy_upgrades, 'Settings/*')
+    upgrades = [upgrade for settings in _children(energy_upgrades, 'Settings') for upgrade in _elements(settings)]
 
     return EnergyUpgradesSnippet(
-        upgrades=[upgrade.to_string() for upgrade in upgrades],
+        upgrades=[snip_upgrade(upgrade) for upgrade in upgrades],
+    )
+
+
+def _snip_sections(sections: typing.Dict[str, element.Element]) -> OtherDataSnippet:
+    program_information = sections.get('ProgramInformation')
+    program = sections.get('Program')
+
+    postal_code = (
+        program_information.findtext('Client/StreetAddress/PostalCode') if program_information is not None else None
+    )
+    ers_rating = program.find('Results/Tsv/ERSRating') if program is not None else None
+    return OtherDataSnippet(
+        forward_sortation_area=postal_code[0:3] if postal_code else None,
+        ers_rating=ers_rating.attrib.get('value') if ers_rating is not None else None,
+    )
+
+
+class _DocumentSnippet(typing.NamedTuple):
+    house: typing.Optional[HouseSnippet]
+    codes: typing.Optional[Codes]
+    energy_upgrades: typing.Optional[EnergyUpgradesSnippet]
+    other_data: OtherDataSnippet
+
+
+class DocumentSnippet(_DocumentSnippet):
+
+    def to_dict(self) -> typing.Dict[str, typing.Any]:
+        return {
+            **(self.house.to_dict() if self.house is not None else HouseSnippet.EMPTY_SNIPPET),
+            **(self.codes.to_dict() if self.codes is not None else Codes.EMPTY_SNIPPET),
+            **(self.energy_upgrades.to_dict() if self.energy_upgrades is not None
+               else EnergyUpgradesSnippet.EMPTY_SNIPPET),
+            **self.other_data.to_dict(),
+        }
+
+
+def _parse_sections(raw_xml: str,
+                    sections: typing.AbstractSet[str],
+                    stop_early: bool) -> typing.Dict[str, element.Element]:
+    found: typing.Dict[str, element.Element] = {}
+    if not stop_early:
+        for child in element.Element.from_string(raw_xml):
+            if child.tag in sections and child.tag not in found:
+                found[child.tag] = child
+        return found
+
+    for _, node in element.Element.iterparse(raw_xml, tags=sorted(sections)):
+        parent = node.getparent()
+        if parent is None or parent.getparent() is not None or node.tag in found:
+            continue
+
+        found[node.tag] = node
+        if len(found) == len(sections):
+            break
+    return found
+
+
+def snip_document(raw_xml: str,
+                  sections: typing.AbstractSet[str] = DOCUMENT_SECTIONS,
+                  stop_early: bool = False) -> DocumentSnippet:
+    found = _parse_sections(raw_xml, sections, stop_early)
+    house = found.get('House')
+    codes = found.get('Codes')
+    energy_upgrades = found.get('EnergyUpgrades')
+
+    return DocumentSnippet(
+        house=snip_house(house) if house is not None else None,
+        codes=snip_codes(codes) if codes is not None else None,
+        energy_upgrades=snip_energy_upgrades(energy_upgrades) if energy_upgrades is not None else None,
+        other_data=_snip_sections(found),
     )
@@ -0,0 +1,132 @@
+import contextlib
+import threading
+import time
+import typing
+from concurrent import futures
+
+
+T = typing.TypeVar('T')
+
+
+class _StageTiming(typing.NamedTuple):
+    stage: str
+    calls: int
+    seconds: float
+
+
+class StageTiming(_StageTiming):
+
+    @property
+    def average_ms(self) -> float:
+        return 1000 * self.seconds / self.calls if self.calls else 0.0
+
+
+class Timings:
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._calls: typing.Dict[str, int] = {}
+        self._seconds: typing.Dict[str, float] = {}
+        self._started: typing.Optional[float] = None
+        self._merged: typing.Set[str] = set()
+
+    def enable(self) -> None:
+        self.reset()
+        self.enabled = True
+        self._started = time.perf_counter()
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._calls.clear()
+            self._seconds.clear()
+            self._merged.clear()
+        self._started = time.perf_counter() if self.enabled else None
+
+    def add(self, stage: str, seconds: float, calls: int = 1) -> None:
+        with self._lock:
+            self._calls[stage] = self._calls.get(stage, 0) + calls
+            self._seconds[stage] = self._seconds.get(stage, 0.0) + seconds
+
+    def merge(self, stages: typing.Iterable[StageTiming]) -> None:
+        for stage in stages:
+            self.add(stage.stage, stage.seconds, stage.calls)
+            with self._lock:
+                self._merged.add(stage.stage)
+
+    @contextlib.contextmanager
+    def timed(self, stage: str) -> typing.Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def timed_iter(self, stage: str, iterable: typing.Iterable[T]) -> typing.Iterator[T]:
+        if not self.enabled:
+            yield from iterable
+            return
+
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add(stage, time.perf_counter() - start)
+                return
+            self.add(stage, time.perf_counter() - start)
+            yield item
+
+    def stages(self) -> typing.List[StageTiming]:
+        with self._lock:
+            return [StageTiming(stage=stage, calls=self._calls[stage], seconds=self._seconds[stage])
+                    for stage in self._calls]
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._started if self._started is not None else 0.0
+
+    def report(self) -> str:
+        elapsed = self.elapsed()
+        stages = self.stages()
+        other = max(elapsed - sum(stage.seconds for stage in stages), 0.0)
+
+        lines = [f'{"stage":<16} {"calls":>9} {"total s":>11} {"avg ms":>9} {"%":>7}']
+        for stage in stages + [StageTiming(stage='other', calls=0, seconds=other)]:
+            percent = 100 * stage.seconds / elapsed if elapsed else 0.0
+            name = f'{stage.stage}*' if stage.stage in self._merged else stage.stage
+            lines.append(f'{name:<16} {stage.calls:>9} {stage.seconds:>11.3f} '
+                         f'{stage.average_ms:>9.3f} {percent:>7.1f}')
+        lines.append(f'{"total":<16} {"":>9} {elapsed:>11.3f} {"":>9} {100.0 if elapsed else 0.0:>7.1f}')
+        if self._merged:
+            lines.append('* summed over worker processes, so stages can add up to more than the total')
+        return '\n'.join(lines)
+
+
+TIMINGS = Timings()
+
+
+def timed_call(enabled: bool,
+               func: typing.Callable[..., T],
+               *args: typing.Any) -> typing.Tuple[T, typing.List[StageTiming]]:
+    if not enabled:
+        return func(*args), []
+
+    TIMINGS.enable()
+    try:
+        return func(*args), TIMINGS.stages()
+    finally:
+        TIMINGS.disable()
+
+
+def merged_result(future: futures.Future) -> typing.Any:
+    result, stages = future.result()
+    TIMINGS.merge(stages)
+    return result
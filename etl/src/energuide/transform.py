@@ -1,19 +1,34 @@
-import itertools
+import collections
 import json
 import os
 import typing
 import zipfile
+from concurrent import futures
 from tqdm import tqdm
 import typing_extensions
 from azure.storage import blob
+import bson
+from bson import raw_bson
+from energuide import dates
 from energuide import dwelling
+from energuide import extractor
+from energuide import grouping
 from energuide import logger
+from energuide import prefetch
+from energuide import record_log
+from energuide import serialization
+from energuide import timings
+from energuide import transform_cache
 from energuide.exceptions import InvalidEmbeddedDataTypeError
 from energuide.exceptions import EnerguideError
 
 
 LOGGER = logger.get_logger(__name__)
 
+TRANSFORM_CHUNKSIZE = 16
+
+_CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
 
 class _AzureCoordinates(typing.NamedTuple):
     account: str
@@ -33,6 +48,36 @@ class AzureCoordinates(_AzureCoordinates):
         )
 
 
+class DocumentProtocol(typing_extensions.Protocol):
+    @property
+    def house_id(self) -> int:
+        pass
+
+    def to_dict(self) -> typing.Dict[str, typing.Any]:
+        pass
+
+    def to_bson(self) -> raw_bson.RawBSONDocument:
+        pass
+
+
+class _TransformedDwelling(typing.NamedTuple):
+    house_id: int
+    raw: bytes
+
+
+class TransformedDwelling(_TransformedDwelling):
+
+    @classmethod
+    def from_dwelling(cls, house: dwelling.Dwelling) -> 'TransformedDwelling':
+        return TransformedDwelling(house_id=house.house_id, raw=house.to_bson().raw)
+
+    def to_dict(self) -> typing.Dict[str, typing.Any]:
+        return bson.BSON(self.raw).decode()
+
+    def to_bson(self) -> raw_bson.RawBSONDocument:
+        return raw_bson.RawBSONDocument(self.raw)
+
+
 class ExtractProtocol(typing_extensions.Protocol):
     def extracted_rows(self) -> typing.Iterator[typing.Dict[str, typing.Any]]:
         pass
@@ -43,29 +88,72 @@ class ExtractProtocol(typing_extensions.Protocol):
 
 class LocalExtractReader:
 
-    def __init__(self, zip_filename: str) -> None:
-        self._zip_filename = zip_filename
+    def __init__(self, filename: str) -> None:
+        self._filename = filename
+        self._record_log = record_log.RecordLogReader(filename) if record_log.is_record_log(filename) else None
+
+    @staticmethod
+    def _with_file_name(house: typing.Dict[str, typing.Any], file: str) -> typing.Dict[str, typing.Any]:
+        house['jsonFileName'] = file
+        return house
+
+    @staticmethod
+    def _record_file_name(house: typing.Dict[str, typing.Any]) -> str:
+        return f"{house.get('EVAL_ID')}-{house.get('BUILDER')}"
 
     def extracted_rows(self) -> typing.Iterator[typing.Dict[str, typing.Any]]:
-        with zipfile.ZipFile(self._zip_filename) as zip_input:
+        if self._record_log is not None:
+            for house in self._record_log.records():
+                yield self._with_file_name(house, self._record_file_name(house))
+            return
+
+        with zipfile.ZipFile(self._filename) as zip_input:
             for file in sorted(zip_input.namelist()):
                 content = zip_input.read(file)
-                house = json.loads(content)
-                house['jsonFileName'] = file
-                yield house
+                yield self._with_file_name(serialization.loads(content), file)
+
+    @property
+    def sorted_by_key(self) -> bool:
+        # Zip members are read in name order, and each name starts with the row's EVAL_ID followed by '-'.
+        return True
+
+    def lookup(self, key: typing.Any) -> typing.List[typing.Dict[str, typing.Any]]:
+        if self._record_log is not None:
+            return [self._with_file_name(house, self._record_file_name(house))
+                    for house in self._record_log.lookup(key)]
+
+        with zipfile.ZipFile(self._filename) as zip_input:
+            return [self._with_file_name(serialization.loads(zip_input.read(file)), file)
+                    for file in sorted(zip_input.namelist())
+                    if file.split('-')[0] == str(key)]
 
     def num_rows(self) -> int:
-        with zipfile.ZipFile(self._zip_filename) as zip_input:
+        if self._record_log is not None:
+            return self._record_log.num_records()
+
+        with zipfile.ZipFile(self._filename) as zip_input:
             return len(zip_input.namelist())
 
 
 class AzureExtractReader:
     tl_start_filename = 'timestamp_tl_start.txt'
-
-    def __init__(self, coords: AzureCoordinates) -> None:
+    manifest_prefix = 'manifests/'
+    manifest_checkpoint_filename = 'timestamp_manifest_checkpoint.txt'
+
+    def __init__(self,
+                 coords: AzureCoordinates,
+                 workers: int = prefetch.DEFAULT_WORKERS,
+                 window: int = prefetch.DEFAULT_WINDOW,
+                 service: typing.Optional[blob.BlockBlobService] = None,
+                 full_scan: bool = False) -> None:
         self._coords = coords
-        self._azure: typing.Optional[blob.BlockBlobService] = None
+        self._workers = workers
+        self._window = window
+        self._azure: typing.Optional[blob.BlockBlobService] = service
+        self._full_scan = full_scan
         self._new_file_list: typing.Optional[typing.List[str]] = None
+        self._pending_manifests: typing.List[str] = []
+        self.latency_stats = prefetch.LatencyStats()
 
     @property
     def _azure_service(self) -> blob.BlockBlobService:
@@ -75,50 +163,115 @@ class AzureExtractReader:
                                                 custom_domain=self._coords.domain)
         return self._azure
 
+    def _is_data_file(self, name: str) -> bool:
+        return 'timestamp' not in name and not name.startswith(self.manifest_prefix)
+
+    def _manifests(self) -> typing.List[str]:
+        return sorted(blob_.name
+                      for blob_ in self._azure_service.list_blobs(self._coords.container, prefix=self.manifest_prefix))
+
+    def _manifest_contents(self, manifest: str) -> typing.List[str]:
+        content = self._azure_service.get_blob_to_bytes(self._coords.container, manifest).content
+        return json.loads(content)['files']
+
+    def _files_for_eval_id(self, eval_id: str) -> typing.List[str]:
+        return [blob_.name for blob_ in self._azure_service.list_blobs(self._coords.container, prefix=f'{eval_id}-')]
+
+    def _processed_manifests(self) -> typing.Set[str]:
+        content = self._azure_service.get_blob_to_bytes(self._coords.container,
+                                                        self.manifest_checkpoint_filename).content
+        return set(json.loads(content)['manifests'])
+
+    def commit_checkpoint(self) -> None:
+        if self._pending_manifests:
+            self._azure_service.create_blob_from_text(self._coords.container,
+                                                      self.manifest_checkpoint_filename,
+                                                      json.dumps({'manifests': self._pending_manifests}))
+            for manifest in self._pending_manifests:
+                self._azure_service.delete_blob(self._coords.container, manifest)
+
+    def _files_since_checkpoint(self) -> typing.List[str]:
+        processed = self._processed_manifests()
+        self._azure_service.create_blob_from_text(self._coords.container, self.tl_start_filename, 'TL start')
+
+        all_manifests = self._manifests()
+        manifests = [manifest for manifest in all_manifests if manifest not in processed]
+        new_names: typing.Set[str] = set()
+        manifest_contents = prefetch.prefetched(self._manifest_contents, manifests,
+                                                workers=self._workers, window=self._window)
+        for names in manifest_contents:
+            new_names.update(names)
+        new_eval_ids = sorted(set(name.split('-')[0] for name in new_names if '-' in name))
+
+        new_files = sorted(name
+                           for names in prefetch.prefetched(self._files_for_eval_id, new_eval_ids,
+                                                            workers=self._workers, window=self._window)
+                           for name in names)
+        LOGGER.info(f'{len(manifests)} unread manifests list {len(new_files)} files')
+        self._pending_manifests = all_manifests
+        return new_files
+
+    def _files_since_scan(self) -> typing.List[str]:
+        manifests = self._manifests()
+        if self._azure_service.exists(self._coords.container, self.tl_start_filename):
+            etl_start_properties = self._azure_service.get_blob_properties(self._coords.container,
+                                                                           self.tl_start_filename)
+            last_etl_start = etl_start_properties.properties.last_modified
+
+            self._azure_service.create_blob_from_text(self._coords.container, self.tl_start_filename, 'TL start')
+
+            new_blobs = [blob_ for blob_ in self._azure_service.list_blobs(self._coords.container)
+                         if self._is_data_file(blob_.name) and blob_.properties.last_modified >= last_etl_start]
+            new_eval_ids = set(blob_.name.split('-')[0] for blob_ in new_blobs if '-' in blob_.name)
+
+            new_files = sorted([blob_.name
+                                for blob_ in self._azure_service.list_blobs(self._coords.container)
+                                if '-' in blob_.name and self._is_data_file(blob_.name)
+                                and blob_.name.split('-')[0] in new_eval_ids])
+        else:
+            self._azure_service.create_blob_from_text(self._coords.container, self.tl_start_filename, 'TL start')
+            new_files = sorted([blob_.name
+                                for blob_ in self._azure_service.list_blobs(self._coords.container)
+                                if self._is_data_file(blob_.name)])
+        self._pending_manifests = manifests
+        return new_files
+
     @property
     def _new_files(self) -> typing.List[str]:
         if self._new_file_list is None:
-            if self._azure_service.exists(self._coords.container, self.tl_start_filename):
-                etl_start_properties = self._azure_service.get_blob_properties(self._coords.container,
-                                                                               self.tl_start_filename)
-                last_etl_start = etl_start_properties.properties.last_modified
-
-                self._azure_service.create_blob_from_text(self._coords.container, self.tl_start_filename, 'TL start')
-
-                new_blobs = [blob_ for blob_ in self._azure_service.list_blobs(self._coords.container)
-                             if 'timestamp' not in blob_.name and blob_.properties.last_modified >= last_etl_start]
-                new_eval_ids = set(blob_.name.split('-')[0] for blob_ in new_blobs if '-' in blob_.name)
-
-                self._new_file_list = sorted([blob_.name
-                                              for blob_ in self._azure_service.list_blobs(self._coords.container)
-                                              if '-' in blob_.name and blob_.name.split('-')[0] in new_eval_ids])
+            if not self._full_scan and self._azure_service.exists(self._coords.container,
+                                                                  self.manifest_checkpoint_filename):
+                self._new_file_list = self._files_since_checkpoint()
             else:
-                self._azure_service.create_blob_from_text(self._coords.container, self.tl_start_filename, 'TL start')
-                self._new_file_list = sorted([blob_.name
-                                              for blob_ in self._azure_service.list_blobs(self._coords.container)
-                                              if 'timestamp' not in blob_.name])
+                self._new_file_list = self._files_since_scan()
         return self._new_file_list
 
+    def _download(self, file: str) -> typing.Tuple[str, bytes]:
+        return file, self._azure_service.get_blob_to_bytes(self._coords.container, file).content
+
     def extracted_rows(self) -> typing.Iterator[typing.Dict[str, typing.Any]]:
-        for file in self._new_files:
-            content = self._azure_service.get_blob_to_bytes(self._coords.container, file).content
-            house = json.loads(content)
+        download = prefetch.timed_fetch(self._download, self.latency_stats)
+        for file, content in prefetch.prefetched(download, self._new_files, workers=self._workers, window=self._window):
+            house = serialization.loads(content)
             house['jsonFileName'] = file
             yield house
+        LOGGER.info(f'Downloaded blobs from {self._coords.container}: {self.latency_stats.summary()}')
 
     def num_rows(self) -> int:
         return len(self._new_files)
 
 
-def _read_groups(extracted_rows: typing.Iterable[typing.Dict[str, typing.Any]]
-                ) -> typing.Iterator[typing.List[typing.Dict[str, typing.Any]]]:
-    for group in itertools.groupby(extracted_rows, lambda y: y.get(dwelling.Dwelling.GROUPING_FIELD)):
-        yield [x for x in group[1]]
+def _read_groups(extracted_rows: typing.Iterable[typing.Dict[str, typing.Any]],
+                 memory_budget: int = grouping.DEFAULT_MEMORY_BUDGET,
+                 presorted: bool = False) -> typing.Iterator[typing.List[typing.Dict[str, typing.Any]]]:
+    yield from grouping.group_rows(extracted_rows, dwelling.Dwelling.GROUPING_FIELD, memory_budget,
+                                   presorted=presorted)
 
 
 def _generate_dwellings(grouped: typing.List[typing.Dict[str, typing.Any]]) -> typing.Optional[dwelling.Dwelling]:
     try:
-        return dwelling.Dwelling.from_group(grouped)
+        with timings.TIMINGS.timed('from_group'):
+            return dwelling.Dwelling.from_group(grouped)
     except InvalidEmbeddedDataTypeError as exc:
         files = [str(file.get('jsonFileName')) for file in grouped]
         failing_type = exc.data_class
@@ -139,10 +292,66 @@ def _generate_dwellings(grouped: typing.List[typing.Dict[str, typing.Any]]) -> t
     return None
 
 
-def transform(extract_reader: ExtractProtocol, show_progress: bool = False) -> typing.Iterator[dwelling.Dwelling]:
-    extracted_rows = tqdm(extract_reader.extracted_rows(), total=extract_reader.num_rows(),
+def _transform_chunk(groups: typing.List[typing.List[typing.Dict[str, typing.Any]]]
+                    ) -> typing.List[typing.Optional[TransformedDwelling]]:
+    output: typing.List[typing.Optional[TransformedDwelling]] = []
+    for group in groups:
+        house = _generate_dwellings(group)
+        output.append(TransformedDwelling.from_dwelling(house) if house else None)
+    return output
+
+
+def _transform_parallel(groups: typing.Iterable[typing.List[typing.Dict[str, typing.Any]]],
+                        workers: int,
+                        chunk_size: int,
+                        ordered: bool) -> typing.Iterator[typing.Optional[TransformedDwelling]]:
+    max_in_flight = workers * _CHUNKS_IN_FLIGHT_PER_WORKER
+    pending: typing.Deque[futures.Future] = collections.deque()
+    with futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk in extractor._chunk(groups, chunk_size):
+            pending.append(executor.submit(timings.timed_call, timings.TIMINGS.enabled, _transform_chunk, chunk))
+            if len(pending) < max_in_flight:
+                continue
+
+            if ordered:
+                yield from timings.merged_result(pending.popleft())
+            else:
+                done, _ = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+                for future in done:
+                    pending.remove(future)
+                    yield from timings.merged_result(future)
+
+        while pending:
+            yield from timings.merged_result(pending.popleft())
+
+
+def transform(extract_reader: ExtractProtocol,
+              show_progress: bool = False,
+              workers: int = 1,
+              ordered: bool = True,
+              chunk_size: int = TRANSFORM_CHUNKSIZE,
+              group_memory_budget: int = grouping.DEFAULT_MEMORY_BUDGET,
+              cache: typing.Optional[transform_cache.TransformCache] = None) -> typing.Iterator[DocumentProtocol]:
+    extracted_rows = tqdm(timings.TIMINGS.timed_iter('read', extract_reader.extracted_rows()),
+                          total=extract_reader.num_rows(),
                           unit=' files', disable=not show_progress)
-    for row_group in _read_groups(extracted_rows):
-        output = _generate_dwellings(row_group)
+    presorted = isinstance(extract_reader, LocalExtractReader) and extract_reader.sorted_by_key
+    groups = _read_groups(extracted_rows, group_memory_budget, presorted)
+    if cache is not None:
+        groups = cache.changed_groups(groups)
+
+    outputs: typing.Iterable[typing.Optional[DocumentProtocol]]
+    if workers > 1:
+        outputs = _transform_parallel(groups, workers, chunk_size, ordered)
+    else:
+        outputs = (_generate_dwellings(group) for group in groups)
+
+    for output in outputs:
         if output:
             yield output
+
+    if cache is not None:
+        LOGGER.info(f'Skipped {cache.skipped} unchanged dwellings, transformed {cache.changed}')
+    date_info = dates.DATE_PARSER.info()
+    if date_info.cache_hits or date_info.cache_misses:
+        LOGGER.info(f'Parsed dates: {date_info}')
@@ -0,0 +1,87 @@
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import typing
+from energuide.exceptions import EnerguideError
+
+
+Row = typing.Dict[str, typing.Any]
+
+_PACKAGE_DIR = os.path.dirname(__file__)
+
+
+class TransformCacheError(EnerguideError):
+    pass
+
+
+@functools.lru_cache(maxsize=None)
+def code_version() -> str:
+    hasher = hashlib.sha256()
+    for directory, subdirectories, filenames in os.walk(_PACKAGE_DIR):
+        subdirectories.sort()
+        for filename in sorted(filenames):
+            if filename.endswith('.py'):
+                path = os.path.join(directory, filename)
+                hasher.update(os.path.relpath(path, _PACKAGE_DIR).encode('utf-8'))
+                with open(path, 'rb') as source:
+                    hasher.update(source.read())
+    return hasher.hexdigest()
+
+
+def group_hash(group: typing.List[Row], version: typing.Optional[str] = None) -> str:
+    hasher = hashlib.sha256((version if version is not None else code_version()).encode('utf-8'))
+    for row in sorted(json.dumps(row, sort_keys=True, default=str) for row in group):
+        hasher.update(row.encode('utf-8'))
+        hasher.update(b'\n')
+    return hasher.hexdigest()
+
+
+class TransformCache:
+
+    def __init__(self, filename: str, key_field: str, version: typing.Optional[str] = None) -> None:
+        self._key_field = key_field
+        self._version = version if version is not None else code_version()
+        self._pending: typing.Dict[str, str] = {}
+        self.skipped = 0
+        self.changed = 0
+
+        try:
+            self._connection = sqlite3.connect(filename)
+            self._connection.execute('CREATE TABLE IF NOT EXISTS groups (key TEXT PRIMARY KEY, hash TEXT NOT NULL)')
+        except sqlite3.DatabaseError as exc:
+            raise TransformCacheError(f'Unable to open transform cache {filename}: {exc}') from exc
+
+    def _stored_hash(self, key: str) -> typing.Optional[str]:
+        found = self._connection.execute('SELECT hash FROM groups WHERE key = ?', (key,)).fetchone()
+        return found[0] if found else None
+
+    def changed_groups(self, groups: typing.Iterable[typing.List[Row]]) -> typing.Iterator[typing.List[Row]]:
+        for group in groups:
+            key = str(group[0].get(self._key_field))
+            digest = group_hash(group, self._version)
+            if self._stored_hash(key) == digest:
+                self.skipped += 1
+                continue
+
+            self.changed += 1
+            self._pending[key] = digest
+            yield group
+
+    def commit(self) -> None:
+        with self._connection:
+            self._connection.executemany('INSERT OR REPLACE INTO groups (key, hash) VALUES (?, ?)',
+                                         self._pending.items())
+        self._pending = {}
+
+    def clear(self) -> None:
+        with self._connection:
+            self._connection.execute('DELETE FROM groups')
+        self._pending = {}
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __len__(self) -> int:
+        return self._connection.execute('SELECT COUNT(*) FROM groups').fetchone()[0]
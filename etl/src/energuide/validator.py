@@ -1,3 +1,6 @@
+import collections.abc
+import datetime
+import re
 import typing
 import cerberus
 from energuide import element
@@ -11,3 +14,176 @@ class DwellingValidator(cerberus.Validator):
     def _normalize_coerce_parse_xml(self, value: typing.Any) -> element.Element:  # pylint: disable=no-self-use
         assert isinstance(value, str), "Can't coerce non-strings to XML"
         return element.Element.from_string(value)
+
+
+def snippet_coercer(snip: typing.Callable[[element.Element], typing.Any]) -> typing.Callable[[typing.Any], typing.Any]:
+    def coerce(value: typing.Any) -> typing.Any:
+        if isinstance(value, str):
+            return snip(element.Element.from_string(value))
+        return value
+    return coerce
+
+
+Document = typing.Dict[str, typing.Any]
+ErrorTree = typing.Dict[typing.Any, typing.List[typing.Any]]
+_FieldCheck = typing.Callable[[typing.Any, typing.Any], typing.Tuple[typing.Any, typing.List[typing.Any]]]
+
+_COMPILED_RULES = frozenset(['type', 'required', 'nullable', 'coerce', 'allowed', 'regex', 'schema'])
+_DOCUMENT_RULES = frozenset(['dependencies', 'excludes'])
+
+_TYPE_CHECKS: typing.Dict[str, typing.Callable[[typing.Any], bool]] = {
+    'string': lambda value: isinstance(value, str),
+    'integer': lambda value: isinstance(value, int),
+    'float': lambda value: isinstance(value, float),
+    'number': lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+    'boolean': lambda value: isinstance(value, bool),
+    'date': lambda value: isinstance(value, datetime.date),
+    'datetime': lambda value: isinstance(value, datetime.datetime),
+    'dict': lambda value: isinstance(value, collections.abc.Mapping),
+    'list': lambda value: isinstance(value, collections.abc.Sequence) and not isinstance(value, str),
+}
+
+
+class CompiledValidator:
+
+    def __init__(self,
+                 schema: typing.Dict[str, typing.Dict[str, typing.Any]],
+                 allow_unknown: bool = False,
+                 purge_unknown: bool = False,
+                 validator_class: typing.Type[cerberus.Validator] = cerberus.Validator) -> None:
+        self._rules = validator_class()
+        self._allow_unknown = allow_unknown
+        self._purge_unknown = purge_unknown
+        self._validator_class = validator_class
+
+        self._fields = {field: self._compile_field(rules) for field, rules in schema.items()}
+        self._required = [field for field, rules in schema.items() if rules.get('required', False)]
+
+        self.document: Document = {}
+        self.errors: ErrorTree = {}
+
+    def _type_check(self, type_name: str) -> typing.Callable[[typing.Any], bool]:
+        custom_check = getattr(self._rules, f'_validate_type_{type_name}', None)
+        if custom_check is not None:
+            return custom_check
+        return _TYPE_CHECKS[type_name]
+
+    def _coercer(self, coerce: typing.Any) -> typing.Callable[[typing.Any], typing.Any]:
+        if isinstance(coerce, str):
+            return getattr(self._rules, f'_normalize_coerce_{coerce}')
+        return coerce
+
+    def _cerberus_field(self, rules: typing.Dict[str, typing.Any]) -> _FieldCheck:
+        document_rules = _DOCUMENT_RULES.intersection(rules)
+        if document_rules:
+            raise ValueError(f'CompiledValidator cannot check {", ".join(sorted(document_rules))}, '
+                             f'which depend on other fields')
+
+        field_rules = {rule: value for rule, value in rules.items() if rule != 'required'}
+        checker = self._validator_class({'value': field_rules},
+                                        allow_unknown=self._allow_unknown,
+                                        purge_unknown=self._purge_unknown)
+
+        def check(_name: typing.Any, value: typing.Any) -> typing.Tuple[typing.Any, typing.List[typing.Any]]:
+            if checker.validate({'value': value}):
+                return checker.document['value'], []
+            return value, checker.errors['value']
+
+        return check
+
+    def _compile_field(self, rules: typing.Dict[str, typing.Any]) -> _FieldCheck:
+        if not _COMPILED_RULES.issuperset(rules):
+            return self._cerberus_field(rules)
+
+        coerce = self._coercer(rules['coerce']) if 'coerce' in rules else None
+        nullable = rules.get('nullable', False)
+        type_name = rules.get('type')
+        type_check = self._type_check(type_name) if type_name is not None else None
+        allowed = rules.get('allowed')
+        regex = re.compile(rules['regex']) if 'regex' in rules else None
+
+        item_check: typing.Optional[_FieldCheck] = None
+        sub_validator: typing.Optional[CompiledValidator] = None
+        if 'schema' in rules:
+            if type_name == 'list':
+                item_check = self._compile_field(rules['schema'])
+            else:
+                sub_validator = CompiledValidator(rules['schema'],
+                                                  allow_unknown=self._allow_unknown,
+                                                  purge_unknown=self._purge_unknown,
+                                                  validator_class=self._validator_class)
+
+        def check(name: typing.Any, value: typing.Any) -> typing.Tuple[typing.Any, typing.List[typing.Any]]:
+            errors: typing.List[typing.Any] = []
+
+            if coerce is not None:
+                try:
+                    value = coerce(value)
+                except Exception as exc:  # pylint: disable=broad-except
+                    if not (nullable and value is None):
+                        errors.append(f"field '{name}' cannot be coerced: {exc}")
+
+            if value is None:
+                if not nullable:
+                    errors.append('null value not allowed')
+                return value, errors
+
+            if type_check is not None and not type_check(value):
+                errors.append(f'must be of {type_name} type')
+                return value, errors
+
+            if allowed is not None and value not in allowed:
+                errors.append(f'unallowed value {value}')
+
+            if regex is not None and isinstance(value, str) and not regex.fullmatch(value):
+                errors.append(f"value does not match regex '{regex.pattern}'")
+
+            if item_check is not None:
+                items = []
+                item_errors: ErrorTree = {}
+                for index, item in enumerate(value):
+                    item, item_error = item_check(index, item)
+                    items.append(item)
+                    if item_error:
+                        item_errors[index] = item_error
+                value = items
+                if item_errors:
+                    errors.append(item_errors)
+
+            if sub_validator is not None:
+                value, sub_errors = sub_validator.check(value)
+                if sub_errors:
+                    errors.append(sub_errors)
+
+            return value, errors
+
+        return check
+
+    def check(self, document: Document) -> typing.Tuple[Document, ErrorTree]:
+        output: Document = {}
+        errors: ErrorTree = {}
+
+        for field, value in document.items():
+            field_check = self._fields.get(field)
+            if field_check is None:
+                if self._purge_unknown:
+                    continue
+                if not self._allow_unknown:
+                    errors[field] = ['unknown field']
+                output[field] = value
+                continue
+
+            value, field_errors = field_check(field, value)
+            output[field] = value
+            if field_errors:
+                errors[field] = field_errors
+
+        for field in self._required:
+            if field not in document:
+                errors[field] = ['required field']
+
+        return output, dict(sorted(errors.items()))
+
+    def validate(self, document: Document) -> bool:
+        self.document, self.errors = self.check(document)
+        return not self.errors
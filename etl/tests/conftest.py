@@ -1,6 +1,9 @@
+import datetime
 import os
 import random
 import socket
+import threading
+import time
 import typing
 import zipfile
 import py
@@ -8,6 +11,7 @@ import _pytest.monkeypatch
 import pymongo
 import pytest
 from azure.storage import blob
+from azure.storage.blob import models
 from energuide import database
 from energuide import extractor
 from energuide import transform
@@ -105,6 +109,15 @@ def energuide_zip_fixture(tmpdir: py._path.local.LocalPath, energuide_fixture: s
     return outfile
 
 
+@pytest.fixture
+def energuide_record_log_fixture(tmpdir: py._path.local.LocalPath, energuide_fixture: str) -> str:
+    outfile = f'{tmpdir}/randomized_energuide_data.log'
+
+    data = extractor.extract_data(energuide_fixture)
+    extractor.write_data(data, outfile, extractor.RECORD_LOG_FORMAT)
+    return outfile
+
+
 @pytest.fixture
 def sample_fixture() -> str:
     return os.path.join(os.path.dirname(__file__), 'sample.csv')
@@ -152,3 +165,78 @@ def populated_azure_emulator(azure_emulator: transform.AzureCoordinates,
         service.create_blob_from_bytes(azure_emulator.container, json_file.name, json_file.read())
 
     return azure_emulator
+
+
+class FakeBlockBlobService:
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.downloads = 0
+        self.listed_prefixes: typing.List[typing.Optional[str]] = []
+        self.max_concurrent_downloads = 0
+        self._concurrent_downloads = 0
+        self._lock = threading.Lock()
+        self._blobs: typing.Dict[str, typing.Dict[str, typing.Tuple[bytes, datetime.datetime]]] = {}
+        self._clock = datetime.datetime(2018, 1, 1, tzinfo=datetime.timezone.utc)
+
+    def _tick(self) -> datetime.datetime:
+        self._clock += datetime.timedelta(seconds=1)
+        return self._clock
+
+    def _blob(self, name: str, content: bytes, last_modified: datetime.datetime) -> models.Blob:
+        properties = models.BlobProperties()
+        properties.last_modified = last_modified
+        properties.content_length = len(content)
+        return models.Blob(name=name, content=content, props=properties)
+
+    def create_container(self, container_name: str) -> None:
+        self._blobs.setdefault(container_name, {})
+
+    def create_blob_from_bytes(self, container_name: str, blob_name: str, blob: bytes) -> None:
+        self._blobs.setdefault(container_name, {})[blob_name] = (blob, self._tick())
+
+    def create_blob_from_text(self, container_name: str, blob_name: str, text: str) -> None:
+        self.create_blob_from_bytes(container_name, blob_name, text.encode('utf-8'))
+
+    def delete_blob(self, container_name: str, blob_name: str) -> None:
+        del self._blobs[container_name][blob_name]
+
+    def exists(self, container_name: str, blob_name: typing.Optional[str] = None) -> bool:
+        container = self._blobs.get(container_name)
+        if blob_name is None:
+            return container is not None
+        return container is not None and blob_name in container
+
+    def get_blob_properties(self, container_name: str, blob_name: str) -> models.Blob:
+        _, last_modified = self._blobs[container_name][blob_name]
+        return self._blob(blob_name, b'', last_modified)
+
+    def list_blobs(self, container_name: str, prefix: typing.Optional[str] = None) -> typing.List[models.Blob]:
+        self.listed_prefixes.append(prefix)
+        return [self._blob(name, b'', last_modified)
+                for name, (_, last_modified) in sorted(self._blobs[container_name].items())
+                if prefix is None or name.startswith(prefix)]
+
+    def get_blob_to_bytes(self, container_name: str, blob_name: str) -> models.Blob:
+        with self._lock:
+            self.downloads += 1
+            self._concurrent_downloads += 1
+            self.max_concurrent_downloads = max(self.max_concurrent_downloads, self._concurrent_downloads)
+        try:
+            time.sleep(self.latency)
+            content, last_modified = self._blobs[container_name][blob_name]
+            return self._blob(blob_name, content, last_modified)
+        finally:
+            with self._lock:
+                self._concurrent_downloads -= 1
+
+
+@pytest.fixture
+def fake_blob_service(energuide_zip_fixture: str) -> FakeBlockBlobService:
+    service = FakeBlockBlobService(latency=0.005)
+    service.create_container('test-container')
+    service.create_blob_from_text('test-container', 'timestamp.txt', 'Wednesday')
+    with zipfile.ZipFile(energuide_zip_fixture) as file_z:
+        for zipinfo in file_z.infolist():
+            service.create_blob_from_bytes('test-container', zipinfo.filename, file_z.read(zipinfo))
+    return service
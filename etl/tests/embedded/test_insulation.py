@@ -19,3 +19,7 @@ def test_equality() -> None:
     version2 = insulation.Insulation(1)
 
     assert version1 == version2
+
+
+def test_no_instance_dict() -> None:
+    assert not hasattr(insulation.Insulation(1), '__dict__')
@@ -0,0 +1,42 @@
+from energuide import bilingual
+from energuide.embedded import code
+from energuide.embedded import serializers
+
+
+TRANSLATIONS = [
+    (code.WallCodeTag.STRUCTURE_TYPE, 'structureType'),
+    (code.WallCodeTag.COMPONENT_TYPE_SIZE, 'componentTypeSize'),
+]
+
+
+def test_code_tag_columns() -> None:
+    columns = serializers.code_tag_columns(TRANSLATIONS)
+    output = columns({
+        code.WallCodeTag.STRUCTURE_TYPE: bilingual.Bilingual(english='Wood frame', french='Ossature de bois'),
+    })
+    assert output == {
+        'structureTypeEnglish': 'Wood frame',
+        'structureTypeFrench': 'Ossature de bois',
+        'componentTypeSizeEnglish': None,
+        'componentTypeSizeFrench': None,
+    }
+    assert list(output) == ['structureTypeEnglish', 'structureTypeFrench',
+                            'componentTypeSizeEnglish', 'componentTypeSizeFrench']
+
+
+def test_code_tag_columns_without_tags() -> None:
+    columns = serializers.code_tag_columns(TRANSLATIONS)
+    assert columns(None) == {
+        'structureTypeEnglish': None,
+        'structureTypeFrench': None,
+        'componentTypeSizeEnglish': None,
+        'componentTypeSizeFrench': None,
+    }
+
+
+def test_translation_columns() -> None:
+    columns = serializers.translation_columns({
+        'A': bilingual.Bilingual(english='Alpha', french='Alpha (fr)'),
+    }, 'letter')
+    assert columns('A') == {'letterEnglish': 'Alpha', 'letterFrench': 'Alpha (fr)'}
+    assert columns('B') == {'letterEnglish': None, 'letterFrench': None}
@@ -1,5 +1,6 @@
 import csv
 import os
+import pstats
 import typing
 import zipfile
 import py
@@ -8,6 +9,9 @@ from click import testing  # type: ignore
 import pymongo
 import pytest
 from energuide import cli
+from energuide import record_log
+from energuide import serialization
+from energuide import timings
 
 
 def data1() -> typing.Dict[str, typing.Optional[str]]:
@@ -97,6 +101,23 @@ def test_load_filename(energuide_zip_fixture: str,
     assert coll.count() == 7
 
 
+def test_load_timings(energuide_zip_fixture: str,
+                      database_name: str,
+                      mongo_client: pymongo.MongoClient) -> None:
+    runner = testing.CliRunner()
+    result = runner.invoke(cli.main, args=[
+        'load',
+        '--db_name', database_name,
+        '--filename', energuide_zip_fixture,
+        '--no-progress',
+        '--timings',
+    ])
+
+    assert result.exit_code == 0
+    stages = [line.split()[0] for line in result.output.splitlines() if line]
+    assert stages[:6] == ['stage', 'read', 'from_group', 'to_bson', 'mongo_read', 'mongo_write']
+
+
 @pytest.mark.usefixtures('populated_azure_emulator')
 def test_load_azure(database_name: str,
                     collection: str,
@@ -156,6 +177,67 @@ def test_extract_valid(valid_filepath: str, tmpdir: py._path.local.LocalPath) ->
         assert len(output.namelist()) == 1
 
 
+def test_extract_workers(valid_filepath: str, tmpdir: py._path.local.LocalPath) -> None:
+    outfile = f'{tmpdir}/output.zip'
+    runner = testing.CliRunner()
+    result = runner.invoke(cli.main, args=[
+        'extract',
+        '--infile', valid_filepath,
+        '--outfile', outfile,
+        '--workers', '2',
+    ])
+
+    assert result.exit_code == 0
+
+    with zipfile.ZipFile(outfile, 'r') as output:
+        assert len(output.namelist()) == 1
+
+
+def test_extract_record_log(valid_filepath: str, tmpdir: py._path.local.LocalPath) -> None:
+    outfile = f'{tmpdir}/output.log'
+    runner = testing.CliRunner()
+    result = runner.invoke(cli.main, args=[
+        'extract',
+        '--infile', valid_filepath,
+        '--outfile', outfile,
+        '--format', 'log',
+    ])
+
+    assert result.exit_code == 0
+    assert record_log.RecordLogReader(outfile).num_records() == 1
+
+
+def test_extract_json_backend(valid_filepath: str, tmpdir: py._path.local.LocalPath) -> None:
+    outfile = f'{tmpdir}/output.zip'
+    runner = testing.CliRunner()
+    result = runner.invoke(cli.main, args=[
+        '--json-backend', 'json',
+        'extract',
+        '--infile', valid_filepath,
+        '--outfile', outfile,
+    ])
+
+    assert result.exit_code == 0
+    with zipfile.ZipFile(outfile, 'r') as output:
+        assert len(output.namelist()) == 1
+
+
+def test_unavailable_json_backend(valid_filepath: str,
+                                  tmpdir: py._path.local.LocalPath,
+                                  monkeypatch: _pytest.monkeypatch.MonkeyPatch) -> None:
+    monkeypatch.setattr(serialization, 'orjson', None)
+    monkeypatch.setenv(serialization.BACKEND_ENV_VARIABLE, serialization.ORJSON_BACKEND)
+    runner = testing.CliRunner()
+    result = runner.invoke(cli.main, args=[
+        'extract',
+        '--infile', valid_filepath,
+        '--outfile', f'{tmpdir}/output.zip',
+    ])
+
+    assert result.exit_code == 2
+    assert 'orjson is not available' in result.output
+
+
 def test_extract_invalid(invalid_filepath: str, tmpdir: py._path.local.LocalPath) -> None:
     outfile = f'{tmpdir}/output.zip'
     runner = testing.CliRunner()
@@ -183,3 +265,81 @@ def test_extract_missing(tmpdir: py._path.local.LocalPath) -> None:
 
     assert result.exit_code != 0
     assert not os.path.exists(outfile)
+
+
+def test_generate(energuide_fixture: str, tmpdir: py._path.local.LocalPath) -> None:
+    outfile = f'{tmpdir}/generated.csv'
+    runner = testing.CliRunner()
+    result = runner.invoke(cli.main, args=[
+        'generate',
+        '--rows', '3',
+        '--seed', '1',
+        '--template', energuide_fixture,
+        '--outfile', outfile,
+    ])
+
+    assert result.exit_code == 0
+    with open(outfile) as output:
+        assert len(list(csv.DictReader(output))) == 3
+
+
+def test_generate_requires_template(tmpdir: py._path.local.LocalPath) -> None:
+    runner = testing.CliRunner()
+    result = runner.invoke(cli.main, args=[
+        'generate',
+        '--rows', '3',
+        '--outfile', f'{tmpdir}/generated.csv',
+    ])
+
+    assert result.exit_code == 2
+    assert '--template' in result.output
+
+
+def test_extract_timings(valid_filepath: str, tmpdir: py._path.local.LocalPath) -> None:
+    outfile = f'{tmpdir}/output.zip'
+    runner = testing.CliRunner()
+    result = runner.invoke(cli.main, args=[
+        'extract',
+        '--infile', valid_filepath,
+        '--outfile', outfile,
+        '--no-progress',
+        '--timings',
+    ])
+
+    assert result.exit_code == 0
+    stages = [line.split()[0] for line in result.output.splitlines() if line]
+    assert stages[:5] == ['stage', 'read', 'validation', 'parsing', 'write']
+    assert not timings.TIMINGS.enabled
+
+
+def test_extract_timings_workers(valid_filepath: str, tmpdir: py._path.local.LocalPath) -> None:
+    outfile = f'{tmpdir}/output.zip'
+    runner = testing.CliRunner()
+    result = runner.invoke(cli.main, args=[
+        'extract',
+        '--infile', valid_filepath,
+        '--outfile', outfile,
+        '--no-progress',
+        '--workers', '2',
+        '--timings',
+    ])
+
+    assert result.exit_code == 0
+    stages = [line.split()[0] for line in result.output.splitlines() if line]
+    assert {'validation*', 'parsing*'} <= set(stages)
+
+
+def test_extract_profile(valid_filepath: str, tmpdir: py._path.local.LocalPath) -> None:
+    outfile = f'{tmpdir}/output.zip'
+    profile = f'{tmpdir}/extract.pstats'
+    runner = testing.CliRunner()
+    result = runner.invoke(cli.main, args=[
+        'extract',
+        '--infile', valid_filepath,
+        '--outfile', outfile,
+        '--profile', profile,
+    ])
+
+    assert result.exit_code == 0
+    stats: typing.Any = pstats.Stats(profile)
+    assert stats.total_calls > 0
@@ -1,8 +1,11 @@
 import typing
 import pymongo
+from pymongo import errors
 import pytest
 from energuide import database
 from energuide import dwelling
+from energuide import indexes
+from energuide import serialization
 
 
 @pytest.fixture
@@ -62,3 +65,276 @@ def test_load_update(database_coordinates: database.DatabaseCoordinates,
     )
     assert mongo_client[database_name][collection].count() == 4
     assert mongo_client[database_name][collection].find_one({'houseId': 1})['yearBuilt'] == 2001
+
+
+class FakeDatabase:
+
+    def __init__(self) -> None:
+        self.collections: typing.Dict[str, 'FakeBulkCollection'] = {}
+
+    def __getitem__(self, name: str) -> 'FakeBulkCollection':
+        if name not in self.collections:
+            self.collections[name] = FakeBulkCollection(name=name, database=self)
+        return self.collections[name]
+
+
+class FakeBulkCollection:
+
+    def __init__(self,
+                 failures: typing.Optional[typing.Dict[int, typing.List[int]]] = None,
+                 concern_failures: typing.Optional[typing.List[int]] = None,
+                 name: str = 'dwellings',
+                 database: typing.Optional[FakeDatabase] = None) -> None:
+        self.name = name
+        self.full_name = f'energuide.{name}'
+        self.database = database
+        self.indexes: typing.Dict[str, typing.Dict[str, typing.Any]] = {}
+        self.failures = failures or {}
+        self.concern_failures = concern_failures or []
+        self.calls: typing.List[typing.List[int]] = []
+        self.written: typing.Dict[int, typing.Mapping[str, typing.Any]] = {}
+        self.queries: typing.List[typing.Dict[str, typing.Any]] = []
+
+    def find(self,
+             spec: typing.Dict[str, typing.Any],
+             projection: typing.Dict[str, bool]) -> typing.Iterator[typing.Dict[str, typing.Any]]:
+        self.queries.append(projection)
+        for house_id in spec['houseId']['$in']:
+            if house_id in self.written:
+                document = self.written[house_id]
+                yield {'houseId': house_id, 'fingerprint': document['fingerprint']}
+
+    def drop(self) -> None:
+        self.written = {}
+        self.indexes = {}
+        if self.database is not None:
+            self.database.collections.pop(self.name, None)
+
+    def count_documents(self, _spec: typing.Dict[str, typing.Any]) -> int:
+        return len(self.written)
+
+    def index_information(self) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+        return dict(self.indexes)
+
+    def create_index(self, keys: indexes.Keys, name: str, unique: bool, **_options: bool) -> str:
+        self._create()
+        self.indexes[name] = {'key': keys, 'unique': unique}
+        return name
+
+    def _create(self) -> None:
+        if self.database is not None:
+            self.database.collections[self.name] = self
+
+    def rename(self, new_name: str, **kwargs: bool) -> None:
+        assert kwargs == {'dropTarget': True}
+        assert self.database is not None
+        del self.database.collections[self.name]
+        self.name = new_name
+        self.database.collections[new_name] = self
+
+    def bulk_write(self,
+                   requests: typing.List[pymongo.ReplaceOne],
+                   ordered: bool = True) -> pymongo.results.BulkWriteResult:
+        assert not ordered
+        self._create()
+        house_ids = [request._filter['houseId'] for request in requests]
+        self.calls.append(house_ids)
+
+        write_errors = []
+        upserted = 0
+        for index, (house_id, request) in enumerate(zip(house_ids, requests)):
+            codes = self.failures.get(house_id, [])
+            if codes:
+                write_errors.append({'index': index, 'code': codes.pop(0), 'errmsg': 'failed'})
+            else:
+                self.written[house_id] = request._doc
+                upserted += 1
+
+        details = {'nMatched': 0, 'nModified': 0, 'nUpserted': upserted, 'writeErrors': write_errors}
+        if self.concern_failures:
+            details['writeConcernErrors'] = [{'code': self.concern_failures.pop(0), 'errmsg': 'timed out'}]
+        if write_errors or 'writeConcernErrors' in details:
+            raise errors.BulkWriteError(details)
+        return pymongo.results.BulkWriteResult(details, acknowledged=True)
+
+
+def test_write_dwellings_batches(load_data: typing.List[dwelling.Dwelling]) -> None:
+    collection = FakeBulkCollection()
+    result = database._write_dwellings(collection, load_data, batch_size=2)
+
+    assert collection.calls == [[1, 2], [3]]
+    assert result == database.LoadResult(rows=3, matched=0, modified=0, upserted=3, unchanged=0,
+                                           batches=2, retries=0, errors=[])
+    assert result.succeeded
+
+
+def test_write_dwellings_batch_bytes(load_data: typing.List[dwelling.Dwelling]) -> None:
+    collection = FakeBulkCollection()
+    content = load_data[0].to_bson()
+    document = serialization.with_field(content, 'fingerprint', database.fingerprint(content))
+    document_size = len(document.raw)
+    database._write_dwellings(collection, load_data, batch_bytes=document_size * 2 + 1)
+    assert collection.calls == [[1, 2], [3]]
+
+
+def test_write_dwellings_retries_failed_subset(load_data: typing.List[dwelling.Dwelling]) -> None:
+    collection = FakeBulkCollection(failures={2: [91]})
+    result = database._write_dwellings(collection, load_data, retry_delay=0)
+
+    assert collection.calls == [[1, 2, 3], [2]]
+    assert set(collection.written) == {1, 2, 3}
+    assert result.upserted == 3
+    assert result.retries == 1
+    assert result.succeeded
+
+
+def test_write_dwellings_reports_errors(load_data: typing.List[dwelling.Dwelling]) -> None:
+    collection = FakeBulkCollection(failures={1: [11000], 3: [91, 91, 91]})
+    result = database._write_dwellings(collection, load_data, max_retries=2, retry_delay=0)
+
+    assert collection.calls == [[1, 2, 3], [3], [3]]
+    assert result.upserted == 1
+    assert result.errors == [
+        database.WriteFailure(house_id=1, code=11000, message='failed'),
+        database.WriteFailure(house_id=3, code=91, message='failed'),
+    ]
+    assert not result.succeeded
+
+
+@pytest.mark.parametrize('code', [2, 121, 10334, 17419])
+def test_write_dwellings_permanent_errors_not_retried(load_data: typing.List[dwelling.Dwelling], code: int) -> None:
+    collection = FakeBulkCollection(failures={2: [code]})
+    result = database._write_dwellings(collection, load_data, retry_delay=0)
+
+    assert collection.calls == [[1, 2, 3]]
+    assert result.retries == 0
+    assert result.errors == [database.WriteFailure(house_id=2, code=code, message='failed')]
+
+
+def test_write_dwellings_retries_write_concern_errors(load_data: typing.List[dwelling.Dwelling]) -> None:
+    collection = FakeBulkCollection(failures={2: [11000]}, concern_failures=[64])
+    result = database._write_dwellings(collection, load_data, retry_delay=0)
+
+    assert collection.calls == [[1, 2, 3], [1, 3]]
+    assert result.retries == 1
+    assert result.errors == [database.WriteFailure(house_id=2, code=11000, message='failed')]
+
+
+def test_write_dwellings_reports_write_concern_errors(load_data: typing.List[dwelling.Dwelling]) -> None:
+    collection = FakeBulkCollection(concern_failures=[100])
+    result = database._write_dwellings(collection, load_data, retry_delay=0)
+
+    assert collection.calls == [[1, 2, 3]]
+    assert [failure.house_id for failure in result.errors] == [1, 2, 3]
+    assert not result.succeeded
+
+
+def test_write_dwellings_fingerprint(load_data: typing.List[dwelling.Dwelling]) -> None:
+    collection = FakeBulkCollection()
+    database._write_dwellings(collection, load_data)
+
+    stored = collection.written[1]
+    assert stored['fingerprint'] == database.fingerprint(load_data[0].to_bson())
+    assert {key: value for key, value in stored.items() if key != 'fingerprint'} == load_data[0].to_dict()
+
+
+def test_write_dwellings_skip_unchanged(load_data: typing.List[dwelling.Dwelling]) -> None:
+    collection = FakeBulkCollection()
+    database._write_dwellings(collection, load_data, skip_unchanged=True)
+    assert collection.calls == [[1, 2, 3]]
+
+    load_data[1] = dwelling.Dwelling(house_id=2, year_built=2001, city='Ottawa', region=dwelling.Region.ONTARIO,
+                                     forward_sortation_area='K1P', evaluations=[])
+    result = database._write_dwellings(collection, load_data, skip_unchanged=True)
+
+    assert collection.calls == [[1, 2, 3], [2]]
+    assert collection.queries[-1] == {'_id': False, 'houseId': True, 'fingerprint': True}
+    assert result.rows == 3
+    assert result.unchanged == 2
+    assert result.batches == 1
+
+
+def test_load_syncs_indexes(database_coordinates: database.DatabaseCoordinates,
+                            mongo_client: pymongo.MongoClient,
+                            database_name: str,
+                            collection: str,
+                            load_data: typing.List[dwelling.Dwelling]):
+    database.load(
+        coords=database_coordinates,
+        database_name=database_name,
+        collection_name=collection,
+        data=load_data,
+        update=False
+    )
+    info = mongo_client[database_name][collection].index_information()
+    assert {spec.name for spec in indexes.REQUIRED_INDEXES} <= set(info)
+    assert info['houseId_1']['unique']
+
+
+def test_fake_collection_matches_pymongo() -> None:
+    methods = [name for name, value in vars(FakeBulkCollection).items()
+               if callable(value) and not name.startswith('_')]
+    assert 'count_documents' in methods
+    for name in methods:
+        assert callable(getattr(pymongo.collection.Collection, name, None)), name
+
+
+def test_rebuild_swaps_staging(load_data: typing.List[dwelling.Dwelling]) -> None:
+    fake_database = FakeDatabase()
+    live = fake_database['dwellings']
+    database._write_dwellings(live, load_data[:1] + [
+        dwelling.Dwelling(house_id=99, year_built=1990, city='Ottawa', region=dwelling.Region.ONTARIO,
+                          forward_sortation_area='K1P', evaluations=[]),
+    ])
+
+    result = database._rebuild(live, load_data, sync_indexes=False, retry_delay=0)
+
+    assert result.succeeded
+    assert list(fake_database.collections) == ['dwellings']
+    rebuilt = fake_database['dwellings']
+    assert set(rebuilt.written) == {1, 2, 3}
+    assert {spec.name for spec in indexes.REQUIRED_INDEXES} <= set(rebuilt.indexes)
+
+
+def test_rebuild_keeps_live_on_failure(load_data: typing.List[dwelling.Dwelling]) -> None:
+    fake_database = FakeDatabase()
+    live = fake_database['dwellings']
+    database._write_dwellings(live, load_data[:1])
+    fake_database.collections['dwellings_staging'] = FakeBulkCollection(failures={2: [11000]},
+                                                                        name='dwellings_staging',
+                                                                        database=fake_database)
+
+    result = database._rebuild(live, load_data, sync_indexes=False, retry_delay=0)
+
+    assert not result.succeeded
+    assert list(fake_database.collections) == ['dwellings']
+    assert set(fake_database['dwellings'].written) == {1}
+
+
+def test_load_rebuild_replaces_collection(database_coordinates: database.DatabaseCoordinates,
+                                          mongo_client: pymongo.MongoClient,
+                                          database_name: str,
+                                          collection: str,
+                                          load_data: typing.List[dwelling.Dwelling]):
+    mongo_client[database_name][collection].insert_one({'houseId': 99})
+    database.load(
+        coords=database_coordinates,
+        database_name=database_name,
+        collection_name=collection,
+        data=load_data,
+        update=False
+    )
+
+    assert mongo_client[database_name][collection].count_documents({}) == 3
+    assert mongo_client[database_name][collection].find_one({'houseId': 99}) is None
+    assert f'{collection}{database.STAGING_SUFFIX}' not in mongo_client[database_name].list_collection_names()
+
+
+def test_write_dwellings_pipelined(load_data: typing.List[dwelling.Dwelling]) -> None:
+    collection = FakeBulkCollection(failures={2: [91]})
+    result = database._write_dwellings(collection, load_data, batch_size=1, retry_delay=0, pipeline_depth=2)
+
+    assert collection.calls == [[1], [2], [2], [3]]
+    assert result.upserted == 3
+    assert result.stalls is not None
+    assert result.stalls.items == 3
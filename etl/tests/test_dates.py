@@ -0,0 +1,54 @@
+import datetime
+import pytest
+from dateutil import parser
+from energuide import dates
+
+
+@pytest.fixture
+def date_parser() -> dates.DateParser:
+    return dates.DateParser()
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('2012-06-08 09:26:10', datetime.datetime(2012, 6, 8, 9, 26, 10)),
+    ('2012-06-08T09:26:10', datetime.datetime(2012, 6, 8, 9, 26, 10)),
+    ('2012-06-08 09:26:10.5', datetime.datetime(2012, 6, 8, 9, 26, 10, 500000)),
+    ('2012-06-08 09:26', datetime.datetime(2012, 6, 8, 9, 26)),
+    ('2012-02-25', datetime.datetime(2012, 2, 25)),
+    (' 2012-02-25 ', datetime.datetime(2012, 2, 25)),
+])
+def test_parse_fast_path(date_parser: dates.DateParser, value: str, expected: datetime.datetime) -> None:
+    assert date_parser.parse(value) == expected
+    assert date_parser.info().fallbacks == 0
+
+
+@pytest.mark.parametrize('value', [
+    'June 8, 2012',
+    '2012/06/08 09:26:10',
+    '2012-06-08 09:26:10+00:00',
+])
+def test_parse_fallback(date_parser: dates.DateParser, value: str) -> None:
+    assert date_parser.parse(value) == parser.parse(value)
+    assert date_parser.info().fallbacks == 1
+
+
+def test_parse_invalid(date_parser: dates.DateParser) -> None:
+    with pytest.raises(ValueError):
+        date_parser.parse('2012-13-40')
+    with pytest.raises(Exception):
+        date_parser.parse(None)
+
+
+def test_parse_memoizes(date_parser: dates.DateParser) -> None:
+    for _ in range(3):
+        date_parser.parse('2012-02-25')
+    info = date_parser.info()
+    assert (info.fast, info.cache_hits, info.cache_misses) == (1, 2, 1)
+
+    date_parser.clear()
+    assert date_parser.info() == dates.DateParseInfo(fast=0, fallbacks=0, cache_hits=0, cache_misses=0)
+
+
+def test_info_str() -> None:
+    info = dates.DateParseInfo(fast=3, fallbacks=1, cache_hits=2, cache_misses=4)
+    assert str(info) == '3 ISO, 1 dateutil fallbacks, 2 cache hits, 4 cache misses'
@@ -100,6 +100,37 @@ def test_from_malformed_string() -> None:
         element.Element.from_string('</Foo></Foo>')
 
 
+def test_iterparse(fragment: str) -> None:
+    output = [(event, node.tag) for event, node in element.Element.iterparse(fragment, events=('start', 'end'))]
+    assert output == [
+        ('start', 'Foo'), ('start', 'Bar'), ('end', 'Bar'), ('start', 'Bar'), ('end', 'Bar'), ('end', 'Foo'),
+    ]
+
+
+def test_iterparse_tags(fragment: str) -> None:
+    output = [node.attrib['id'] for _, node in element.Element.iterparse(fragment, tags=['Bar'])]
+    assert output == ['1', '2']
+
+
+def test_iterparse_malformed_string() -> None:
+    with pytest.raises(element.MalformedXmlError):
+        list(element.Element.iterparse('garbage'))
+
+
+def test_iterdescendants(fragment_node: element.Element) -> None:
+    output = [node.attrib['id'] for node in fragment_node.iterdescendants('Bar')]
+    assert output == ['1', '2']
+
+
+def test_getparent(fragment_node: element.Element) -> None:
+    bar_node = fragment_node.find('Bar')
+    assert bar_node
+    parent = bar_node.getparent()
+    assert parent
+    assert parent.tag == 'Foo'
+    assert parent.getparent() is None
+
+
 def test_insert_node() -> None:
     root = element.Element.new('Root')
     child1 = element.Element.new('Child1')
@@ -135,3 +166,35 @@ def test_get_raises_when_not_found(fragment_node: element.Element) -> None:
 def test_get_raises_when_cant_cast(fragment_node: element.Element) -> None:
     with pytest.raises(ElementGetValueError):
         fragment_node.get('Bar/text()', int)
+
+
+def test_xpath_cache_counts_hits_and_misses() -> None:
+    cache = element.XPathCache()
+    first = cache.compile('Bar/@id')
+    second = cache.compile('Bar/@id')
+    assert first is second
+    assert cache.info() == element.XPathCacheInfo(hits=1, misses=1, size=1)
+
+    cache.clear()
+    assert cache.info() == element.XPathCacheInfo(hits=0, misses=0, size=0)
+
+
+def test_xpath_cache_namespaced_expression() -> None:
+    node = element.Element.from_string('<Foo xmlns="urn:foo"><Bar>baz</Bar></Foo>')
+    assert node.findtext('{urn:foo}Bar') == 'baz'
+    assert [child.tag for child in node.xpath('{urn:foo}Bar')] == ['{urn:foo}Bar']
+
+
+def test_element_uses_shared_xpath_cache(fragment_node: element.Element) -> None:
+    element.XPATH_CACHE.clear()
+    for _ in range(3):
+        fragment_node.get('Bar/@id', int)
+        fragment_node.findtext('Bar')
+    assert element.XPATH_CACHE.info() == element.XPathCacheInfo(hits=4, misses=2, size=2)
+
+
+def test_findtext_empty_and_default(fragment_node: element.Element) -> None:
+    empty = element.Element.from_string('<Foo><Bar/></Foo>')
+    assert empty.findtext('Bar') == ''
+    assert empty.findtext('Baz') is None
+    assert fragment_node.findtext('Baz', 'default') == 'default'
@@ -7,6 +7,7 @@ import _pytest.fixtures
 import py._path.local
 import pytest
 from energuide import extractor
+from energuide import record_log
 
 
 def _write_csv(filepath: str, data: typing.Mapping[str, typing.Optional[str]]) -> None:
@@ -186,6 +187,37 @@ def test_write_data(tmpdir: py._path.local.LocalPath) -> None:
     assert [json.loads(file) for file in files] == data
 
 
+def test_write_record_log(tmpdir: py._path.local.LocalPath) -> None:
+    output_path = f'{tmpdir}/output.log'
+
+    data = [
+        {'foo': 1, 'BUILDER': '4K02E90020', 'EVAL_ID': '12149'},
+        {'bar': 2, 'baz': 3, 'BUILDER': '4K13D01404', 'EVAL_ID': '12148'},
+        None,
+    ]
+
+    result = extractor.write_data(data, output_path, extractor.RECORD_LOG_FORMAT)
+    assert result == (2, 1)
+
+    reader = record_log.RecordLogReader(output_path)
+    assert list(reader.records()) == [data[1], data[0]]
+    assert reader.lookup('12149') == [data[0]]
+
+
+def test_write_record_log_spills(tmpdir: py._path.local.LocalPath) -> None:
+    output_path = f'{tmpdir}/output.log'
+
+    data = [
+        {'BUILDER': '4K02E90020', 'EVAL_ID': '12149'},
+        {'BUILDER': '4K13D01404', 'EVAL_ID': '12148'},
+        {'BUILDER': '4K02E90019', 'EVAL_ID': '12149'},
+    ]
+
+    result = extractor.write_data(data, output_path, extractor.RECORD_LOG_FORMAT, memory_budget=1)
+    assert result == (3, 0)
+    assert list(record_log.RecordLogReader(output_path).records()) == [data[1], data[2], data[0]]
+
+
 def test_write_bad_data(tmpdir: py._path.local.LocalPath) -> None:
     output_path = f'{tmpdir}/output.zip'
 
@@ -198,3 +230,23 @@ def test_write_bad_data(tmpdir: py._path.local.LocalPath) -> None:
 
     with zipfile.ZipFile(output_path, 'r') as output:
         assert len(output.namelist()) == 1
+
+
+def test_read_csv_multiline_field(tmpdir: py._path.local.LocalPath, base_data: typing.Dict[str, str]) -> None:
+    base_data['RAW_XML'] = '<HouseFile>\n    <House>\n    </House>\n</HouseFile>'
+    filepath = os.path.join(tmpdir, 'sample.csv')
+    with open(filepath, 'w') as file:
+        writer = csv.DictWriter(file, fieldnames=list(base_data.keys()))
+        writer.writeheader()
+        writer.writerow(base_data)
+        writer.writerow(base_data)
+
+    output = list(extractor._read_csv(filepath, show_progress=False))
+    assert len(output) == 2
+    assert all(row['RAW_XML'] == base_data['RAW_XML'] for row in output)
+
+
+def test_extract_parallel_matches_serial(energuide_fixture: str) -> None:
+    serial = list(extractor.extract_data(energuide_fixture))
+    parallel = list(extractor.extract_data(energuide_fixture, workers=2, chunk_size=3))
+    assert parallel == serial
@@ -0,0 +1,69 @@
+import collections
+import py
+import pytest
+from energuide import dwelling
+from energuide import extractor
+from energuide import generator
+
+
+@pytest.fixture
+def profile(energuide_fixture: str) -> generator.Profile:
+    return generator.Profile.from_csv(energuide_fixture)
+
+
+def test_profile_from_csv(profile: generator.Profile) -> None:
+    assert len(profile.groups) == 7
+    assert profile.pair_ratio == 1.0
+    assert len(profile.locations) == 14
+    assert profile.component_counts['Wall'].count(2) == 1
+    assert 'RAW_XML' in profile.fieldnames
+
+
+def test_profile_from_empty_csv(tmpdir: py._path.local.LocalPath) -> None:
+    filepath = tmpdir.join('empty.csv')
+    filepath.write('EVAL_ID,RAW_XML\n')
+    with pytest.raises(generator.GeneratorError):
+        generator.Profile.from_csv(str(filepath))
+
+
+def test_generate_rows_count(profile: generator.Profile) -> None:
+    assert len(list(generator.generate_rows(profile, 5, seed=1))) == 5
+
+
+def test_generate_rows_is_deterministic(profile: generator.Profile) -> None:
+    first = list(generator.generate_rows(profile, 4, seed=3))
+    second = list(generator.generate_rows(profile, 4, seed=3))
+    other = list(generator.generate_rows(profile, 4, seed=4))
+    assert first == second
+    assert first != other
+
+
+def test_generate_rows_pairs(profile: generator.Profile) -> None:
+    rows = list(generator.generate_rows(profile, 6, seed=0))
+    groups = collections.defaultdict(list)
+    for row in rows:
+        groups[row['EVAL_ID']].append(row)
+
+    assert len(groups) == 3
+    for pre, post in groups.values():
+        assert (pre['EVAL_TYPE'], post['EVAL_TYPE']) == ('D', 'E')
+        assert post['PREVIOUSFILEID'] == pre['BUILDER']
+        assert pre['CLIENTPCODE'] == post['CLIENTPCODE']
+
+
+def test_generated_rows_are_valid(profile: generator.Profile, tmpdir: py._path.local.LocalPath) -> None:
+    outfile = str(tmpdir.join('generated.csv'))
+    generated = list(generator.generate_rows(profile, 4, seed=2))
+    assert generator.write_csv(generated, profile.fieldnames, outfile) == 4
+
+    extracted = list(extractor.extract_data(outfile))
+    rows = [row for row in extracted if row is not None]
+    assert len(rows) == len(extracted)
+    for generated_row, row in zip(generated, rows):
+        assert row['forwardSortationArea'] == generated_row['CLIENTPCODE'][:3]
+
+    groups = collections.defaultdict(list)
+    for row in rows:
+        groups[row['EVAL_ID']].append(row)
+    for group in groups.values():
+        assert dwelling.Dwelling.from_group(group)
@@ -0,0 +1,94 @@
+import os
+import typing
+import py
+import pytest
+from energuide import grouping
+
+
+@pytest.fixture
+def rows() -> typing.List[typing.Dict[str, typing.Any]]:
+    return [
+        {'EVAL_ID': 3, 'EVAL_TYPE': 'D'},
+        {'EVAL_ID': 1, 'EVAL_TYPE': 'D'},
+        {'EVAL_ID': 2, 'EVAL_TYPE': 'D'},
+        {'EVAL_ID': 1, 'EVAL_TYPE': 'E'},
+        {'EVAL_ID': 3, 'EVAL_TYPE': 'E'},
+    ]
+
+
+def _summary(groups: typing.Iterable[typing.List[typing.Dict[str, typing.Any]]]) -> typing.List[typing.List[str]]:
+    return [[f"{row['EVAL_ID']}{row['EVAL_TYPE']}" for row in group] for group in groups]
+
+
+def test_group_rows_in_memory(rows: typing.List[typing.Dict[str, typing.Any]]) -> None:
+    output = grouping.group_rows(rows, 'EVAL_ID')
+    assert _summary(output) == [['1D', '1E'], ['2D'], ['3D', '3E']]
+
+
+def test_group_rows_spills(rows: typing.List[typing.Dict[str, typing.Any]], tmpdir: py._path.local.LocalPath) -> None:
+    grouper = grouping.ExternalGrouper('EVAL_ID', memory_budget=1, tmpdir=str(tmpdir))
+    for row in rows:
+        grouper.add(row)
+
+    assert grouper.num_runs == 5
+    assert _summary(grouper.groups()) == [['1D', '1E'], ['2D'], ['3D', '3E']]
+    assert not os.listdir(str(tmpdir))
+
+
+def test_group_rows_reduces_runs(monkeypatch: typing.Any, tmpdir: py._path.local.LocalPath) -> None:
+    monkeypatch.setattr(grouping, 'MAX_MERGE_FAN_IN', 2)
+    rows = [{'EVAL_ID': eval_id % 3, 'ORDER': order} for order, eval_id in enumerate(range(10))]
+
+    output = list(grouping.group_rows(rows, 'EVAL_ID', memory_budget=1, tmpdir=str(tmpdir)))
+    assert [[row['ORDER'] for row in group] for group in output] == [[0, 3, 6, 9], [1, 4, 7], [2, 5, 8]]
+    assert not os.listdir(str(tmpdir))
+
+
+def test_group_rows_cleans_up_when_abandoned(rows: typing.List[typing.Dict[str, typing.Any]],
+                                             tmpdir: py._path.local.LocalPath) -> None:
+    output = grouping.group_rows(rows, 'EVAL_ID', memory_budget=1, tmpdir=str(tmpdir))
+    next(output)
+    output.close()
+    assert not os.listdir(str(tmpdir))
+
+
+def test_group_rows_samples_row_sizes(monkeypatch: typing.Any, tmpdir: py._path.local.LocalPath) -> None:
+    sized: typing.List[typing.Any] = []
+    in_memory_size = grouping._in_memory_size
+
+    def counting_size(value: typing.Any) -> int:
+        sized.append(value)
+        return in_memory_size(value)
+
+    monkeypatch.setattr(grouping, '_in_memory_size', counting_size)
+    grouper = grouping.ExternalGrouper('EVAL_ID', tmpdir=str(tmpdir))
+    for eval_id in range(grouping.SIZE_SAMPLE_INTERVAL * 2):
+        grouper.add({'EVAL_ID': eval_id})
+
+    assert len([value for value in sized if isinstance(value, dict)]) == 2
+    assert grouper.num_runs == 0
+
+
+def test_in_memory_size_exceeds_serialized_size() -> None:
+    row = {'EVAL_ID': '123456', 'EVAL_TYPE': 'D', 'WALLS': [{'label': 'Main floor', 'rValue': 2.5}]}
+    assert grouping._in_memory_size(row) > 2 * len(grouping.serialization.dumps(row))
+
+
+def test_group_rows_presorted(rows: typing.List[typing.Dict[str, typing.Any]]) -> None:
+    ordered = sorted(rows, key=lambda row: row['EVAL_ID'])
+    consumed: typing.List[typing.Dict[str, typing.Any]] = []
+
+    def read() -> typing.Iterator[typing.Dict[str, typing.Any]]:
+        for row in ordered:
+            consumed.append(row)
+            yield row
+
+    output = grouping.group_rows(read(), 'EVAL_ID', presorted=True)
+    assert next(output) == ordered[:2]
+    assert len(consumed) == 3
+    assert _summary(output) == [['2D'], ['3D', '3E']]
+
+
+def test_group_rows_presorted_rejects_unsorted(rows: typing.List[typing.Dict[str, typing.Any]]) -> None:
+    with pytest.raises(grouping.GroupingError):
+        list(grouping.group_rows(rows, 'EVAL_ID', presorted=True))
@@ -0,0 +1,96 @@
+import typing
+import pymongo
+from pymongo import errors
+import pytest
+from energuide import indexes
+
+
+class FakeDatabase:
+
+    def __init__(self, collection: 'FakeIndexCollection') -> None:
+        self.collection = collection
+
+    def command(self, name: str, _collection_name: str) -> typing.Dict[str, typing.Any]:
+        assert name == 'collStats'
+        return {'indexSizes': {index: 4096 for index in self.collection.indexes}}
+
+
+class FakeIndexCollection:
+
+    def __init__(self,
+                 existing: typing.Optional[typing.Dict[str, typing.Dict[str, typing.Any]]] = None,
+                 accesses: typing.Optional[typing.Dict[str, int]] = None) -> None:
+        self.name = 'dwellings'
+        self.full_name = 'energuide.dwellings'
+        self.database = FakeDatabase(self)
+        self.indexes: typing.Dict[str, typing.Dict[str, typing.Any]] = {'_id_': {'key': [('_id', 1)]}}
+        self.indexes.update(existing or {})
+        self.accesses = accesses or {}
+        self.created: typing.List[typing.Tuple[str, bool]] = []
+        self.dropped: typing.List[str] = []
+
+    def index_information(self) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+        return dict(self.indexes)
+
+    def create_index(self, keys: indexes.Keys, name: str, unique: bool, background: bool) -> str:
+        assert background
+        self.created.append((name, unique))
+        self.indexes[name] = {'key': keys, 'unique': unique}
+        return name
+
+    def drop_index(self, name: str) -> None:
+        self.dropped.append(name)
+        del self.indexes[name]
+
+    def aggregate(self,
+                  pipeline: typing.List[typing.Dict[str, typing.Any]]) -> typing.List[typing.Dict[str, typing.Any]]:
+        assert pipeline == [{'$indexStats': {}}]
+        return [{'name': name, 'accesses': {'ops': self.accesses.get(name, 0)}} for name in self.indexes]
+
+
+def test_required_indexes() -> None:
+    names = [spec.name for spec in indexes.REQUIRED_INDEXES]
+    assert 'houseId_1' in names
+    assert 'evaluations.heatedFloorArea_1' in names
+    assert len(names) == len(set(names))
+    assert [spec.unique for spec in indexes.REQUIRED_INDEXES if spec.name == 'houseId_1'] == [True]
+
+
+def test_ensure_creates_missing() -> None:
+    collection = FakeIndexCollection(existing={'city_1': {'key': [('city', pymongo.ASCENDING)]}})
+    created = indexes.ensure(collection)
+
+    assert 'city_1' not in created
+    assert len(created) == len(indexes.REQUIRED_INDEXES) - 1
+    assert ('houseId_1', True) in collection.created
+    assert indexes.ensure(collection) == []
+
+
+def test_ensure_rebuilds_mismatched() -> None:
+    collection = FakeIndexCollection(existing={'houseId_1': {'key': [('houseId', pymongo.ASCENDING)]}})
+    indexes.ensure(collection, indexes.UPSERT_INDEXES)
+
+    assert collection.dropped == ['houseId_1']
+    assert collection.indexes['houseId_1']['unique']
+
+
+def test_ensure_failure() -> None:
+    class FailingCollection(FakeIndexCollection):
+        def create_index(self, keys: indexes.Keys, name: str, unique: bool, background: bool) -> str:
+            raise errors.OperationFailure('E11000 duplicate key error')
+
+    with pytest.raises(indexes.IndexSyncError):
+        indexes.ensure(FailingCollection())
+
+
+def test_sync_report() -> None:
+    collection = FakeIndexCollection(existing={'legacy_1': {'key': [('legacy', pymongo.ASCENDING)]}},
+                                     accesses={'_id_': 0, 'houseId_1': 12})
+    statuses = {status.name: status for status in indexes.sync(collection)}
+
+    assert statuses['houseId_1'] == indexes.IndexStatus(name='houseId_1', size_bytes=4096, accesses=12,
+                                                        declared=True, created=True)
+    assert not statuses['_id_'].unused
+    assert statuses['legacy_1'].unused
+    assert not statuses['legacy_1'].declared
+    assert not statuses['legacy_1'].created
@@ -0,0 +1,63 @@
+import time
+import typing
+import pytest
+from energuide import pipeline
+
+
+def _slow(items: typing.Iterable[int], delay: float) -> typing.Iterator[int]:
+    for item in items:
+        time.sleep(delay)
+        yield item
+
+
+def test_run() -> None:
+    consumed: typing.List[int] = []
+    report = pipeline.run(range(10), consumed.append, depth=2)
+
+    assert consumed == list(range(10))
+    assert report.items == 10
+
+
+def test_run_database_bound() -> None:
+    report = pipeline.run(range(6), lambda item: time.sleep(0.02), depth=1)
+
+    assert report.producer_stalls > 0
+    assert report.bound == 'database'
+
+
+def test_run_transform_bound() -> None:
+    report = pipeline.run(_slow(range(6), 0.02), lambda item: None, depth=4)
+
+    assert report.consumer_stalls > 0
+    assert report.bound == 'transform'
+    assert 'transform bound' in str(report)
+
+
+def test_run_consumer_error() -> None:
+    produced: typing.List[int] = []
+
+    def produce() -> typing.Iterator[int]:
+        for item in range(1000):
+            produced.append(item)
+            yield item
+
+    def consume(item: int) -> None:
+        if item == 3:
+            raise ValueError('write failed')
+
+    with pytest.raises(ValueError):
+        pipeline.run(produce(), consume, depth=2)
+    assert len(produced) < 1000
+
+
+def test_run_producer_error() -> None:
+    consumed: typing.List[int] = []
+
+    def produce() -> typing.Iterator[int]:
+        yield 1
+        yield 2
+        raise ValueError('transform failed')
+
+    with pytest.raises(ValueError):
+        pipeline.run(produce(), consumed.append, depth=4)
+    assert consumed == [1, 2]
@@ -0,0 +1,77 @@
+import random
+import threading
+import time
+import pytest
+from energuide import prefetch
+
+
+def test_prefetched_keeps_order() -> None:
+    delays = {key: random.uniform(0, 0.005) for key in range(50)}
+
+    def fetch(key: int) -> int:
+        time.sleep(delays[key])
+        return key * 2
+
+    output = list(prefetch.prefetched(fetch, range(50), workers=8, window=16))
+    assert output == [key * 2 for key in range(50)]
+
+
+def test_prefetched_serial() -> None:
+    threads = set()
+
+    def fetch(key: int) -> int:
+        threads.add(threading.get_ident())
+        return key
+
+    assert list(prefetch.prefetched(fetch, range(5), workers=1)) == list(range(5))
+    assert threads == {threading.get_ident()}
+
+
+def test_prefetched_bounds_window() -> None:
+    submitted = []
+
+    def fetch(key: int) -> int:
+        submitted.append(key)
+        return key
+
+    output = prefetch.prefetched(fetch, range(100), workers=2, window=4)
+    assert next(output) == 0
+    time.sleep(0.01)
+    assert len(submitted) <= 4
+    output.close()
+
+
+def test_prefetched_raises() -> None:
+    def fetch(key: int) -> int:
+        if key == 3:
+            raise ValueError(key)
+        return key
+
+    output = prefetch.prefetched(fetch, range(10), workers=4, window=4)
+    assert [next(output) for _ in range(3)] == [0, 1, 2]
+    with pytest.raises(ValueError):
+        next(output)
+
+
+def test_latency_stats() -> None:
+    stats = prefetch.LatencyStats()
+    for seconds in [0.001 * value for value in range(1, 101)]:
+        stats.record(seconds)
+
+    summary = stats.summary()
+    assert summary.downloads == 100
+    assert summary.mean_ms == pytest.approx(50.5)
+    assert summary.p50_ms == pytest.approx(51)
+    assert summary.p95_ms == pytest.approx(96)
+    assert summary.max_ms == pytest.approx(100)
+
+
+def test_latency_stats_empty() -> None:
+    assert prefetch.LatencyStats().summary().downloads == 0
+
+
+def test_timed_fetch() -> None:
+    stats = prefetch.LatencyStats()
+    fetch = prefetch.timed_fetch(lambda key: key + 1, stats)
+    assert fetch(1) == 2
+    assert len(stats.latencies()) == 1
@@ -0,0 +1,87 @@
+import typing
+import py._path.local
+import pytest
+from energuide import record_log
+
+
+@pytest.fixture
+def records() -> typing.List[record_log.Record]:
+    return [
+        {'EVAL_ID': '100', 'BUILDER': 'A', 'value': 1},
+        {'EVAL_ID': '100', 'BUILDER': 'B', 'value': 2},
+        {'EVAL_ID': '101', 'BUILDER': 'C', 'value': 3},
+        {'EVAL_ID': '102', 'BUILDER': 'D', 'value': 4},
+        {'EVAL_ID': '102', 'BUILDER': 'E', 'value': 5},
+    ]
+
+
+def _write(path: str, records: typing.List[record_log.Record], block_size: int = record_log.BLOCK_SIZE) -> None:
+    with open(path, 'wb') as file:
+        writer = record_log.RecordLogWriter(file, 'EVAL_ID', block_size=block_size)
+        for record in records:
+            writer.write(record)
+        writer.close()
+
+
+@pytest.mark.parametrize('block_size', [record_log.BLOCK_SIZE, 1])
+def test_round_trip(tmpdir: py._path.local.LocalPath,
+                    records: typing.List[record_log.Record],
+                    block_size: int) -> None:
+    path = f'{tmpdir}/output.log'
+    _write(path, records, block_size)
+
+    reader = record_log.RecordLogReader(path)
+    assert record_log.is_record_log(path)
+    assert reader.num_records() == 5
+    assert list(reader.records()) == records
+
+
+@pytest.mark.parametrize('block_size', [record_log.BLOCK_SIZE, 1, 50])
+def test_lookup(tmpdir: py._path.local.LocalPath,
+                records: typing.List[record_log.Record],
+                block_size: int) -> None:
+    path = f'{tmpdir}/output.log'
+    _write(path, records, block_size)
+
+    reader = record_log.RecordLogReader(path)
+    assert reader.lookup('100') == records[0:2]
+    assert reader.lookup(101) == records[2:3]
+    assert reader.lookup('102') == records[3:5]
+    assert reader.lookup('999') == []
+
+
+def test_empty(tmpdir: py._path.local.LocalPath) -> None:
+    path = f'{tmpdir}/output.log'
+    _write(path, [])
+
+    reader = record_log.RecordLogReader(path)
+    assert reader.num_records() == 0
+    assert not list(reader.records())
+
+
+def test_unsorted(tmpdir: py._path.local.LocalPath, records: typing.List[record_log.Record]) -> None:
+    with open(f'{tmpdir}/output.log', 'wb') as file:
+        writer = record_log.RecordLogWriter(file, 'EVAL_ID')
+        with pytest.raises(record_log.RecordLogError):
+            for record in reversed(records):
+                writer.write(record)
+
+
+def test_not_a_record_log(tmpdir: py._path.local.LocalPath) -> None:
+    path = f'{tmpdir}/output.zip'
+    with open(path, 'wb') as file:
+        file.write(b'PK\x03\x04 not a record log')
+
+    assert not record_log.is_record_log(path)
+    with pytest.raises(record_log.RecordLogError):
+        record_log.RecordLogReader(path)
+
+
+def test_truncated(tmpdir: py._path.local.LocalPath, records: typing.List[record_log.Record]) -> None:
+    path = f'{tmpdir}/output.log'
+    _write(path, records)
+    with open(path, 'r+b') as file:
+        file.truncate(len(record_log.MAGIC) + 10)
+
+    with pytest.raises(record_log.RecordLogError):
+        record_log.RecordLogReader(path)
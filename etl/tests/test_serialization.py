@@ -0,0 +1,64 @@
+import typing
+import bson
+import pytest
+from bson import raw_bson
+from energuide import dwelling
+from energuide import serialization
+from energuide import transform
+
+
+@pytest.fixture
+def stdlib_backend() -> typing.Iterator[serialization.JsonBackend]:
+    previous = serialization.BACKEND
+    yield serialization.set_backend(serialization.STDLIB_BACKEND)
+    serialization.BACKEND = previous
+
+
+@pytest.fixture
+def house() -> dwelling.Dwelling:
+    return dwelling.Dwelling(house_id=1, year_built=2000, city='Ottawa', region=dwelling.Region.ONTARIO,
+                             forward_sortation_area='K1P', evaluations=[])
+
+
+def test_available_backends() -> None:
+    assert serialization.available_backends()[-1] == serialization.STDLIB_BACKEND
+    assert serialization.get_backend().name == serialization.available_backends()[0]
+
+
+@pytest.mark.parametrize('name', serialization.available_backends())
+def test_backend_round_trip(name: str) -> None:
+    backend = serialization.get_backend(name)
+    record = {'EVAL_ID': 1, 'CLIENTCITY': 'Trois-Rivières', 'codes': {'wall': []}, 'ersRating': None}
+    encoded = backend.dumps(record)
+    assert isinstance(encoded, bytes)
+    assert backend.loads(encoded) == record
+    assert serialization.get_backend(serialization.STDLIB_BACKEND).loads(encoded) == record
+
+
+def test_unknown_backend() -> None:
+    with pytest.raises(serialization.SerializationError):
+        serialization.get_backend('pickle')
+
+
+def test_module_functions_use_backend(stdlib_backend: serialization.JsonBackend) -> None:
+    assert serialization.BACKEND is stdlib_backend
+    assert serialization.loads(serialization.dumps([1, 'a'])) == [1, 'a']
+
+
+def test_dwelling_to_bson(house: dwelling.Dwelling) -> None:
+    document = house.to_bson()
+    assert isinstance(document, raw_bson.RawBSONDocument)
+    assert bson.BSON(document.raw).decode() == house.to_dict()
+
+
+def test_transformed_dwelling(house: dwelling.Dwelling) -> None:
+    transformed = transform.TransformedDwelling.from_dwelling(house)
+    assert transformed.house_id == 1
+    assert transformed.to_dict() == house.to_dict()
+    assert transformed.to_bson().raw == house.to_bson().raw
+
+
+def test_with_field(house: dwelling.Dwelling) -> None:
+    document = serialization.with_field(house.to_bson(), 'fingerprint', 'abc')
+    assert isinstance(document, raw_bson.RawBSONDocument)
+    assert bson.BSON(document.raw).decode() == {**house.to_dict(), 'fingerprint': 'abc'}
@@ -2,7 +2,7 @@ import os
 import pytest
 from energuide import element
 from energuide import snippets
-from energuide import validator
+from energuide.exceptions import ElementGetValueError
 
 
 @pytest.fixture
@@ -13,6 +13,13 @@ def doc() -> element.Element:
     return doc
 
 
+@pytest.fixture
+def raw_xml() -> str:
+    sample_filename = os.path.join(os.path.dirname(__file__), 'sample.h2k')
+    with open(sample_filename, 'r') as h2k:
+        return h2k.read()
+
+
 @pytest.fixture
 def house(doc: element.Element) -> element.Element:
     house_node = doc.find('House')
@@ -58,50 +65,60 @@ def test_other_data_snippet_to_dict() -> None:
 def test_ceiling_snippet(house: element.Element) -> None:
     output = snippets.snip_house(house)
     assert len(output.ceilings) == 2
-    checker = validator.DwellingValidator({
-        'ceilings': {'type': 'list', 'required': True, 'schema': {'type': 'xml', 'coerce': 'parse_xml'}}
-    }, allow_unknown=True)
-    doc = {'ceilings': output.ceilings}
-    assert checker.validate(doc)
+    assert output.ceilings[0] == {
+        'label': 'Main attic',
+        'typeEnglish': 'Attic/gable',
+        'typeFrench': 'Combles/pignon',
+        'nominalInsulation': '2.864',
+        'rValue': '2.9463',
+        'area': '46.4515',
+        'length': '23.875',
+    }
 
 
 def test_floor_snippet(house: element.Element) -> None:
     output = snippets.snip_house(house)
     assert len(output.floors) == 1
-    checker = validator.DwellingValidator({
-        'floors': {'type': 'list', 'required': True, 'schema': {'type': 'xml', 'coerce': 'parse_xml'}}
-    }, allow_unknown=True)
-    doc = {'floors': output.floors}
-    assert checker.validate(doc)
+    assert output.floors[0] == {
+        'label': 'Rm over garage',
+        'nominalInsulation': '2.11',
+        'rValue': '2.61',
+        'area': '9.2903',
+        'length': '3.048',
+    }
 
 
 def test_wall_snippet(house: element.Element) -> None:
     output = snippets.snip_house(house)
     assert len(output.walls) == 3
-    checker = validator.DwellingValidator({
-        'walls': {'type': 'list', 'required': True, 'schema': {'type': 'xml', 'coerce': 'parse_xml'}}
-    }, allow_unknown=True)
-    doc = {'walls': output.walls}
-    assert checker.validate(doc)
+    assert output.walls[0] == {
+        'label': 'End Wall',
+        'codeId': 'Code 1',
+        'nominalInsulation': '1.432',
+        'rValue': '1.7435',
+        'perimeter': '7.367',
+        'height': '1.2283',
+    }
 
 
 def test_window_snippet(house: element.Element) -> None:
     output = snippets.snip_house(house)
     assert len(output.windows) == 10
-    checker = validator.DwellingValidator({
-        'windows': {'type': 'list', 'required': True, 'schema': {'type': 'xml', 'coerce': 'parse_xml'}}
-    }, allow_unknown=True)
-    doc = {'windows': output.windows}
-    assert checker.validate(doc)
+    assert output.windows[0] == {
+        'label': 'East0001',
+        'codeId': 'Code 12',
+        'rValue': '0.4779',
+        'width': '1322.0699',
+        'height': '1967.738',
+    }
 
 
 def test_heated_floor_area_snippet(house: element.Element) -> None:
     output = snippets.snip_house(house)
-    checker = validator.DwellingValidator({
-        'heated_floor': {'type': 'xml', 'coerce': 'parse_xml'}
-    }, allow_unknown=True)
-    doc = {'windows': output.heated_floor_area}
-    assert checker.validate(doc)
+    assert output.heated_floor_area == {
+        'aboveGrade': '185.8',
+        'belowGrade': '92.9',
+    }
 
 
 def test_deeply_embedded_components() -> None:
@@ -175,100 +192,146 @@ def test_deeply_embedded_components() -> None:
 def test_wall_code_snippet(code: element.Element) -> None:
     output = snippets.snip_codes(code)
     assert len(output.wall) == 2
-    checker = validator.DwellingValidator({
-        'codes': {'type': 'list', 'required': True, 'schema': {'type': 'xml', 'coerce': 'parse_xml'}}
-    }, allow_unknown=True)
-    doc = {'codes': output.wall}
-    assert checker.validate(doc)
+    assert output.wall[0] == {
+        'id': 'Code 1',
+        'label': '1201101121',
+        'structureTypeEnglish': 'Wood frame',
+        'structureTypeFrench': 'Ossature de bois',
+        'componentTypeSizeEnglish': '38x89 mm (2x4 in)',
+        'componentTypeSizeFrench': '38x89 (2x4)',
+    }
 
 
 def test_window_code_snippet(code: element.Element) -> None:
     output = snippets.snip_codes(code)
-    assert len(output.wall) == 2
-    checker = validator.DwellingValidator({
-        'codes': {'type': 'list', 'required': True, 'schema': {'type': 'xml', 'coerce': 'parse_xml'}}
-    }, allow_unknown=True)
-    doc = {'codes': output.window}
-    assert checker.validate(doc)
+    assert len(output.window) == 4
+    assert output.window[0] == {
+        'id': 'Code 11',
+        'label': '202002',
+        'glazingTypesEnglish': 'Double/double with 1 coat',
+        'glazingTypesFrench': 'Double/double, 1 couche',
+        'coatingsTintsEnglish': 'Clear',
+        'coatingsTintsFrench': 'Transparent',
+        'fillTypeEnglish': '6 mm Air',
+        'fillTypeFrench': "6 mm d'air",
+        'spacerTypeEnglish': 'Metal',
+        'spacerTypeFrench': 'Métal',
+        'typeEnglish': 'Picture',
+        'typeFrench': 'Fixe',
+        'frameMaterialEnglish': 'Wood',
+        'frameMaterialFrench': 'Bois',
+    }
 
 
 def test_door_snippet(house: element.Element) -> None:
     output = snippets.snip_house(house)
     assert len(output.doors) == 2
-    checker = validator.DwellingValidator({
-        'doors': {'type': 'list', 'required': True, 'schema': {'type': 'xml', 'coerce': 'parse_xml'}}
-    }, allow_unknown=True)
-    doc = {'doors': output.walls}
-    assert checker.validate(doc)
+    assert output.doors[0] == {
+        'label': 'Front door',
+        'typeEnglish': 'Solid wood',
+        'typeFrench': 'Bois massif',
+        'rsi': '0.39',
+        'height': '1.9799',
+        'width': '0.8499',
+    }
 
 
 def test_heating_cooling_snippet(house: element.Element) -> None:
     output = snippets.snip_house(house)
-    assert output.heating_cooling
-    doc = element.Element.from_string(output.heating_cooling)
-    child_tags = {node.tag for node in doc}
-    assert 'Label' in child_tags
-    assert len(child_tags) == 6
+    assert output.heating_cooling == {
+        'label': 'Heating/Cooling System',
+        'efficiency': '78',
+        'heatingTypes': ['FansAndPump', 'Furnace'],
+        'outputCapacity': {'units': 'btu/hr', 'value': '33'},
+        'energySourceCode': '2',
+        'equipmentTypeEnglish': 'Furnace w/ continuous pilot',
+        'equipmentTypeFrench': 'Fournaise avec veilleuse permanente',
+        'isSteadyState': 'true',
+    }
 
 
 def test_ventilation_snippet(house: element.Element) -> None:
     output = snippets.snip_house(house)
-    doc = element.Element.from_string(output.ventilation[0])
-    child_tags = {node.tag for node in doc}
-    assert 'VentilatorType' in child_tags
-    assert len(child_tags) == 3
+    assert output.ventilation == [{
+        'isEnergyStar': 'false',
+        'isHomeVentilatingInstituteCertified': 'false',
+        'supplyFlowrate': '220',
+        'efficiency': '55',
+    }]
 
 
 def test_water_heating_snippet(house: element.Element) -> None:
     output = snippets.snip_house(house)
     assert output.water_heating
-    doc = element.Element.from_string(output.water_heating)
-    nodes = doc.xpath('*[self::Primary or self::Secondary]')
-    assert len(nodes) == 2
-
-    assert all([water_heating.attrib['hasDrainWaterHeatRecovery'] == 'false'
-                for water_heating in nodes])
+    assert len(output.water_heating) == 2
+    assert all([water_heating['hasDrainWaterHeatRecovery'] == 'false'
+                for water_heating in output.water_heating])
 
 
 def test_basement_snippet(house: element.Element) -> None:
     output = snippets.snip_house(house)
     assert len(output.basements) == 1
-    checker = validator.DwellingValidator({
-        'basements': {'type': 'list', 'required': True, 'schema': {'type': 'xml', 'coerce': 'parse_xml'}}
-    }, allow_unknown=True)
-    doc = {'basements': output.basements}
-    assert checker.validate(doc)
+
+    basement_snippet = output.basements[0]
+    assert basement_snippet['foundationType'] == 'Basement'
+    assert basement_snippet['configurationType'] == 'BCCB'
+    assert basement_snippet['header'] == {
+        'nominalInsulation': '3.87',
+        'rValue': '4.0777',
+        'height': '0.23',
+        'perimeter': '39.9288',
+    }
+    assert basement_snippet['wall']['sections']['InteriorAddedInsulation'] == [
+        {'percentage': '100', 'nominalRsi': '1.432', 'rsi': '1.4603'}
+    ]
 
 
 def test_crawlspace_snippet(house: element.Element) -> None:
     output = snippets.snip_house(house)
     assert len(output.crawlspaces) == 1
-    checker = validator.DwellingValidator({
-        'crawlspaces': {'type': 'list', 'required': True, 'schema': {'type': 'xml', 'coerce': 'parse_xml'}}
-    }, allow_unknown=True)
-    doc = {'crawlspaces': output.crawlspaces}
-    assert checker.validate(doc)
+
+    crawlspace_snippet = output.crawlspaces[0]
+    assert crawlspace_snippet['foundationType'] == 'Crawlspace'
+    assert crawlspace_snippet['header'] is None
+    assert crawlspace_snippet['floor']['construction']['FloorsAbove'] == {'nominalInsulation': '0', 'rValue': '0.468'}
 
 
 def test_slab_snippet(house: element.Element) -> None:
     output = snippets.snip_house(house)
     assert len(output.slabs) == 1
-    checker = validator.DwellingValidator({
-        'slabs': {'type': 'list', 'required': True, 'schema': {'type': 'xml', 'coerce': 'parse_xml'}}
-    }, allow_unknown=True)
-    doc = {'slabs': output.crawlspaces}
-    assert checker.validate(doc)
+
+    slab_snippet = output.slabs[0]
+    assert slab_snippet['foundationType'] == 'Slab'
+    assert slab_snippet['floor']['isRectangular'] == 'true'
 
 
 def test_upgrades_snippet(energy_upgrades: element.Element) -> None:
     output = snippets.snip_energy_upgrades(energy_upgrades)
     assert len(output.upgrades) == 12
-    checker = validator.DwellingValidator({
-        'upgrades': {'type': 'list', 'required': True, 'schema': {'type': 'xml', 'coerce': 'parse_xml'}}
-    }, allow_unknown=True)
+    assert output.upgrades[0] == {
+        'upgradeType': 'CathedralCeilingsFlat',
+        'cost': '0',
+        'priority': '1',
+    }
 
-    doc = {'upgrades': output.upgrades}
-    assert checker.validate(doc)
+
+def test_upgrades_snippet_skips_comments() -> None:
+    energy_upgrades = element.Element.from_string(
+        '<EnergyUpgrades><Settings><!-- comment --><?pi?>'
+        '<CathedralCeilingsFlat cost="0" priority="1" /></Settings></EnergyUpgrades>'
+    )
+    output = snippets.snip_energy_upgrades(energy_upgrades)
+    assert [upgrade['upgradeType'] for upgrade in output.upgrades] == ['CathedralCeilingsFlat']
+
+
+def test_get_value() -> None:
+    assert snippets.get_value({'area': '1.5'}, 'area', float) == 1.5
+
+
+@pytest.mark.parametrize('snippet', [{}, {'area': None}, {'area': 'abc'}])
+def test_get_value_invalid(snippet: snippets.Snippet) -> None:
+    with pytest.raises(ElementGetValueError):
+        snippets.get_value(snippet, 'area', float)
 
 
 def test_other_data_snippet(doc: element.Element) -> None:
@@ -277,3 +340,32 @@ def test_other_data_snippet(doc: element.Element) -> None:
         forward_sortation_area='H0H',
         ers_rating='267',
     )
+
+
+@pytest.mark.parametrize('stop_early', [False, True])
+def test_document_snippet(raw_xml: str,
+                          doc: element.Element,
+                          house: element.Element,
+                          code: element.Element,
+                          energy_upgrades: element.Element,
+                          stop_early: bool) -> None:
+    output = snippets.snip_document(raw_xml, stop_early=stop_early)
+    assert output.house == snippets.snip_house(house)
+    assert output.codes == snippets.snip_codes(code)
+    assert output.energy_upgrades == snippets.snip_energy_upgrades(energy_upgrades)
+    assert output.other_data == snippets.snip_other_data(doc)
+
+
+def test_document_snippet_sections(raw_xml: str, house: element.Element) -> None:
+    output = snippets.snip_document(raw_xml, sections=frozenset(['House']), stop_early=True)
+    assert output.house == snippets.snip_house(house)
+    assert output.codes is None
+    assert output.energy_upgrades is None
+    assert output.other_data == snippets.OtherDataSnippet(forward_sortation_area=None, ers_rating=None)
+
+
+def test_document_snippet_to_dict(raw_xml: str) -> None:
+    output = snippets.snip_document(raw_xml, sections=frozenset(['House'])).to_dict()
+    assert output['codes'] == snippets.Codes.EMPTY_SNIPPET['codes']
+    assert output['upgrades'] == []
+    assert len(output['ceilings']) == 2
@@ -0,0 +1,102 @@
+import threading
+from energuide import timings
+
+
+def test_timed_disabled() -> None:
+    timer = timings.Timings()
+    with timer.timed('stage'):
+        pass
+    assert timer.stages() == []
+
+
+def test_timed() -> None:
+    timer = timings.Timings()
+    timer.enable()
+    for _ in range(3):
+        with timer.timed('stage'):
+            pass
+
+    output = timer.stages()
+    assert [(stage.stage, stage.calls) for stage in output] == [('stage', 3)]
+    assert output[0].seconds >= 0
+
+
+def test_timed_records_exceptions() -> None:
+    timer = timings.Timings()
+    timer.enable()
+    try:
+        with timer.timed('stage'):
+            raise ValueError()
+    except ValueError:
+        pass
+    assert timer.stages()[0].calls == 1
+
+
+def test_timed_iter() -> None:
+    timer = timings.Timings()
+    timer.enable()
+    assert list(timer.timed_iter('read', iter([1, 2, 3]))) == [1, 2, 3]
+    assert timer.stages()[0].stage == 'read'
+
+
+def test_reset() -> None:
+    timer = timings.Timings()
+    timer.enable()
+    timer.add('stage', 1.0)
+    timer.reset()
+    assert timer.stages() == []
+
+
+def test_report() -> None:
+    timer = timings.Timings()
+    timer.enable()
+    timer.add('parsing', 0.5)
+    timer.add('parsing', 0.25)
+
+    lines = timer.report().splitlines()
+    assert lines[0].split() == ['stage', 'calls', 'total', 's', 'avg', 'ms', '%']
+    assert lines[1].split()[:4] == ['parsing', '2', '0.750', '375.000']
+    assert lines[2].split()[0] == 'other'
+    assert lines[3].split()[0] == 'total'
+
+
+def test_merge() -> None:
+    timer = timings.Timings()
+    timer.enable()
+    timer.add('parsing', 0.5)
+    timer.merge([timings.StageTiming(stage='parsing', calls=3, seconds=1.5),
+                 timings.StageTiming(stage='from_group', calls=2, seconds=1.0)])
+
+    assert timer.stages() == [timings.StageTiming(stage='parsing', calls=4, seconds=2.0),
+                              timings.StageTiming(stage='from_group', calls=2, seconds=1.0)]
+    lines = timer.report().splitlines()
+    assert lines[1].split()[0] == 'parsing*'
+    assert lines[-1].startswith('*')
+
+
+def test_timed_call() -> None:
+    def work() -> int:
+        with timings.TIMINGS.timed('stage'):
+            return 1
+
+    assert timings.timed_call(False, work) == (1, [])
+    result, stages = timings.timed_call(True, work)
+    assert result == 1
+    assert [(stage.stage, stage.calls) for stage in stages] == [('stage', 1)]
+    assert not timings.TIMINGS.enabled
+
+
+def test_add_from_threads() -> None:
+    recorder = timings.Timings()
+
+    def add_many() -> None:
+        for _ in range(10000):
+            recorder.add('write', 0.001)
+
+    threads = [threading.Thread(target=add_many) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert recorder.stages()[0].calls == 40000
@@ -1,18 +1,29 @@
+import json
 import typing
 import time
 import zipfile
 import _pytest
+import py
 import pytest
 from azure.storage import blob
+from energuide import element
+from energuide import grouping
 from energuide import transform
+from energuide import transform_cache
 from energuide.embedded import ceiling
 from energuide.exceptions import InvalidEmbeddedDataTypeError
+from tests import conftest
 
 @pytest.fixture
 def local_reader(energuide_zip_fixture: str) -> transform.LocalExtractReader:
     return transform.LocalExtractReader(energuide_zip_fixture)
 
 
+@pytest.fixture
+def record_log_reader(energuide_record_log_fixture: str) -> transform.LocalExtractReader:
+    return transform.LocalExtractReader(energuide_record_log_fixture)
+
+
 @pytest.fixture
 def azure_reader(populated_azure_emulator: transform.AzureCoordinates) -> transform.AzureExtractReader:
     return transform.AzureExtractReader(populated_azure_emulator)
@@ -42,6 +53,33 @@ def test_reader_num_rows(local_reader: transform.LocalExtractReader) -> None:
     assert local_reader.num_rows() == 14
 
 
+def test_record_log_reader(local_reader: transform.LocalExtractReader,
+                           record_log_reader: transform.LocalExtractReader) -> None:
+    assert record_log_reader.num_rows() == 14
+    assert list(record_log_reader.extracted_rows()) == list(local_reader.extracted_rows())
+
+
+def test_reader_lookup(local_reader: transform.LocalExtractReader,
+                       record_log_reader: transform.LocalExtractReader) -> None:
+    eval_id = next(local_reader.extracted_rows())['EVAL_ID']
+
+    output = record_log_reader.lookup(eval_id)
+    assert output
+    assert all(row['EVAL_ID'] == eval_id for row in output)
+    assert output == local_reader.lookup(eval_id)
+
+
+def test_transform_record_log(record_log_reader: transform.LocalExtractReader) -> None:
+    output = transform.transform(record_log_reader)
+    assert len(list(output)) == 7
+
+
+def test_record_log_reader_sorted_by_key(local_reader: transform.LocalExtractReader,
+                                         record_log_reader: transform.LocalExtractReader) -> None:
+    assert record_log_reader.sorted_by_key
+    assert local_reader.sorted_by_key
+
+
 def test_azure_reader_extracted_rows(azure_reader: transform.AzureExtractReader) -> None:
     output = list(azure_reader.extracted_rows())
     output = sorted(output, key=lambda row: row['BUILDER'])
@@ -84,6 +122,134 @@ def test_azure_reader_num_rows_new_data(azure_reader: transform.AzureExtractRead
     assert azure_reader.num_rows() == 0
 
 
+@pytest.fixture
+def fake_azure_coordinates() -> transform.AzureCoordinates:
+    return transform.AzureCoordinates(account='account', key='key', container='test-container', domain=None)
+
+
+def test_fake_azure_reader_extracted_rows(fake_blob_service: conftest.FakeBlockBlobService,
+                                          fake_azure_coordinates: transform.AzureCoordinates) -> None:
+    reader = transform.AzureExtractReader(fake_azure_coordinates, workers=4, window=8, service=fake_blob_service)
+    output = list(reader.extracted_rows())
+
+    assert [row['jsonFileName'] for row in output] == sorted(row['jsonFileName'] for row in output)
+    assert len(output) == 14
+    assert fake_blob_service.max_concurrent_downloads > 1
+    assert reader.latency_stats.summary().downloads == 14
+
+
+def test_fake_azure_reader_serial(fake_blob_service: conftest.FakeBlockBlobService,
+                                  fake_azure_coordinates: transform.AzureCoordinates) -> None:
+    parallel = transform.AzureExtractReader(fake_azure_coordinates, workers=4, service=fake_blob_service)
+    parallel_rows = list(parallel.extracted_rows())
+
+    serial = transform.AzureExtractReader(fake_azure_coordinates, workers=1, service=fake_blob_service)
+    serial._new_file_list = parallel._new_files
+    assert list(serial.extracted_rows()) == parallel_rows
+
+
+def test_fake_azure_reader_new_data(fake_blob_service: conftest.FakeBlockBlobService,
+                                    fake_azure_coordinates: transform.AzureCoordinates) -> None:
+    reader = transform.AzureExtractReader(fake_azure_coordinates, service=fake_blob_service)
+    assert reader.num_rows() == 14
+
+    reader._new_file_list = None
+    name = fake_blob_service.list_blobs('test-container')[0].name
+    fake_blob_service.create_blob_from_bytes('test-container', name,
+                                             fake_blob_service.get_blob_to_bytes('test-container', name).content)
+    assert reader.num_rows() == 2
+
+
+def _add_manifest(service: conftest.FakeBlockBlobService, name: str, files: typing.List[str]) -> None:
+    service.create_blob_from_text('test-container', f'{transform.AzureExtractReader.manifest_prefix}{name}',
+                                  json.dumps({'files': files}))
+
+
+def _touch(service: conftest.FakeBlockBlobService, name: str) -> None:
+    service.create_blob_from_bytes('test-container', name, service.get_blob_to_bytes('test-container', name).content)
+
+
+def test_fake_azure_reader_manifests(fake_blob_service: conftest.FakeBlockBlobService,
+                                     fake_azure_coordinates: transform.AzureCoordinates) -> None:
+    _add_manifest(fake_blob_service, '20180101T000000000000-a.json', [])
+    reader = transform.AzureExtractReader(fake_azure_coordinates, service=fake_blob_service)
+    assert reader.num_rows() == 14
+    reader.commit_checkpoint()
+
+    name = fake_blob_service.list_blobs('test-container')[0].name
+    _touch(fake_blob_service, name)
+    _add_manifest(fake_blob_service, '20180102T000000000000-b.json', [name])
+    fake_blob_service.listed_prefixes.clear()
+
+    reader = transform.AzureExtractReader(fake_azure_coordinates, service=fake_blob_service)
+    new_files = reader._new_files
+    assert None not in fake_blob_service.listed_prefixes
+    assert new_files == sorted(blob_.name for blob_ in fake_blob_service.list_blobs('test-container')
+                               if blob_.name.startswith(name.split('-')[0] + '-'))
+    assert len(new_files) == 2
+    reader.commit_checkpoint()
+
+    assert not fake_blob_service.list_blobs('test-container', prefix=transform.AzureExtractReader.manifest_prefix)
+    assert transform.AzureExtractReader(fake_azure_coordinates, service=fake_blob_service).num_rows() == 0
+
+
+def test_fake_azure_reader_checkpoint_waits_for_commit(fake_blob_service: conftest.FakeBlockBlobService,
+                                                       fake_azure_coordinates: transform.AzureCoordinates) -> None:
+    _add_manifest(fake_blob_service, '20180101T000000000000-a.json', [])
+    reader = transform.AzureExtractReader(fake_azure_coordinates, service=fake_blob_service)
+    assert reader.num_rows() == 14
+    reader.commit_checkpoint()
+
+    name = fake_blob_service.list_blobs('test-container')[0].name
+    _touch(fake_blob_service, name)
+    _add_manifest(fake_blob_service, '20180102T000000000000-b.json', [name])
+
+    assert transform.AzureExtractReader(fake_azure_coordinates, service=fake_blob_service).num_rows() == 2
+    assert transform.AzureExtractReader(fake_azure_coordinates, service=fake_blob_service).num_rows() == 2
+
+
+def test_fake_azure_reader_late_manifest(fake_blob_service: conftest.FakeBlockBlobService,
+                                         fake_azure_coordinates: transform.AzureCoordinates) -> None:
+    _add_manifest(fake_blob_service, '20180102T000000000000-b.json', [])
+    reader = transform.AzureExtractReader(fake_azure_coordinates, service=fake_blob_service)
+    reader.num_rows()
+    reader.commit_checkpoint()
+
+    name = fake_blob_service.list_blobs('test-container')[0].name
+    _touch(fake_blob_service, name)
+    _add_manifest(fake_blob_service, '20180101T000000000000-a.json', [name])
+
+    assert transform.AzureExtractReader(fake_azure_coordinates, service=fake_blob_service).num_rows() == 2
+
+
+def test_fake_azure_reader_keeps_unread_manifests(fake_blob_service: conftest.FakeBlockBlobService,
+                                                  fake_azure_coordinates: transform.AzureCoordinates) -> None:
+    _add_manifest(fake_blob_service, '20180101T000000000000-a.json', [])
+    reader = transform.AzureExtractReader(fake_azure_coordinates, service=fake_blob_service)
+    assert reader.num_rows() == 14
+    reader.commit_checkpoint()
+
+    name = fake_blob_service.list_blobs('test-container')[0].name
+    _touch(fake_blob_service, name)
+    reader = transform.AzureExtractReader(fake_azure_coordinates, service=fake_blob_service)
+    assert reader.num_rows() == 0
+    _add_manifest(fake_blob_service, '20180102T000000000000-b.json', [name])
+    reader.commit_checkpoint()
+
+    assert transform.AzureExtractReader(fake_azure_coordinates, service=fake_blob_service).num_rows() == 2
+
+
+def test_fake_azure_reader_full_scan(fake_blob_service: conftest.FakeBlockBlobService,
+                                     fake_azure_coordinates: transform.AzureCoordinates) -> None:
+    _add_manifest(fake_blob_service, '20180101T000000000000-a.json', [])
+    assert transform.AzureExtractReader(fake_azure_coordinates, service=fake_blob_service).num_rows() == 14
+
+    name = fake_blob_service.list_blobs('test-container')[0].name
+    _touch(fake_blob_service, name)
+    reader = transform.AzureExtractReader(fake_azure_coordinates, service=fake_blob_service, full_scan=True)
+    assert reader.num_rows() == 2
+
+
 def test_azure_coordinates_from_env(monkeypatch: _pytest.monkeypatch.MonkeyPatch) -> None:
     monkeypatch.setenv('EXTRACT_ENDPOINT_STORAGE_ACCOUNT', 'foo')
     monkeypatch.setenv('EXTRACT_ENDPOINT_STORAGE_KEY', 'bar')
@@ -103,6 +269,69 @@ def test_transform(local_reader: transform.LocalExtractReader) -> None:
     assert len(list(output)) == 7
 
 
+@pytest.mark.parametrize('ordered', [True, False])
+def test_transform_workers(local_reader: transform.LocalExtractReader, ordered: bool) -> None:
+    expected = [house.to_dict() for house in transform.transform(local_reader)]
+    output = [house.to_dict() for house in transform.transform(local_reader, workers=2, ordered=ordered, chunk_size=2)]
+
+    if ordered:
+        assert output == expected
+    else:
+        house_ids = [house['houseId'] for house in output]
+        assert sorted(house_ids) == sorted(house['houseId'] for house in expected)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_transform_cache(local_reader: transform.LocalExtractReader,
+                         tmpdir: py._path.local.LocalPath,
+                         workers: int) -> None:
+    cache = transform_cache.TransformCache(str(tmpdir.join('cache.sqlite')), 'EVAL_ID')
+    assert len(list(transform.transform(local_reader, workers=workers, cache=cache))) == 7
+    cache.commit()
+
+    assert list(transform.transform(local_reader, workers=workers, cache=cache)) == []
+    assert cache.skipped == 7
+
+
+def test_transform_chunk_skips_bad_groups(local_reader: transform.LocalExtractReader) -> None:
+    groups = list(transform._read_groups(local_reader.extracted_rows()))
+    output = transform._transform_chunk([groups[0], groups[0] + groups[1]])
+    assert output[0] is not None
+    assert output[0].house_id == int(groups[0][0]['EVAL_ID'])
+    assert output[1] is None
+
+
+class _ReversedReader:
+
+    def __init__(self, reader: transform.LocalExtractReader) -> None:
+        self._rows = list(reversed(list(reader.extracted_rows())))
+
+    def extracted_rows(self) -> typing.Iterator[typing.Dict[str, typing.Any]]:
+        return iter(self._rows)
+
+    def num_rows(self) -> int:
+        return len(self._rows)
+
+
+@pytest.mark.parametrize('group_memory_budget', [1, grouping.DEFAULT_MEMORY_BUDGET])
+def test_transform_unsorted_input(local_reader: transform.LocalExtractReader, group_memory_budget: int) -> None:
+    expected = sorted(house.to_dict()['houseId'] for house in transform.transform(local_reader))
+    output = transform.transform(_ReversedReader(local_reader), group_memory_budget=group_memory_budget)
+    assert sorted(house.to_dict()['houseId'] for house in output) == expected
+
+
+def test_transform_does_not_parse_xml(local_reader: transform.LocalExtractReader,
+                                      monkeypatch: _pytest.monkeypatch.MonkeyPatch) -> None:
+
+    def raise_error(*args) -> None: #pylint: disable=unused-argument
+        raise AssertionError('XML should not be parsed during transform')
+
+    monkeypatch.setattr(element.Element, 'from_string', raise_error)
+
+    output = transform.transform(local_reader)
+    assert len(list(output)) == 7
+
+
 def test_bad_data(local_reader: transform.LocalExtractReader,
                   monkeypatch: _pytest.monkeypatch.MonkeyPatch,
                   capsys: _pytest.capture.CaptureFixture) -> None:
@@ -110,7 +339,7 @@ def test_bad_data(local_reader: transform.LocalExtractReader,
     def raise_error(*args) -> None: #pylint: disable=unused-argument
         raise InvalidEmbeddedDataTypeError(ceiling.Ceiling)
 
-    monkeypatch.setattr(ceiling.Ceiling, 'from_data', raise_error)
+    monkeypatch.setattr(ceiling.Ceiling, 'from_snippet', raise_error)
 
     output = list(transform.transform(local_reader))
     assert not output
@@ -0,0 +1,82 @@
+import typing
+import py
+import pytest
+from energuide import transform_cache
+
+
+Group = typing.List[typing.Dict[str, typing.Any]]
+
+
+@pytest.fixture
+def groups() -> typing.List[Group]:
+    return [
+        [{'EVAL_ID': 1, 'EVAL_TYPE': 'D'}, {'EVAL_ID': 1, 'EVAL_TYPE': 'E'}],
+        [{'EVAL_ID': 2, 'EVAL_TYPE': 'D'}],
+    ]
+
+
+@pytest.fixture
+def cache_file(tmpdir: py._path.local.LocalPath) -> str:
+    return str(tmpdir.join('cache.sqlite'))
+
+
+def _eval_ids(groups: typing.Iterable[Group]) -> typing.List[int]:
+    return [group[0]['EVAL_ID'] for group in groups]
+
+
+def test_group_hash_ignores_row_order(groups: typing.List[Group]) -> None:
+    assert transform_cache.group_hash(groups[0]) == transform_cache.group_hash(list(reversed(groups[0])))
+    assert transform_cache.group_hash(groups[0]) != transform_cache.group_hash(groups[0][:1])
+
+
+def test_group_hash_includes_code_version(groups: typing.List[Group]) -> None:
+    assert transform_cache.group_hash(groups[0], 'v1') != transform_cache.group_hash(groups[0], 'v2')
+    assert transform_cache.group_hash(groups[0]) == transform_cache.group_hash(groups[0],
+                                                                               transform_cache.code_version())
+
+
+def test_changed_groups_skips_committed(groups: typing.List[Group], cache_file: str) -> None:
+    cache = transform_cache.TransformCache(cache_file, 'EVAL_ID')
+    assert _eval_ids(cache.changed_groups(groups)) == [1, 2]
+    cache.commit()
+    cache.close()
+
+    changed = [[{'EVAL_ID': 2, 'EVAL_TYPE': 'E'}]]
+    cache = transform_cache.TransformCache(cache_file, 'EVAL_ID')
+    assert _eval_ids(cache.changed_groups(groups[:1] + changed)) == [2]
+    assert (cache.skipped, cache.changed) == (1, 1)
+    assert len(cache) == 2
+
+
+def test_changed_groups_without_commit(groups: typing.List[Group], cache_file: str) -> None:
+    cache = transform_cache.TransformCache(cache_file, 'EVAL_ID')
+    list(cache.changed_groups(groups))
+    cache.close()
+
+    cache = transform_cache.TransformCache(cache_file, 'EVAL_ID')
+    assert _eval_ids(cache.changed_groups(groups)) == [1, 2]
+
+
+def test_changed_groups_new_code_version(groups: typing.List[Group], cache_file: str) -> None:
+    cache = transform_cache.TransformCache(cache_file, 'EVAL_ID', version='v1')
+    list(cache.changed_groups(groups))
+    cache.commit()
+
+    cache = transform_cache.TransformCache(cache_file, 'EVAL_ID', version='v2')
+    assert _eval_ids(cache.changed_groups(groups)) == [1, 2]
+
+
+def test_clear(groups: typing.List[Group], cache_file: str) -> None:
+    cache = transform_cache.TransformCache(cache_file, 'EVAL_ID')
+    list(cache.changed_groups(groups))
+    cache.commit()
+    cache.clear()
+    assert len(cache) == 0
+    assert _eval_ids(cache.changed_groups(groups)) == [1, 2]
+
+
+def test_bad_cache_file(tmpdir: py._path.local.LocalPath) -> None:
+    bad_file = tmpdir.join('bad.sqlite')
+    bad_file.write('not a database' * 100)
+    with pytest.raises(transform_cache.TransformCacheError):
+        transform_cache.TransformCache(str(bad_file), 'EVAL_ID')
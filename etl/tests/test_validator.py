@@ -1,4 +1,9 @@
+import typing
+import cerberus
+import pytest
+from energuide import dwelling
 from energuide import element
+from energuide import extractor
 from energuide import validator
 
 
@@ -34,3 +39,76 @@ def test_embedded_xml() -> None:
     assert isinstance(checker.document['raw_xml'], list)
     assert len(checker.document['raw_xml']) == 2
     assert isinstance(checker.document['raw_xml'][0], element.Element)
+
+
+@pytest.mark.parametrize('schema, data', [
+    ({'raw_xml': {'type': 'xml', 'required': True}}, {'raw_xml': '<Foo />'}),
+    ({'raw_xml': {'type': 'xml', 'required': True, 'coerce': 'parse_xml'}}, {'raw_xml': '<Foo />'}),
+    ({'raw_xml': {'type': 'xml', 'required': True, 'coerce': 'parse_xml'}}, {'raw_xml': None}),
+    ({'raw_xml': {'type': 'list', 'schema': {'type': 'xml', 'coerce': 'parse_xml'}}}, {'raw_xml': ['<Foo />', 1]}),
+    ({'num': {'type': 'integer', 'coerce': int}}, {'num': 'abc', 'other': 1}),
+    ({'num': {'type': 'integer', 'nullable': True, 'coerce': int}}, {'num': None}),
+    ({'code': {'type': 'string', 'allowed': ['D', 'E']}}, {'code': 'F'}),
+    ({'fsa': {'type': 'string', 'regex': '[A-Z][0-9][A-Z]'}}, {'fsa': 'K1A0B1'}),
+    ({'codes': {'type': 'dict', 'schema': {'wall': {'type': 'list', 'required': True}}}}, {'codes': {}}),
+    ({'a': {'type': 'string', 'required': True}, 'b': {'type': 'string'}}, {'b': 1}),
+    ({'num': {'type': 'integer', 'min': 1}}, {'num': 0}),
+    ({'num': {'type': 'integer', 'required': True, 'max': 1}}, {'num': 1}),
+    ({'name': {'type': 'string', 'maxlength': 2}}, {'name': 'abc'}),
+    ({'nums': {'type': 'list', 'schema': {'type': 'integer', 'min': 1}}}, {'nums': [1, 0]}),
+])
+def test_compiled_matches_cerberus(schema: typing.Dict[str, typing.Any], data: typing.Dict[str, typing.Any]) -> None:
+    checker = validator.DwellingValidator(schema)
+    compiled = validator.CompiledValidator(schema, validator_class=validator.DwellingValidator)
+
+    assert compiled.validate(data) == checker.validate(data)
+    assert list(compiled.errors.keys()) == list(checker.errors.keys())
+
+
+def test_compiled_coerce_to_xml() -> None:
+    schema = {'raw_xml': {'type': 'list', 'required': True, 'schema': {'type': 'xml', 'coerce': 'parse_xml'}}}
+    compiled = validator.CompiledValidator(schema, validator_class=validator.DwellingValidator)
+    document, errors = compiled.check({'raw_xml': ['<Foo />', '<Bar />']})
+    assert not errors
+    assert [node.tag for node in document['raw_xml']] == ['Foo', 'Bar']
+
+
+def test_compiled_falls_back_to_cerberus() -> None:
+    schema = {'num': {'type': 'integer', 'coerce': int, 'min': 1}}
+    compiled = validator.CompiledValidator(schema)
+    assert compiled.check({'num': '2'}) == ({'num': 2}, {})
+    assert compiled.check({'num': '0'}) == ({'num': '0'}, {'num': ['min value is 1']})
+
+
+def test_compiled_rejects_document_rules() -> None:
+    with pytest.raises(ValueError):
+        validator.CompiledValidator({'a': {'type': 'string', 'dependencies': 'b'}, 'b': {'type': 'string'}})
+
+
+def test_compiled_purge_unknown() -> None:
+    compiled = validator.CompiledValidator({'a': {'type': 'string'}}, purge_unknown=True)
+    assert compiled.validate({'a': 'foo', 'b': 'bar'})
+    assert compiled.document == {'a': 'foo'}
+
+
+def test_compiled_input_schema_matches_cerberus(energuide_fixture: str) -> None:
+    checker = cerberus.Validator(extractor.INPUT_SCHEMA, purge_unknown=True)
+    for row in extractor._read_csv(energuide_fixture, show_progress=False):
+        row = extractor._empty_to_none(row)
+        assert extractor.INPUT_VALIDATOR.check(row) == (checker.normalized(row), {})
+        del row['RAW_XML']
+        row['EVAL_ID'] = None
+        checker.validate(row)
+        assert list(extractor.INPUT_VALIDATOR.check(row)[1].keys()) == list(checker.errors.keys())
+
+
+def test_compiled_dwelling_schema_matches_cerberus(energuide_fixture: str) -> None:
+    schema = dwelling.ParsedDwellingDataRow._SCHEMA
+    checker = validator.DwellingValidator(schema, allow_unknown=True)
+    for row in extractor.extract_data(energuide_fixture):
+        assert row is not None
+        assert dwelling.ParsedDwellingDataRow._VALIDATOR.check(row) == (checker.normalized(row), {})
+        row['ENTRYDATE'] = 'not a date'
+        del row['ceilings']
+        checker.validate(row)
+        assert list(dwelling.ParsedDwellingDataRow._VALIDATOR.check(row)[1].keys()) == list(checker.errors.keys())
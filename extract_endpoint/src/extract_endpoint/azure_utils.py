@@ -1,4 +1,7 @@
+import datetime
 import enum
+import json
+import secrets
 import typing
 from azure.storage import blob
 
@@ -17,12 +20,26 @@ class EnvVariables(enum.Enum):
     domain = 'EXTRACT_ENDPOINT_STORAGE_DOMAIN'
 
 
+MANIFEST_PREFIX = 'manifests/'
+
+
 def upload_bytes_to_azure(coords: StorageCoordinates, data: bytes, filename: str) -> bool:
     azure_service = blob.BlockBlobService(account_name=coords.account,
                                           account_key=coords.key,
                                           custom_domain=coords.domain)
     azure_service.create_blob_from_bytes(coords.container, filename, data)
-    return filename in [blob.name for blob in azure_service.list_blobs(coords.container)]
+    return azure_service.exists(coords.container, filename)
+
+
+def manifest_name(now: typing.Optional[datetime.datetime] = None) -> str:
+    now = now or datetime.datetime.utcnow()
+    return f'{MANIFEST_PREFIX}{now:%Y%m%dT%H%M%S%f}-{secrets.token_hex(4)}.json'
+
+
+def upload_manifest(coords: StorageCoordinates, filenames: typing.List[str]) -> typing.Optional[str]:
+    name = manifest_name()
+    data = json.dumps({'files': sorted(filenames)}).encode()
+    return name if upload_bytes_to_azure(coords, data, name) else None
 
 
 def download_bytes_from_azure(coords: StorageCoordinates, filename: str) -> str:
@@ -139,11 +139,20 @@ def run_tl_route() -> typing.Tuple[str, int]:
 
 def unzip_upload_run_tl(data: bytes) -> None:
     file_z = zipfile.ZipFile(io.BytesIO(data))
+    uploaded = []
     for json_file in [file_z.open(zipinfo) for zipinfo in file_z.infolist()]:
-        if not azure_utils.upload_bytes_to_azure(App.config['AZURE_COORDINATES'], json_file.read(),
-                                                 utils.secure_filename(json_file.name)):
+        filename = utils.secure_filename(json_file.name)
+        if azure_utils.upload_bytes_to_azure(App.config['AZURE_COORDINATES'], json_file.read(), filename):
+            uploaded.append(filename)
+        else:
             LOGGER.warning("File upload to Azure storage failed")
     LOGGER.info(f"{len(file_z.infolist())} json files uploaded to Azure")
+
+    manifest = azure_utils.upload_manifest(App.config['AZURE_COORDINATES'], uploaded)
+    if manifest is None:
+        LOGGER.warning("Manifest upload to Azure storage failed")
+    else:
+        LOGGER.info(f"Wrote manifest {manifest} listing {len(uploaded)} files")
     run_tl()
 
 
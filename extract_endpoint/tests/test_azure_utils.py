@@ -1,3 +1,5 @@
+import datetime
+import json
 import typing
 import pytest
 from azure.storage import blob
@@ -63,3 +65,18 @@ def test_download_bytes(azure_emulator_coords: azure_utils.StorageCoordinates,
 def test_download_bytes_bad_filename(azure_emulator_coords: azure_utils.StorageCoordinates) -> None:
     with pytest.raises(AzureMissingResourceHttpError):
         azure_utils.download_bytes_from_azure(azure_emulator_coords, 'bad_filename')
+
+
+def test_manifest_names_sort_by_time() -> None:
+    earlier = azure_utils.manifest_name(datetime.datetime(2018, 4, 1, 9, 30))
+    later = azure_utils.manifest_name(datetime.datetime(2018, 4, 1, 10, 0))
+    assert earlier.startswith(azure_utils.MANIFEST_PREFIX)
+    assert earlier < later
+
+
+def test_upload_manifest(azure_emulator_coords: azure_utils.StorageCoordinates,
+                         azure_service: blob.BlockBlobService) -> None:
+    name = azure_utils.upload_manifest(azure_emulator_coords, ['2-b.json', '1-a.json'])
+    assert name is not None
+    content = azure_service.get_blob_to_bytes(azure_emulator_coords.container, name).content
+    assert json.loads(content) == {'files': ['1-a.json', '2-b.json']}
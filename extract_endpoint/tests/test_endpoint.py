@@ -1,5 +1,6 @@
 import io
 import hashlib
+import json
 from http import HTTPStatus
 import typing
 import pytest
@@ -207,6 +208,12 @@ def test_upload_with_timestamp(azure_service: blob.BlockBlobService,
     for name, contents in zip(sample_filenames, sample_file_contents):
         check_file_in_azure(azure_service, azure_emulator_coords, name, contents)
 
+    manifests = [blob_.name for blob_ in azure_service.list_blobs(azure_emulator_coords.container,
+                                                                   prefix=azure_utils.MANIFEST_PREFIX)]
+    assert len(manifests) == 1
+    manifest = azure_service.get_blob_to_bytes(azure_emulator_coords.container, manifests[0]).content
+    assert json.loads(manifest) == {'files': sorted(sample_filenames)}
+
 
 def test_upload_without_timestamp(test_client: testing.FlaskClient,
                                   sample_salt: str,
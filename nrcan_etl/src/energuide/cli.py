@@ -5,6 +5,7 @@ from energuide import database
 from energuide import transform
 from energuide import extractor
 from energuide import logger
+from energuide import normalization
 
 
 LOGGER = logger.get_logger(__name__)
@@ -58,6 +59,14 @@ def main() -> None:
               envvar=database.EnvVariables.production.value,
               default=False,
               help='Generate a connection string to an Atlas managed MongoDB instance')
+@click.option('--normalization-mapping',
+              type=click.Path(exists=True, dir_okay=False),
+              required=False,
+              help='JSON file of raw region, house type and city values mapped to their normalized values')
+@click.option('--normalization-report',
+              type=click.Path(dir_okay=False),
+              required=False,
+              help='Write the distinct raw region, house type and city values seen and how they were normalized')
 def load(username: str,
          password: str,
          host: str,
@@ -69,6 +78,8 @@ def load(username: str,
          update: bool,
          progress: bool,
          production: bool,
+         normalization_mapping: typing.Optional[str],
+         normalization_report: typing.Optional[str],
         ) -> None:
 
     coords = database.DatabaseCoordinates(
@@ -90,8 +101,15 @@ def load(username: str,
     else:
         LOGGER.error('Must supply a filename or use azure')
         raise ValueError('Must supply a filename or use azure')
+    if normalization_mapping:
+        normalization.load_mapping(normalization_mapping)
+
     data = transform.transform(reader, progress)
     database.load(coords, db_name, collection, data, update)
+
+    if normalization_report:
+        normalization.write_report(normalization_report)
+        LOGGER.info(f'Wrote normalization report to {normalization_report}')
     LOGGER.info(f'Finished loading data')
 
 
@@ -105,11 +123,15 @@ def load(username: str,
               type=click.Path(),
               help='Path to output file')
 @click.option('--progress/--no-progress', default=True)
-def extract(infile: str, outfile: str, progress: bool) -> None:
+@click.option('--workers',
+              type=click.IntRange(min=1),
+              default=1,
+              help='Number of processes to extract rows with')
+def extract(infile: str, outfile: str, progress: bool, workers: int) -> None:
     LOGGER.info(f'Extracting data from {infile} into {outfile}')
     if os.path.exists(outfile):
         LOGGER.warning(f'Warning: file {outfile} exists. Overwriting.')
-    extracted = extractor.extract_data(infile, show_progress=progress)
+    extracted = extractor.extract_data(infile, show_progress=progress, workers=workers)
     records_written, records_failed = extractor.write_data(extracted, outfile)
     LOGGER.info(f'Finished extracting data into {outfile}. '
                 f'Successfully written: {records_written}. Failed: {records_failed}')
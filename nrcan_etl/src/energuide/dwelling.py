@@ -1,12 +1,12 @@
 import datetime
 import typing
 from dateutil import parser
+from energuide import normalization
 from energuide import validator
 from energuide.embedded import upgrade
 from energuide.embedded import measurement
 from energuide.embedded import walls
 from energuide.embedded.region import Region
-from energuide.embedded.house_type import HouseType
 from energuide.embedded.evaluation_type import EvaluationType
 from energuide.exceptions import InvalidGroupSizeError
 from energuide.exceptions import InvalidInputDataError
@@ -38,6 +38,7 @@ class _ParsedDwellingDataRow(typing.NamedTuple):
 
 
 class ParsedDwellingDataRow(_ParsedDwellingDataRow):
+    __slots__ = ()
 
     _SCHEMA = {
         'EVAL_ID': {'type': 'integer', 'required': True, 'coerce': int},
@@ -90,16 +91,15 @@ class ParsedDwellingDataRow(_ParsedDwellingDataRow):
         'UGRHLWALLS': {'type': 'float', 'nullable': True, 'required': True, 'coerce': float},
     }
 
-    _CHECKER = validator.DwellingValidator(_SCHEMA, allow_unknown=True)
+    _VALIDATOR = validator.CompiledValidator(_SCHEMA, allow_unknown=True, validator_class=validator.DwellingValidator)
 
     @classmethod
     def from_row(cls, row: typing.Dict[str, typing.Any]) -> 'ParsedDwellingDataRow':
-        if not cls._CHECKER.validate(row):
-            error_keys = ', '.join(cls._CHECKER.errors.keys())
+        parsed, errors = cls._VALIDATOR.check(row)
+        if errors:
+            error_keys = ', '.join(errors.keys())
             raise InvalidInputDataError(f'Validator failed on keys: {error_keys}')
 
-        parsed = cls._CHECKER.document
-
         return ParsedDwellingDataRow(
             house_id=parsed['HOUSE_ID'],
             eval_id=parsed['EVAL_ID'],
@@ -109,13 +109,13 @@ class ParsedDwellingDataRow(_ParsedDwellingDataRow):
             creation_date=parsed['CREATIONDATE'],
             modification_date=parsed['MODIFICATIONDATE'],
             year_built=parsed['YEARBUILT'],
-            city=parsed['CLIENTCITY'],
-            region=Region.from_data(parsed['HOUSEREGION']),
+            city=normalization.CITIES(parsed['CLIENTCITY']),
+            region=normalization.REGIONS(parsed['HOUSEREGION']),
             forward_sortation_area=parsed['forwardSortationArea'],
 
             energy_upgrades=[upgrade.Upgrade.from_data(upgrade_node) for upgrade_node in parsed['upgrades']],
             heated_floor_area=parsed['HEATEDFLOORAREA'],
-            house_type=HouseType.normalize(parsed['TYPEOFHOUSE']),
+            house_type=normalization.HOUSE_TYPES(parsed['TYPEOFHOUSE']),
 
             egh_rating=measurement.Measurement(
                 measurement=parsed['EGHRATING'],
@@ -173,6 +173,7 @@ class _Evaluation(typing.NamedTuple):
 
 
 class Evaluation(_Evaluation):
+    __slots__ = ()
 
     @classmethod
     def from_data(cls, data: ParsedDwellingDataRow) -> 'Evaluation':
@@ -245,6 +246,7 @@ class _Dwelling(typing.NamedTuple):
 
 
 class Dwelling(_Dwelling):
+    __slots__ = ()
 
     GROUPING_FIELD = 'HOUSE_ID'
 
@@ -6,6 +6,7 @@ class _CompositeValue(typing.NamedTuple):
     value_name: str
 
 class CompositeValue(_CompositeValue):
+    __slots__ = ()
 
     def to_dict(self) -> typing.Dict[str, typing.Any]:
         return {
@@ -8,6 +8,7 @@ class _Measurement(typing.NamedTuple):
 
 
 class Measurement(_Measurement):
+    __slots__ = ()
 
     def to_dict(self) -> typing.Dict[str, T]:
         if hasattr(self.measurement, 'to_dict'):
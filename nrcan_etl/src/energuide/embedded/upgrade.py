@@ -9,6 +9,7 @@ class _Upgrade(typing.NamedTuple):
 
 
 class Upgrade(_Upgrade):
+    __slots__ = ()
 
     @classmethod
     def from_data(cls, setting: element.Element) -> 'Upgrade':
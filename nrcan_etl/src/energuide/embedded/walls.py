@@ -10,6 +10,7 @@ class _Wall(typing.NamedTuple):
 
 
 class Wall(_Wall):
+    __slots__ = ()
 
     @classmethod
     def from_data(cls,
@@ -1,13 +1,17 @@
+import collections
 import csv
+import itertools
 import json
+import os
 import typing
 import sys
 import zipfile
-import cerberus
+from concurrent import futures
 from tqdm import tqdm
 from energuide import logger
 from energuide import element
 from energuide import snippets
+from energuide import validator
 from energuide.exceptions import InvalidInputDataError
 from energuide.exceptions import EnerguideError
 
@@ -62,9 +66,17 @@ INPUT_SCHEMA['upgrades'] = {
     }
 }
 
+INPUT_VALIDATOR = validator.CompiledValidator(INPUT_SCHEMA, purge_unknown=True)
+
 
 _WINDOWS_LONG_SIZE = (2 ** 31) - 1
 
+EXTRACT_CHUNKSIZE = 32
+
+_CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+T = typing.TypeVar('T')
+
 
 def _empty_to_none(row: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing.Any]:
     for key, value in row.items():
@@ -73,13 +85,12 @@ def _empty_to_none(row: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing
     return row
 
 
-def _validated(
-        row: typing.Dict[str, typing.Any],
-        validator: cerberus.Validator) -> typing.Dict[str, typing.Optional[str]]:
-    if not validator.validate(row):
-        error_keys = ', '.join(validator.errors.keys())
+def _validated(row: typing.Dict[str, typing.Any]) -> typing.Dict[str, typing.Optional[str]]:
+    document, errors = INPUT_VALIDATOR.check(row)
+    if errors:
+        error_keys = ', '.join(errors.keys())
         raise InvalidInputDataError(f'Validator failed on keys: {error_keys} for {row.get("BUILDER")}')
-    return validator.document
+    return document
 
 
 def _truncate_postal_code(row: typing.Dict[str, typing.Optional[str]]) -> typing.Dict[str, typing.Optional[str]]:
@@ -114,38 +125,77 @@ def _drop_unwanted(row: typing.Dict[str, typing.Optional[str]]) -> typing.Dict[s
     return row
 
 
+def _decoded_lines(file: typing.BinaryIO, progress: tqdm) -> typing.Iterator[str]:
+    for line in file:
+        progress.update(len(line))
+        yield line.decode('utf-8')
+
+
 def _read_csv(filepath: str, show_progress: bool) -> typing.Iterator[typing.Dict[str, str]]:
     try:
         csv.field_size_limit(sys.maxsize)
     except OverflowError:
         csv.field_size_limit(_WINDOWS_LONG_SIZE)
 
-    with open(filepath, 'r', encoding='utf-8', newline='') as file:
-        total_lines = sum(1 for _ in file)
-
-    with tqdm(open(filepath, 'r', encoding='utf-8', newline=''),
-              total=total_lines, unit=' lines', disable=not show_progress) as file:
-        csv_reader = csv.DictReader(file)
+    total_bytes = os.stat(filepath).st_size
+    with open(filepath, 'rb') as file, \
+            tqdm(total=total_bytes, unit='B', unit_scale=True, disable=not show_progress) as progress:
+        csv_reader = csv.DictReader(_decoded_lines(file, progress))
         for row in csv_reader:
             yield row
 
 
+def _extract_row(row: typing.Dict[str, typing.Any]) -> typing.Optional[typing.Dict[str, typing.Any]]:
+    try:
+        patched = _empty_to_none(row)
+        filtered = _truncate_postal_code(patched)
+        ordered = _snip_upgrade_order(filtered)
+        validated_data = _validated(ordered)
+        return _drop_unwanted(validated_data)
+    except EnerguideError as ex:
+        LOGGER.error(f"Error extracting data from row {row.get('BUILDER', 'Unknown ID')}. Details: {ex}")
+        return None
+
+
+def _extract_chunk(rows: typing.List[typing.Dict[str, typing.Any]]
+                  ) -> typing.List[typing.Optional[typing.Dict[str, typing.Any]]]:
+    return [_extract_row(row) for row in rows]
+
+
+def _chunk(data: typing.Iterable[T], size: int) -> typing.Iterator[typing.List[T]]:
+    iterator = iter(data)
+    chunk = list(itertools.islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(itertools.islice(iterator, size))
+
+
+def _extract_parallel(rows: typing.Iterable[typing.Dict[str, typing.Any]],
+                      workers: int,
+                      chunk_size: int) -> typing.Iterator[typing.Optional[typing.Dict[str, typing.Any]]]:
+    pending: typing.Deque[futures.Future] = collections.deque()
+    with futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk in _chunk(rows, chunk_size):
+            pending.append(executor.submit(_extract_chunk, chunk))
+            if len(pending) >= workers * _CHUNKS_IN_FLIGHT_PER_WORKER:
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
+
+
 def extract_data(input_path: str,
-                 show_progress: bool = False) -> typing.Iterator[typing.Optional[typing.Dict[str, typing.Any]]]:
-    validator = cerberus.Validator(INPUT_SCHEMA, purge_unknown=True)
+                 show_progress: bool = False,
+                 workers: int = 1,
+                 chunk_size: int = EXTRACT_CHUNKSIZE
+                ) -> typing.Iterator[typing.Optional[typing.Dict[str, typing.Any]]]:
     rows = _read_csv(input_path, show_progress)
 
-    for row in rows:
-        try:
-            patched = _empty_to_none(row)
-            filtered = _truncate_postal_code(patched)
-            ordered = _snip_upgrade_order(filtered)
-            validated_data = _validated(ordered, validator)
-            cleaned = _drop_unwanted(validated_data)
-            yield cleaned
-        except EnerguideError as ex:
-            LOGGER.error(f"Error extracting data from row {row.get('BUILDER', 'Unknown ID')}. Details: {ex}")
-            yield None
+    if workers > 1:
+        yield from _extract_parallel(rows, workers, chunk_size)
+    else:
+        for row in rows:
+            yield _extract_row(row)
 
 
 def write_data(data: typing.Iterable[typing.Optional[typing.Dict[str, typing.Any]]],
@@ -0,0 +1,133 @@
+import collections
+import json
+import string
+import typing
+from energuide.embedded.house_type import HouseType
+from energuide.embedded.region import Region
+
+
+DEFAULT_MAXSIZE = 4096
+DEFAULT_REPORT_MAXSIZE = 65536
+
+MAPPING_SOURCE = 'mapping'
+COMPUTED_SOURCE = 'computed'
+
+T = typing.TypeVar('T')
+
+
+class _Resolution(typing.NamedTuple):
+    value: str
+    source: str
+
+
+class Resolution(_Resolution):
+    pass
+
+
+class Normalizer(typing.Generic[T]):
+
+    def __init__(self,
+                 name: str,
+                 resolve: typing.Callable[[str], T],
+                 maxsize: int = DEFAULT_MAXSIZE,
+                 report_maxsize: int = DEFAULT_REPORT_MAXSIZE,
+                 to_text: typing.Callable[[T], str] = str,
+                 from_text: typing.Optional[typing.Callable[[str], T]] = None) -> None:
+        self.name = name
+        self._resolve = resolve
+        self._maxsize = maxsize
+        self._report_maxsize = report_maxsize
+        self._to_text = to_text
+        self._from_text = from_text if from_text is not None else typing.cast(typing.Callable[[str], T], str)
+
+        self._table: 'collections.OrderedDict[str, T]' = collections.OrderedDict()
+        self._mapping: typing.Dict[str, T] = {}
+        self._resolutions: typing.Dict[str, Resolution] = {}
+        self._counts: typing.Dict[str, int] = collections.Counter()
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, raw: str) -> T:
+        if raw in self._counts or len(self._counts) < self._report_maxsize:
+            self._counts[raw] += 1
+        try:
+            value = self._table[raw]
+        except KeyError:
+            self.misses += 1
+            return self._store(raw)
+
+        self.hits += 1
+        self._table.move_to_end(raw)
+        return value
+
+    def _store(self, raw: str) -> T:
+        if raw in self._mapping:
+            value = self._mapping[raw]
+            source = MAPPING_SOURCE
+        else:
+            value = self._resolve(raw)
+            source = COMPUTED_SOURCE
+
+        if raw in self._counts:
+            self._resolutions[raw] = Resolution(value=self._to_text(value), source=source)
+        self._table[raw] = value
+        if len(self._table) > self._maxsize:
+            self._table.popitem(last=False)
+        return value
+
+    def warm(self, mapping: typing.Dict[str, str]) -> None:
+        self._mapping.update((raw, self._from_text(text)) for raw, text in mapping.items())
+
+    def report(self) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+        return {
+            raw: {'resolved': resolution.value, 'source': resolution.source, 'count': self._counts[raw]}
+            for raw, resolution in sorted(self._resolutions.items())
+        }
+
+    def clear(self) -> None:
+        self._table.clear()
+        self._mapping.clear()
+        self._resolutions.clear()
+        self._counts.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def normalize_city(raw: str, recase: bool = False) -> str:
+    if not recase:
+        return raw
+
+    city = ' '.join(raw.split())
+    if city.isupper() or city.islower():
+        city = '-'.join(string.capwords(part) for part in city.split('-'))
+    return city
+
+
+REGIONS: Normalizer[Region] = Normalizer('region', Region.from_data,
+                                         to_text=lambda region: region.name,
+                                         from_text=lambda name: Region[name])
+HOUSE_TYPES: Normalizer[str] = Normalizer('houseType', HouseType.normalize)
+CITIES: Normalizer[str] = Normalizer('city', normalize_city)
+
+NORMALIZERS: typing.List[Normalizer] = [REGIONS, HOUSE_TYPES, CITIES]
+
+
+def load_mapping(filename: str) -> None:
+    with open(filename, encoding='utf-8') as mapping_file:
+        mapping = json.load(mapping_file)
+
+    for normalizer in NORMALIZERS:
+        table = mapping.get(normalizer.name, {})
+        normalizer.warm({
+            raw: resolved['resolved'] if isinstance(resolved, dict) else resolved
+            for raw, resolved in table.items()
+        })
+
+
+def report() -> typing.Dict[str, typing.Dict[str, typing.Dict[str, typing.Any]]]:
+    return {normalizer.name: normalizer.report() for normalizer in NORMALIZERS}
+
+
+def write_report(filename: str) -> None:
+    with open(filename, 'w', encoding='utf-8') as report_file:
+        json.dump(report(), report_file, indent=2, sort_keys=True, ensure_ascii=False)
@@ -35,3 +35,7 @@ def test_seriealize_properties() -> None:
             'a': 2
         },
     }
+
+
+def test_no_instance_dict() -> None:
+    assert not hasattr(measurement.Measurement(measurement=5, upgrade=7), '__dict__')
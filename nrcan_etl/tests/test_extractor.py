@@ -155,3 +155,32 @@ def test_write_bad_data(tmpdir: py._path.local.LocalPath) -> None:
 
     with zipfile.ZipFile(output_path, 'r') as output:
         assert len(output.namelist()) == 1
+
+
+def test_read_csv_multiline_field(tmpdir: py._path.local.LocalPath, base_data: typing.Dict[str, str]) -> None:
+    base_data['RAW_XML'] = '<HouseFile>\n    <House>\n    </House>\n</HouseFile>'
+    filepath = os.path.join(tmpdir, 'sample.csv')
+    with open(filepath, 'w') as file:
+        writer = csv.DictWriter(file, fieldnames=list(base_data.keys()))
+        writer.writeheader()
+        writer.writerow(base_data)
+        writer.writerow(base_data)
+
+    output = list(extractor._read_csv(filepath, show_progress=False))
+    assert len(output) == 2
+    assert all(row['RAW_XML'] == base_data['RAW_XML'] for row in output)
+
+
+def test_extract_parallel_matches_serial(tmpdir: py._path.local.LocalPath, base_data: typing.Dict[str, str]) -> None:
+    filepath = os.path.join(tmpdir, 'sample.csv')
+    with open(filepath, 'w') as file:
+        writer = csv.DictWriter(file, fieldnames=list(base_data.keys()))
+        writer.writeheader()
+        for eval_id in range(10):
+            writer.writerow(dict(base_data, EVAL_ID=str(eval_id), BUILDER=None if eval_id == 3 else f'4K{eval_id}'))
+
+    serial = list(extractor.extract_data(filepath))
+    parallel = list(extractor.extract_data(filepath, workers=2, chunk_size=3))
+    assert parallel == serial
+    assert [row['EVAL_ID'] if row else None for row in parallel] == \
+        ['0', '1', '2', None, '4', '5', '6', '7', '8', '9']
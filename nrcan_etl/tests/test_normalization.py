@@ -0,0 +1,101 @@
+import json
+import typing
+import py
+import pytest
+from energuide import normalization
+from energuide.embedded.region import Region
+
+
+@pytest.fixture
+def region_normalizer() -> normalization.Normalizer[Region]:
+    return normalization.Normalizer('region', Region.from_data,
+                                    maxsize=2,
+                                    to_text=lambda region: region.name,
+                                    from_text=lambda name: Region[name])
+
+
+@pytest.fixture
+def clean_normalizers() -> typing.Iterator[None]:
+    for normalizer in normalization.NORMALIZERS:
+        normalizer.clear()
+    yield
+    for normalizer in normalization.NORMALIZERS:
+        normalizer.clear()
+
+
+def test_normalizer_memoizes(region_normalizer: normalization.Normalizer[Region]) -> None:
+    assert region_normalizer('Ontario') == Region.ONTARIO
+    assert region_normalizer('Ontario') == Region.ONTARIO
+    assert (region_normalizer.hits, region_normalizer.misses) == (1, 1)
+
+
+def test_normalizer_bounded(region_normalizer: normalization.Normalizer[Region]) -> None:
+    for raw in ['Ontario', 'Quebec', 'Yukon', 'Ontario']:
+        region_normalizer(raw)
+    assert (region_normalizer.hits, region_normalizer.misses) == (0, 4)
+
+    region_normalizer('Ontario')
+    assert region_normalizer.hits == 1
+
+
+def test_normalizer_warm(region_normalizer: normalization.Normalizer[Region]) -> None:
+    region_normalizer.warm({'Ont': 'ONTARIO'})
+    assert region_normalizer('Ont') == Region.ONTARIO
+    region_normalizer('Qc')
+
+    assert region_normalizer.report() == {
+        'Ont': {'resolved': 'ONTARIO', 'source': normalization.MAPPING_SOURCE, 'count': 1},
+        'Qc': {'resolved': 'QUEBEC', 'source': normalization.COMPUTED_SOURCE, 'count': 1},
+    }
+
+
+def test_normalizer_report_bounded() -> None:
+    normalizer = normalization.Normalizer('city', normalization.normalize_city, report_maxsize=2)
+    for raw in ['Ottawa', 'OTTAWA', 'Gatineau', 'Ottawa']:
+        normalizer(raw)
+
+    assert normalizer('Gatineau') == 'Gatineau'
+    assert normalizer.report() == {
+        'Ottawa': {'resolved': 'Ottawa', 'source': normalization.COMPUTED_SOURCE, 'count': 2},
+        'OTTAWA': {'resolved': 'OTTAWA', 'source': normalization.COMPUTED_SOURCE, 'count': 1},
+    }
+
+
+@pytest.mark.parametrize('raw', ['Ottawa', '  Ottawa ', 'OTTAWA', "st. john's"])
+def test_normalize_city_keeps_value(raw: str) -> None:
+    assert normalization.normalize_city(raw) == raw
+
+
+@pytest.mark.parametrize('raw, expected', [
+    ('Ottawa', 'Ottawa'),
+    ('  Ottawa ', 'Ottawa'),
+    ('OTTAWA', 'Ottawa'),
+    ("st. john's", "St. John's"),
+    ('SAINT-JEAN-SUR-RICHELIEU', 'Saint-Jean-Sur-Richelieu'),
+    ('Trois   Rivières', 'Trois Rivières'),
+    ('McAdam', 'McAdam'),
+])
+def test_normalize_city_recase(raw: str, expected: str) -> None:
+    assert normalization.normalize_city(raw, recase=True) == expected
+
+
+@pytest.mark.usefixtures('clean_normalizers')
+def test_mapping_round_trip(tmpdir: py._path.local.LocalPath) -> None:
+    for raw in ['Ontario', 'ON', 'Ontario']:
+        normalization.REGIONS(raw)
+    normalization.HOUSE_TYPES('Single Detached')
+    normalization.CITIES('OTTAWA')
+
+    report_file = str(tmpdir.join('report.json'))
+    normalization.write_report(report_file)
+    with open(report_file) as report:
+        written = json.load(report)
+    assert written['region']['Ontario'] == {'resolved': 'ONTARIO', 'source': 'computed', 'count': 2}
+    assert written['houseType']['Single Detached']['resolved'] == 'Single detached'
+    assert written['city']['OTTAWA']['resolved'] == 'OTTAWA'
+
+    for normalizer in normalization.NORMALIZERS:
+        normalizer.clear()
+    normalization.load_mapping(report_file)
+    assert normalization.REGIONS('ON') == Region.ONTARIO
+    assert normalization.report()['region']['ON']['source'] == normalization.MAPPING_SOURCE